@@ -1,62 +1,143 @@
 import pandas as pd
+import numpy as np
 import os
 import glob
+import time
+import argparse
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from tqdm import tqdm
 # Impor semua komponen yang dibutuhkan dari proyek Anda
 from helpers import get_env_var
+import data_store
+from bars import Bars
+from symbol_specs import SYMBOL_SPECS, BACKTEST_SPECS, static_loader
+from log_pipeline import setup_logging, enable_trade_events, trade_events_enabled, trade_events_path, trade_event, suppressed, flush_at_worker_exit
 from strategies import STRATEGY_FACTORY # Pemuat strategi dinamis
 
 # ---------------------------
 # KONFIGURASI BACKTEST
 # ---------------------------
-logging.basicConfig(level=logging.INFO, format="%(asctime)s | BACKTEST | %(message)s")
+setup_logging(None, "%(asctime)s | BACKTEST | %(message)s")
 
 DATA_FOLDER = "data"
 OUTPUT_FILE = "backtest_results.csv"
 INITIAL_BALANCE = 10000.0
+# Jumlah bar trailing yang diberikan ke strategi per bar (sama dengan copy_ohlc di live: 200).
+# 0 = seluruh history sampai bar saat ini (mode lama, O(n^2)).
+WINDOW_BARS = get_env_var('BACKTEST_WINDOW_BARS', 200, int)
+START_INDEX = 200
+# "vector": strategi dengan signals() dihitung sekali untuk seluruh data; sisanya per bar.
+# "bar": semua strategi memanggil check_signal per bar.
+ENGINE = get_env_var('BACKTEST_ENGINE', 'vector').lower()
+# Rentang waktu data yang disimulasikan (kosong = seluruh data), mis. "2024-01-01"
+DATA_START = get_env_var('BACKTEST_START', '') or None
+DATA_END = get_env_var('BACKTEST_END', '') or None
+# Jumlah proses untuk backtest multi-simbol paralel (1 = berurutan dengan saldo bersama)
+JOBS = get_env_var('BACKTEST_JOBS', 1, int)
+# Mode senyap: log per trade & log INFO strategi tidak dibuat selama simulasi (hanya ringkasan per simbol)
+QUIET = get_env_var('BACKTEST_QUIET', 'false', bool)
+# Event posisi backtest (JSONL), ditulis sekali per simbol setelah simulasi; kosong = nonaktif
+TRADE_EVENTS_FILE = get_env_var('BACKTEST_TRADE_EVENTS_FILE', '')
+
+EVENT_FIELDS = ('ticket', 'symbol', 'type', 'volume', 'open_price', 'close_price', 'sl', 'tp', 'open_time', 'close_time', 'profit', 'reason', 'comment')
+
+def data_files():
+    """CSV di data/ ditambah simbol yang hanya ada di store Parquet (sebagai path data/<SIMBOL>)."""
+    csv_files = sorted(glob.glob(os.path.join(DATA_FOLDER, "*.csv")))
+    csv_symbols = {os.path.basename(f).split('_')[0].upper() for f in csv_files}
+    return csv_files + [os.path.join(DATA_FOLDER, symbol) for symbol in data_store.symbols() if symbol not in csv_symbols]
 
 # ---------------------------
 # KELAS SIMULASI TICK & POSISI
 # ---------------------------
 class SimulatedTick:
     def __init__(self, row):
-        self.time = row.time; self.ask = row.high; self.bid = row.low; self.last = row.close
+        self.time = row['time']; self.ask = row['high']; self.bid = row['low']; self.last = row['close']
 
 class SimulatedPosition:
-    def __init__(self, ticket, symbol, order_type, volume, price_open, sl, tp, comment):
+    def __init__(self, ticket, symbol, order_type, volume, price_open, sl, tp, comment, open_time="N/A"):
         self.ticket = ticket; self.symbol = symbol; self.type = order_type
         self.volume = volume; self.price_open = price_open; self.sl = sl
-        self.tp = tp; self.comment = comment
+        self.tp = tp; self.comment = comment; self.open_time = open_time
+
+# Format log per trade; dipakai langsung (mode biasa) atau lewat TradeLog (mode senyap)
+OPEN_LOG = "Posisi DIBUKA: %s %s @ %s | SL: %s TP: %s"
+CLOSE_LOG = "Posisi DITUTUP: %s @ %s | Alasan: %s | Profit: %.2f | Balance: %.2f"
+
+class TradeLog:
+    """
+    Log per trade mode senyap, dibuat dari trade_history setelah simulasi. Dipakai sebagai argumen
+    logging (%s), jadi teksnya baru diformat jika record benar-benar ditulis (level DEBUG), dan itu
+    terjadi di thread listener log_pipeline, bukan di loop simulasi.
+    """
+    def __init__(self, trades, balance, open_position=None):
+        self.trades = trades; self.balance = balance # Saldo sebelum trade pertama
+        self.open_position = open_position # Posisi yang masih terbuka di akhir data (tidak ada di trade_history)
+
+    def lines(self):
+        balance = self.balance
+        for trade in self.trades:
+            balance += trade['profit']
+            yield OPEN_LOG % (trade['symbol'], trade['type'], trade['open_price'], trade['sl'], trade['tp'])
+            yield CLOSE_LOG % (trade['symbol'], trade['close_price'], trade['reason'], trade['profit'], balance)
+        pos = self.open_position
+        if pos is not None: yield OPEN_LOG % (pos.symbol, 'BUY' if pos.type == 0 else 'SELL', pos.price_open, pos.sl, pos.tp)
+
+    def __str__(self):
+        return "\n".join(self.lines())
+
+# ---------------------------
+# RESOLVER EXIT SL/TP
+# ---------------------------
+def find_exit(high, low, start, order_type, sl, tp, chunk=256):
+    """
+    Cari bar pertama >= start di mana SL atau TP tersentuh. Jika keduanya tersentuh di bar yang
+    sama, SL diprioritaskan (sama seperti pengecekan per bar sebelumnya). Mengembalikan
+    (index, harga_close, alasan) atau None jika posisi masih terbuka sampai akhir data.
+    """
+    total = len(high)
+    while start < total:
+        end = min(start + chunk, total)
+        bar_high = high[start:end]; bar_low = low[start:end]
+        if order_type == 0: sl_hit = bar_low <= sl; tp_hit = bar_high >= tp # BUY
+        else: sl_hit = bar_high >= sl; tp_hit = bar_low <= tp # SELL
+        hit = sl_hit | tp_hit
+        if hit.any():
+            k = int(hit.argmax())
+            return (start + k, sl, "SL") if sl_hit[k] else (start + k, tp, "TP")
+        # Jendela pencarian membesar agar posisi yang terbuka ribuan bar tetap murah
+        start = end; chunk *= 2
+    return None
 
 # ---------------------------
 # KELAS UTAMA BACKTESTER
 # ---------------------------
 class Backtester:
-    def __init__(self):
+    def __init__(self, start=DATA_START, end=DATA_END, quiet=QUIET):
         self.balance = INITIAL_BALANCE
+        self.start = start; self.end = end # Rentang waktu data (None = tanpa batas)
         self.open_positions = {}
         self.trade_history = []
         self.ticket_counter = 1
         self.account_blown = False # [BARU] Flag untuk menandai akun bangkrut
+        self.current_bar_time = "N/A" # Waktu bar yang sedang dievaluasi (untuk open_time posisi)
+        self.progress_position = None # Posisi baris tqdm saat berjalan di worker paralel
+        self.show_progress = True # False untuk evaluasi massal (optimizer)
+        self.quiet = quiet # True = tanpa log per trade (lihat suppressed())
 
         volumes_str = get_env_var('VOLUMES', '')
         default_volume = get_env_var('DEFAULT_VOLUME', 0.01, float)
         self.volume_map = {v.split(':')[0].strip().upper(): float(v.split(':')[1]) for v in volumes_str.split(',') if ':' in v}
         self.default_volume = default_volume
 
-        self.symbol_info_db = {
-            'DEFAULT':  {'digits': 5, 'point': 0.00001, 'trade_tick_size': 0.00001, 'trade_stops_level': 0, 'contract_size': 100000},
-            'XAUUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 100}, # 100 troy ounces
-            'BTCUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 1},     # 1 Bitcoin
-            'ETHUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 1},     # 1 Ether
-            'USDJPY':   {'digits': 3, 'point': 0.001,   'trade_tick_size': 0.001,   'trade_stops_level': 0, 'contract_size': 100000},
-            'XAUJPY':   {'digits': 3, 'point': 0.001,   'trade_tick_size': 0.001,   'trade_stops_level': 0, 'contract_size': 100},
-        }
-
-    def run(self):
-        csv_files = glob.glob(os.path.join(DATA_FOLDER, "*.csv"))
+        # Spesifikasi simbol backtest dari tabel statis (symbol_specs.BACKTEST_SPECS), dibagi semua strategi
+        SYMBOL_SPECS.configure(static_loader(BACKTEST_SPECS))
+
+    def run(self, window=WINDOW_BARS, engine=ENGINE):
+        csv_files = data_files()
         if not csv_files:
             logging.error(f"Tidak ada file CSV yang ditemukan di folder '{DATA_FOLDER}'."); return
 
@@ -64,79 +145,217 @@ class Backtester:
             if self.account_blown:
                 logging.critical("Akun bangkrut. Menghentikan semua backtest lebih lanjut.")
                 break
+            self.run_symbol(csv_file, window, engine)
 
-            symbol = os.path.basename(csv_file).split('_')[0].upper()
-            logging.info(f"===== Memulai Backtest untuk {symbol} =====")
-            
-            volume = self.volume_map.get(symbol, self.default_volume)
-            strategies = [StrategyClass(symbol, volume) for StrategyClass in STRATEGY_FACTORY.values()]
-            
-            sim_info_raw = self.symbol_info_db.get(symbol, self.symbol_info_db['DEFAULT'])
-            class SimulatedInfo:
-                def __init__(self, data):
-                    self.digits=data['digits']; self.point=data['point']; self.trade_tick_size=data['trade_tick_size']
-                    self.trade_stops_level=data['trade_stops_level']; self.contract_size=data['contract_size']
-            sim_info = SimulatedInfo(sim_info_raw)
-
-            for s in strategies:
-                s.info = sim_info; s.digits = sim_info.digits; s.point = sim_info.point
-                original_create_order = s._create_order
-                def sim_create_order_wrapper(order_type, price, sl, tp, original_method=original_create_order, strategy_instance=s):
-                    self._sim_create_order(order_type, price, sl, tp, strategy_instance)
-                s._create_order = sim_create_order_wrapper
-            
-            try:
-                logging.info(f"Membaca file data {os.path.basename(csv_file)}...")
-                df = pd.read_csv(csv_file, parse_dates=['timestamp'])
-                df.rename(columns={'timestamp': 'time', 'volume': 'tick_volume'}, inplace=True)
-                if not all(col in df.columns for col in ['time', 'open', 'high', 'low', 'close', 'tick_volume']):
-                    raise ValueError("Kolom yang dibutuhkan hilang dari CSV.")
-            except Exception as e:
-                logging.error(f"Gagal memproses file {csv_file}: {e}"); continue
-            
-            start_index = 200
-            total_bars = len(df)
-            if total_bars <= start_index:
-                logging.warning(f"Data untuk {symbol} tidak cukup ({total_bars} bar). Melewati..."); continue
+        self._generate_report()
 
-            logging.info(f"Memulai simulasi untuk {total_bars - start_index} bar...")
-            
-            # [PERBAIKAN UTAMA] Gunakan tqdm untuk progress bar
-            # Kita akan mengiterasi melalui objek tqdm yang membungkus range kita
-            progress_bar = tqdm(range(start_index, total_bars), desc=f"Processing {symbol}", unit="bar")
+    def run_symbol(self, csv_file, window=WINDOW_BARS, engine=ENGINE):
+        symbol = os.path.basename(csv_file).split('_')[0].upper()
+        logging.info(f"===== Memulai Backtest untuk {symbol} =====")
+        strategies, sim_info = self._setup_strategies(symbol)
 
-            for i in progress_bar:
-                if self.account_blown: break
+        df = self._load_data(csv_file)
+        if df is None: return
 
-                ohlc_slice = df.iloc[:i]; current_bar = df.iloc[i]; sim_tick = SimulatedTick(current_bar)
-                
-                if symbol in self.open_positions:
-                    self._check_close_conditions(symbol, current_bar, sim_info)
-                else:
-                    for strategy in strategies:
-                        strategy.check_signal(ohlc_slice, sim_tick)
-                        if strategy.order_sent: break
-                    for s in strategies: s.order_sent = False
-            
-            logging.info(f"Simulasi untuk {symbol} selesai.")
+        total_bars = len(df)
+        if total_bars <= START_INDEX:
+            logging.warning(f"Data untuk {symbol} tidak cukup ({total_bars} bar). Melewati..."); return
+
+        logging.info(f"Memulai simulasi untuk {total_bars - START_INDEX} bar (engine: {engine}, window: {window or 'penuh'})...")
+        first_trade = len(self.trade_history); balance = self.balance; started = time.perf_counter()
+        with suppressed(self.quiet): self._simulate(symbol, df, strategies, sim_info, window, engine)
+        elapsed = time.perf_counter() - started
+        bars = total_bars - START_INDEX; trades = self.trade_history[first_trade:]
+        logging.info(f"Simulasi untuk {symbol} selesai: {bars} bar dalam {elapsed:.1f} detik ({bars / max(elapsed, 1e-9):.0f} bar/detik), {len(trades)} trade ditutup.")
+        # Mode senyap: log per trade hanya dikumpulkan (trade_history) dan diformat jika level DEBUG aktif
+        open_position = self.open_positions.get(symbol)
+        if self.quiet and (trades or open_position): logging.debug("Log trade %s:\n%s", symbol, TradeLog(trades, balance, open_position))
+        # Event dibuat dari trade_history setelah simulasi, bukan di loop per bar
+        if trades and trade_events_enabled():
+            for trade in trades: trade_event('position', **{key: trade[key] for key in EVENT_FIELDS})
+        return bars / max(elapsed, 1e-9)
 
+    def run_parallel(self, jobs, window=WINDOW_BARS, engine=ENGINE, portfolio_replay=False):
+        csv_files = data_files()
+        if not csv_files:
+            logging.error(f"Tidak ada file CSV yang ditemukan di folder '{DATA_FOLDER}'."); return
+
+        logging.info(f"Menjalankan {len(csv_files)} simbol di {jobs} proses paralel...")
+        slot_counter = multiprocessing.Value('i', 0); results = []
+        # Lock progress bar dari multiprocessing agar bisa dikirim ke worker hasil spawn (lock bawaan tqdm tidak bisa dipickle)
+        tqdm_lock = multiprocessing.RLock(); tqdm.set_lock(tqdm_lock)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_parallel_worker, initargs=(tqdm_lock, slot_counter, trade_events_path())) as pool:
+            # Mode senyap & sink event diteruskan eksplisit: dengan spawn (Windows) worker mengimpor ulang modul ini
+            futures = {pool.submit(_run_symbol_worker, csv_file, window, engine, self.start, self.end, self.quiet): csv_file for csv_file in csv_files}
+            with tqdm(total=len(futures), desc="Simbol selesai", unit="simbol", position=0) as overall:
+                for future in as_completed(futures):
+                    name = os.path.basename(futures[future])
+                    try:
+                        trades, blown, speed = future.result()
+                    except Exception as e:
+                        tqdm.write(f"{name}: GAGAL ({e})"); overall.update(1); continue
+                    results.append((trades, blown))
+                    pnl = sum(trade['profit'] for trade in trades)
+                    tqdm.write(f"{name}: {len(trades)} trade, P/L {pnl:.2f}, {speed or 0:.0f} bar/detik" + (" (ACCOUNT BLOWN)" if blown else ""))
+                    overall.update(1)
+
+        # Gabungkan semua trade dalam urutan waktu penutupan dan beri nomor tiket baru
+        merged = sorted((trade for trades, _ in results for trade in trades), key=lambda trade: trade['close_time'])
+        for ticket, trade in enumerate(merged, 1): trade['ticket'] = ticket
+        if portfolio_replay:
+            self._replay_portfolio(merged)
+        else:
+            # Setiap simbol disimulasikan dengan saldo awal sendiri; saldo akhir = saldo awal + total P/L
+            self.trade_history = merged
+            self.balance = INITIAL_BALANCE + sum(trade['profit'] for trade in merged)
+            self.account_blown = any(blown for _, blown in results)
         self._generate_report()
+
+    def _replay_portfolio(self, trades):
+        # Putar ulang trade gabungan secara kronologis untuk saldo & status bangkrut tingkat portofolio
+        self.balance = INITIAL_BALANCE; self.trade_history = []; self.account_blown = False
+        for trade in trades:
+            self.balance += trade['profit']; self.trade_history.append(trade)
+            if self.balance <= 0:
+                self.account_blown = True
+                logging.critical(f"ACCOUNT BLOWN (portofolio) pada {trade['close_time']}! Saldo: {self.balance:.2f}. {len(trades) - len(self.trade_history)} trade berikutnya diabaikan.")
+                break
+
+    def _simulate(self, symbol, df, strategies, sim_info, window=WINDOW_BARS, engine=ENGINE):
+        if engine == 'vector': self._replay_vectorized(symbol, df, strategies, sim_info, window)
+        else: self._replay(symbol, df, strategies, sim_info, window)
+
+    def _setup_strategies(self, symbol, strategy_classes=None):
+        volume = self.volume_map.get(symbol, self.default_volume)
+        strategies = [StrategyClass(symbol, volume) for StrategyClass in (strategy_classes or STRATEGY_FACTORY.values())]
+        sim_info = SYMBOL_SPECS.get(symbol)
+
+        for s in strategies:
+            s.info = sim_info; s.digits = sim_info.digits; s.point = sim_info.point
+            original_create_order = s._create_order
+            def sim_create_order_wrapper(order_type, price, sl, tp, original_method=original_create_order, strategy_instance=s):
+                self._sim_create_order(order_type, price, sl, tp, strategy_instance)
+            s._create_order = sim_create_order_wrapper
+        return strategies, sim_info
+
+    def _load_data(self, csv_file):
+        # Store Parquet dipakai jika simbol sudah diimpor dan tidak lebih lama dari CSV-nya; selain itu CSV
+        symbol = os.path.basename(csv_file).split('_')[0].upper()
+        if data_store.has_symbol(symbol):
+            if os.path.exists(csv_file) and os.path.getmtime(csv_file) > data_store.last_modified(symbol):
+                logging.warning(f"Store Parquet untuk {symbol} lebih lama dari {os.path.basename(csv_file)}. Memakai CSV (jalankan data_store.py untuk impor ulang).")
+            else:
+                try:
+                    logging.info(f"Membaca {symbol} dari store Parquet...")
+                    return data_store.load(symbol, self.start, self.end)
+                except Exception as e:
+                    logging.error(f"Gagal membaca store Parquet untuk {symbol}: {e}. Memakai CSV.")
+        return self._load_csv(csv_file)
+
+    def _load_csv(self, csv_file):
+        try:
+            logging.info(f"Membaca file data {os.path.basename(csv_file)}...")
+            df = pd.read_csv(csv_file, parse_dates=['timestamp'])
+            df.rename(columns={'timestamp': 'time', 'volume': 'tick_volume'}, inplace=True)
+            if not all(col in df.columns for col in ['time', 'open', 'high', 'low', 'close', 'tick_volume']):
+                raise ValueError("Kolom yang dibutuhkan hilang dari CSV.")
+            if self.start is not None: df = df[df['time'] >= pd.Timestamp(self.start)]
+            if self.end is not None: df = df[df['time'] < pd.Timestamp(self.end)]
+            return df.reset_index(drop=True) if self.start is not None or self.end is not None else df
+        except Exception as e:
+            logging.error(f"Gagal memproses file {csv_file}: {e}"); return None
+
+    def _replay(self, symbol, df, strategies, sim_info, window):
+        # Setiap bar, strategi hanya menerima `window` bar terakhir (view Bars, tanpa copy),
+        # sehingga biaya per bar O(window) dan bukan O(i) seperti df.iloc[:i].
+        bars = Bars.from_frame(df)
+        def evaluate(i):
+            ohlc_slice = bars[max(0, i - window):i] if window else bars[:i]
+            sim_tick = SimulatedTick(bars[i])
+            for strategy in strategies:
+                strategy.check_signal(ohlc_slice, sim_tick)
+                if strategy.order_sent: break
+            for s in strategies: s.order_sent = False
+        self._replay_loop(symbol, df, sim_info, evaluate)
+
+    def _replay_vectorized(self, symbol, df, strategies, sim_info, window):
+        # Frame yang berakhir di bar j dievaluasi dengan tick dari bar j+1, persis seperti _replay:
+        # pada bar i strategi melihat df.iloc[:i] dan SimulatedTick(df.iloc[i]).
+        high = df['high'].to_numpy(float); low = df['low'].to_numpy(float)
+        ask = np.append(high[1:], np.nan); bid = np.append(low[1:], np.nan)
+
+        plans = []; any_signal = np.zeros(len(df), dtype=bool)
+        for strategy in strategies:
+            frame = strategy.signals(df, ask, bid)
+            if frame is None: plans.append((strategy, None)); continue
+            direction = frame['direction'].to_numpy()
+            plans.append((strategy, (direction, frame['sl'].to_numpy(float), frame['tp'].to_numpy(float))))
+            any_signal |= direction != strategy.NO_SIGNAL
+        per_bar = [strategy.__class__.__name__ for strategy, signal in plans if signal is None]
+        if per_bar: logging.info(f"Strategi tanpa mode vektor (dievaluasi per bar): {', '.join(per_bar)}")
+        bars = Bars.from_frame(df)
+
+        def evaluate(i):
+            j = i - 1
+            if not per_bar and not any_signal[j]: return
+            sim_tick = SimulatedTick(bars[i]); ohlc_slice = None
+            for strategy, signal in plans:
+                if signal is None:
+                    if ohlc_slice is None: ohlc_slice = bars[max(0, i - window):i] if window else bars[:i]
+                    strategy.check_signal(ohlc_slice, sim_tick)
+                else:
+                    direction, sl_ideal, tp_ideal = signal
+                    if direction[j] != strategy.NO_SIGNAL:
+                        order_type = int(direction[j]); price = sim_tick.ask if order_type == 0 else sim_tick.bid # 0 = BUY
+                        sl, tp = strategy._get_final_sl_tp(order_type, sim_tick, sl_ideal[j], tp_ideal[j])
+                        strategy._create_order(order_type, price, sl, tp)
+                if strategy.order_sent: break
+            for s in strategies: s.order_sent = False
+
+        next_candidate = None
+        if not per_bar:
+            # Semua strategi vektor: lompat langsung ke bar berikutnya yang punya sinyal
+            candidates = np.flatnonzero(any_signal) + 1
+            def next_candidate(i):
+                k = np.searchsorted(candidates, i)
+                return int(candidates[k]) if k < len(candidates) else len(df)
+        self._replay_loop(symbol, df, sim_info, evaluate, next_candidate)
+
+    def _replay_loop(self, symbol, df, sim_info, evaluate, next_candidate=None):
+        # evaluate(i): jalankan strategi pada bar i (hanya saat tidak ada posisi terbuka).
+        # next_candidate(i): bar pertama >= i yang perlu dievaluasi (opsional).
+        # Selama posisi terbuka, find_exit langsung mencari bar penutupan sehingga bar di antaranya dilewati.
+        high = df['high'].to_numpy(float); low = df['low'].to_numpy(float); times = df['time']
+        total = len(df); i = START_INDEX
+        progress_bar = tqdm(total=total - START_INDEX, desc=f"Processing {symbol}", unit="bar",
+                            position=self.progress_position, leave=self.progress_position is None, disable=not self.show_progress)
+        while i < total and not self.account_blown:
+            if symbol in self.open_positions:
+                exit_index = self._resolve_exit(symbol, high, low, times, i, sim_info)
+                next_i = total if exit_index is None else exit_index + 1
+            elif next_candidate is not None and next_candidate(i) != i:
+                next_i = next_candidate(i)
+            else:
+                self.current_bar_time = times.iat[i]
+                evaluate(i); next_i = i + 1
+            progress_bar.update(next_i - i); i = next_i
+        progress_bar.close()
+
     def _sim_create_order(self, order_type, price, sl, tp, strategy_instance):
         symbol = strategy_instance.symbol
         if self.open_positions.get(symbol): return
-        position = SimulatedPosition(self.ticket_counter, symbol, order_type, strategy_instance.volume, price, sl, tp, f"Backtest {strategy_instance.__class__.__name__}")
+        position = SimulatedPosition(self.ticket_counter, symbol, order_type, strategy_instance.volume, price, sl, tp, f"Backtest {strategy_instance.__class__.__name__}", self.current_bar_time)
         self.open_positions[symbol] = position; self.ticket_counter += 1
-        logging.info(f"Posisi DIBUKA: {symbol} {('BUY' if order_type == 0 else 'SELL')} @ {price} | SL: {sl} TP: {tp}")
-
-    def _check_close_conditions(self, symbol, current_bar, sim_info):
-        pos = self.open_positions.get(symbol); close_price, reason = 0.0, ""
-        if pos.type == 0: # BUY
-            if current_bar.low <= pos.sl: close_price, reason = pos.sl, "SL"
-            elif current_bar.high >= pos.tp: close_price, reason = pos.tp, "TP"
-        else: # SELL
-            if current_bar.high >= pos.sl: close_price, reason = pos.sl, "SL"
-            elif current_bar.low <= pos.tp: close_price, reason = pos.tp, "TP"
-        if close_price > 0: self._close_position(symbol, close_price, current_bar.time, reason, sim_info)
+        strategy_instance.order_sent = True # Sama seperti live: strategi berikutnya tidak dicek lagi di bar ini
+        if not self.quiet: logging.info(OPEN_LOG, symbol, 'BUY' if order_type == 0 else 'SELL', price, sl, tp)
+
+    def _resolve_exit(self, symbol, high, low, times, start, sim_info):
+        pos = self.open_positions.get(symbol)
+        hit = find_exit(high, low, start, pos.type, pos.sl, pos.tp)
+        if hit is None: return None
+        exit_index, close_price, reason = hit
+        self._close_position(symbol, close_price, times.iat[exit_index], reason, sim_info)
+        return exit_index
 
     def _close_position(self, symbol, close_price, close_time, reason, sim_info):
         pos = self.open_positions.pop(symbol)
@@ -157,9 +376,9 @@ class Backtester:
         self.trade_history.append({
             'ticket': pos.ticket, 'symbol': symbol, 'type': 'BUY' if pos.type == 0 else 'SELL', 'volume': pos.volume,
             'open_price': pos.price_open, 'close_price': close_price, 'sl': pos.sl, 'tp': pos.tp,
-            'open_time': "N/A", 'close_time': close_time, 'profit': profit, 'reason': reason, 'comment': pos.comment
+            'open_time': pos.open_time, 'close_time': close_time, 'profit': profit, 'reason': reason, 'comment': pos.comment
         })
-        logging.info(f"Posisi DITUTUP: {symbol} @ {close_price} | Alasan: {reason} | Profit: {profit:.2f} | Balance: {self.balance:.2f}")
+        if not self.quiet: logging.info(CLOSE_LOG, symbol, close_price, reason, profit, self.balance)
 
         # [BARU] Pengecekan Kondisi Bangkrut
         if self.balance <= 0:
@@ -185,9 +404,79 @@ class Backtester:
         report_str += "="*30 + "\n"
         print(report_str)
 
+# ---------------------------
+# WORKER BACKTEST PARALEL
+# ---------------------------
+_worker_slot = 0
+
+def _init_parallel_worker(tqdm_lock, slot_counter, trade_events_file=''):
+    global _worker_slot
+    tqdm.set_lock(tqdm_lock)
+    with slot_counter.get_lock():
+        _worker_slot = slot_counter.value; slot_counter.value += 1
+    # Log per trade dimatikan di worker agar progress bar tetap terbaca; ringkasan dicetak proses utama
+    logging.getLogger().setLevel(logging.WARNING)
+    enable_trade_events(trade_events_file) # Tidak berbuat apa-apa jika sink sudah diwarisi lewat fork
+    flush_at_worker_exit() # Sisa batch log & event ditulis saat worker berhenti
+
+def _run_symbol_worker(csv_file, window, engine, start=DATA_START, end=DATA_END, quiet=QUIET):
+    backtester = Backtester(start, end, quiet)
+    backtester.progress_position = _worker_slot + 1 # Baris 0 dipakai progress bar total
+    speed = backtester.run_symbol(csv_file, window, engine)
+    return backtester.trade_history, backtester.account_blown, speed
+
+# ---------------------------
+# PERBANDINGAN ENGINE REPLAY
+# ---------------------------
+def compare_engines(csv_file, engines=("full", "window", "vector"), window=WINDOW_BARS, start=DATA_START, end=DATA_END, quiet=QUIET):
+    """
+    Jalankan beberapa engine replay pada CSV yang sama dan bandingkan trade-nya dengan engine pertama.
+    "full" = check_signal per bar dengan history penuh (loop lama), "window" = check_signal per bar
+    dengan trailing window, "vector" = signals() + fallback per bar.
+    """
+    settings = {"full": ("bar", 0), "window": ("bar", window), "vector": ("vector", window)}
+    columns = ['symbol', 'type', 'open_price', 'close_price', 'sl', 'tp', 'close_time', 'reason', 'comment']
+    results = []
+    for name in engines:
+        engine, engine_window = settings[name]
+        backtester = Backtester(start, end, quiet)
+        speed = backtester.run_symbol(csv_file, engine_window, engine)
+        results.append((name, pd.DataFrame(backtester.trade_history, columns=columns), speed))
+
+    reference = results[0][1]; all_identical = True
+    report_str = "\n" + "="*50 + "\n" + " " * 12 + "PERBANDINGAN ENGINE REPLAY" + "\n" + "="*50 + "\n"
+    report_str += f"File        : {os.path.basename(csv_file)}\n"
+    for name, trades, speed in results:
+        identical = len(trades) == len(reference) and trades[columns].reset_index(drop=True).equals(reference[columns].reset_index(drop=True))
+        all_identical &= identical
+        report_str += f"{name:<12}: {len(trades):>5} trade, {speed or 0:>8.0f} bar/detik, {'IDENTIK' if identical else 'BERBEDA'}\n"
+    report_str += "="*50 + "\n"
+    print(report_str)
+    return all_identical
+
 # ---------------------------
 # FUNGSI UNTUK MENJALANKAN
 # ---------------------------
 if __name__ == "__main__":
-    backtester = Backtester()
-    backtester.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Backtest semua strategi pada file CSV di folder data/.")
+    parser.add_argument("--window", type=int, default=WINDOW_BARS, help="Jumlah bar trailing per evaluasi (0 = history penuh).")
+    parser.add_argument("--engine", choices=["vector", "bar"], default=ENGINE, help="vector = signals() sekali per file, bar = check_signal per bar.")
+    parser.add_argument("--start", default=DATA_START, help="Awal rentang data, mis. 2024-01-01 (inklusif).")
+    parser.add_argument("--end", default=DATA_END, help="Akhir rentang data (eksklusif).")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="Jumlah proses paralel (satu simbol per proses).")
+    parser.add_argument("--portfolio-replay", action="store_true", help="Dengan --jobs: putar ulang trade gabungan secara kronologis untuk saldo tingkat portofolio.")
+    parser.add_argument("--compare", nargs="?", const="", metavar="CSV", help="Bandingkan beberapa engine replay pada satu CSV (default: CSV pertama di data/).")
+    parser.add_argument("--engines", default="full,window,vector", help="Engine yang dibandingkan oleh --compare (full, window, vector).")
+    parser.add_argument("--quiet", action="store_true", default=QUIET, help="Tanpa log per trade selama simulasi (hanya ringkasan per simbol); log per trade disusun dari trade_history di level DEBUG.")
+    args = parser.parse_args()
+    enable_trade_events(TRADE_EVENTS_FILE)
+
+    if args.compare is not None:
+        csv_file = args.compare or next(iter(data_files()), None)
+        if not csv_file: logging.error(f"Tidak ada file CSV yang ditemukan di folder '{DATA_FOLDER}'.")
+        else: compare_engines(csv_file, [e.strip() for e in args.engines.split(',') if e.strip()], args.window, args.start, args.end, args.quiet)
+    elif args.jobs > 1:
+        Backtester(args.start, args.end, args.quiet).run_parallel(args.jobs, args.window, args.engine, args.portfolio_replay)
+    else:
+        backtester = Backtester(args.start, args.end, args.quiet)
+        backtester.run(args.window, args.engine)
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Cache bar inkremental per simbol untuk loop live.
+
+Setelah load awal (`rows` bar), setiap siklus hanya meminta beberapa bar terbaru ke MT5
+(`refresh_rows`, termasuk bar yang sedang berjalan). Bar dengan waktu yang sudah ada di buffer
+ditimpa di tempat (bar berjalan / bar yang baru final), bar baru ditambahkan di ujung. Jika
+ada celah (bar terlama dari hasil refresh lebih baru dari bar terakhir di buffer, mis. setelah
+koneksi putus), buffer dimuat ulang penuh.
+
+Frame untuk strategi dibangun dari buffer tanpa panggilan MT5 dan tanpa pd.to_datetime,
+dengan kolom dan dtype yang sama seperti copy_ohlc.
+"""
+import threading
+import numpy as np
+import pandas as pd
+
+
+def rates_to_frame(rates):
+    """DataFrame dengan kolom & dtype seperti copy_ohlc dari array rates MT5."""
+    columns = {name: rates[name] for name in rates.dtype.names}
+    columns['time'] = rates['time'].astype('datetime64[s]').astype('datetime64[ns]')
+    return pd.DataFrame(columns)
+
+
+class BarBuffer:
+    """
+    Buffer bar berkapasitas tetap. Data disimpan linear dalam array 2x kapasitas; saat ujungnya
+    penuh, `capacity` bar terakhir disalin ke depan (amortisasi O(1) per bar), sehingga bar
+    terakhir selalu berupa potongan array yang kontigu.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = None
+        self._start = 0; self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def last_time(self):
+        return int(self._data['time'][self._end - 1]) if len(self) else None
+
+    def load(self, rates):
+        rates = rates[-self.capacity:]
+        self._data = np.empty(self.capacity * 2, dtype=rates.dtype)
+        self._data[:len(rates)] = rates
+        self._start = 0; self._end = len(rates)
+
+    def merge(self, rates):
+        """Gabungkan bar terbaru. Mengembalikan False jika ada celah (perlu load ulang penuh)."""
+        if not len(self) or not len(rates) or int(rates['time'][0]) > self.last_time: return False
+        tail = self._data[max(self._start, self._end - len(rates)):self._end]
+        for rate in rates:
+            t = int(rate['time'])
+            if t > self.last_time: self._append(rate); continue
+            k = int(np.searchsorted(tail['time'], t))
+            if k < len(tail) and tail['time'][k] == t: tail[k] = rate
+        return True
+
+    def _append(self, rate):
+        if self._end == len(self._data):
+            keep = self._data[self._end - self.capacity + 1:self._end].copy()
+            self._data[:len(keep)] = keep
+            self._start = 0; self._end = len(keep)
+        self._data[self._end] = rate; self._end += 1
+        self._start = max(self._start, self._end - self.capacity)
+
+    def view(self):
+        return self._data[self._start:self._end]
+
+    def frame(self):
+        return rates_to_frame(self.view())
+
+
+class BarCache:
+    """
+    Satu BarBuffer per (simbol, timeframe). `fetch(symbol, timeframe, start_pos, count)` mengembalikan
+    array rates MT5 (atau None) dan mengambil lock MT5 sendiri (lihat main.copy_rates).
+    """
+    def __init__(self, fetch, rows=200, refresh_rows=3):
+        self.fetch = fetch; self.rows = rows; self.refresh_rows = refresh_rows
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._key_locks = {}
+        self.full_loads = 0
+        self.refreshes = 0
+
+    def get(self, symbol, timeframe):
+        """Frame OHLC `rows` bar terakhir (iloc[-1] = bar berjalan), atau DataFrame kosong jika gagal."""
+        rates = self.rates(symbol, timeframe)
+        return pd.DataFrame() if rates is None else rates_to_frame(rates)
+
+    def rates(self, symbol, timeframe):
+        """Seperti get(), tetapi mengembalikan salinan array rates di buffer (None jika gagal)."""
+        key = (symbol, timeframe)
+        with self._lock: key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Batch lintas simbol (BATCH_EVAL) dan worker simbol bisa meminta buffer yang sama bersamaan
+        with key_lock:
+            with self._lock: buffer = self._buffers.get(key)
+            if buffer is not None:
+                rates = self.fetch(symbol, timeframe, 0, self.refresh_rows)
+                if rates is None: return None
+                if buffer.merge(rates):
+                    self.refreshes += 1
+                    return buffer.view().copy()
+
+            rates = self.fetch(symbol, timeframe, 0, self.rows)
+            if rates is None or not len(rates): return None
+            buffer = BarBuffer(self.rows); buffer.load(rates)
+            with self._lock: self._buffers[key] = buffer
+            self.full_loads += 1
+            return buffer.view().copy()
+
+    def clear(self, symbol=None):
+        with self._lock:
+            if symbol is None: self._buffers.clear()
+            else: self._buffers = {key: buffer for key, buffer in self._buffers.items() if key[0] != symbol}
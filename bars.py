@@ -0,0 +1,98 @@
+"""
+Container bar ringan berbasis NumPy untuk jalur panas strategi (live dan backtest).
+
+`Bars` membungkus kolom time, open, high, low, close dan tick_volume sebagai array NumPy tanpa
+salinan (view kolom array rates MT5, atau kolom DataFrame backtest):
+
+    bars['close']   -> ndarray kolom
+    bars[-2]        -> satu bar (dict kolom -> nilai), pengganti ohlc.iloc[-2]
+    bars[-50:-2]    -> Bars baru (view, tanpa salinan)
+    len(bars), bars.last_time
+    bars.highest('high', -52, -2), bars.lowest('low', -52, -2)   -> ekstrem window (O(1), lihat range_index.py)
+    bars.rolling_extreme('high', 'max', 9)                         -> seperti rolling(9).max()
+
+`time` selalu detik epoch (int64) seperti di array rates MT5. Strategi yang belum di-port bisa
+memakai `bars.to_frame()` (DataFrame seperti copy_ohlc, di-cache per objek).
+"""
+import numpy as np
+import pandas as pd
+
+from range_index import RangeExtremes
+
+COLUMNS = ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+
+
+class Bars:
+    # _root/_offset: Bars asal dan posisi awal view ini di dalamnya (indeks ekstrem dibagi lewat akar)
+    __slots__ = COLUMNS + ('_frame', '_root', '_offset', '_extremes', '_stream')
+
+    def __init__(self, time, open, high, low, close, tick_volume, root=None, offset=0):
+        self.time = time; self.open = open; self.high = high; self.low = low
+        self.close = close; self.tick_volume = tick_volume
+        self._frame = None; self._root = root if root is not None else self; self._offset = offset
+        self._extremes = None; self._stream = None
+
+    @classmethod
+    def from_rates(cls, rates):
+        """View kolom array rates MT5 (structured array)."""
+        return cls(*(rates[column] for column in COLUMNS))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Dari DataFrame berkolom COLUMNS dengan `time` datetime (CSV / data_store backtest)."""
+        time = df['time'].to_numpy().astype('datetime64[s]').astype(np.int64)
+        return cls(time, *(df[column].to_numpy() for column in COLUMNS[1:]))
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in COLUMNS: raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, slice):
+            positions = range(len(self))[key]
+            if positions.step != 1: return Bars(*(getattr(self, column)[key] for column in COLUMNS))
+            return Bars(*(getattr(self, column)[key] for column in COLUMNS), root=self._root, offset=self._offset + positions.start)
+        return {column: getattr(self, column)[key] for column in COLUMNS}
+
+    @property
+    def last_time(self):
+        return self.time[-1] if len(self.time) else None
+
+    def use_stream(self, stream):
+        """Pakai StreamExtremes (deque per simbol, live) untuk query window pada Bars akar ini."""
+        self._root._stream = stream
+
+    def highest(self, column, start=None, stop=None):
+        """Seperti bars[column][start:stop].max(), NaN jika window kosong."""
+        return self._window_extreme(column, 'max', start, stop)
+
+    def lowest(self, column, start=None, stop=None):
+        """Seperti bars[column][start:stop].min(), NaN jika window kosong."""
+        return self._window_extreme(column, 'min', start, stop)
+
+    def _window_extreme(self, column, op, start, stop):
+        positions = range(len(self))[start:stop]
+        if not len(positions): return np.nan
+        root = self._root; start = self._offset + positions.start; stop = self._offset + positions.stop
+        if root._stream is not None:
+            value = root._stream.query(root, column, op, start, stop)
+            if value is not None: return value
+        return root._index().query(column, op, start, stop)
+
+    def rolling_extreme(self, column, op, period):
+        """Array seperti pd.Series(bars[column]).rolling(period).max()/min() ('max'/'min')."""
+        return self._root._index().rolling(column, op, period, self._offset, self._offset + len(self))
+
+    def _index(self):
+        if self._extremes is None: self._extremes = RangeExtremes(self)
+        return self._extremes
+
+    def to_frame(self):
+        """DataFrame dengan kolom & dtype seperti copy_ohlc (untuk strategi yang belum di-port)."""
+        if self._frame is None:
+            columns = {column: getattr(self, column) for column in COLUMNS}
+            columns['time'] = self.time.astype('datetime64[s]').astype('datetime64[ns]')
+            self._frame = pd.DataFrame(columns)
+        return self._frame
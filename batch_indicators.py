@@ -0,0 +1,61 @@
+"""
+Indikator batch lintas simbol untuk mode live BATCH_EVAL.
+
+Bar semua simbol yang bar tertutup terakhirnya sama ditumpuk menjadi DataFrame 2-D
+(bar x simbol) per kolom OHLC. Indikator dihitung sekali untuk semua simbol dengan operasi
+rolling pandas yang sama seperti FrameIndicators. Rolling pandas menghitung tiap kolom dengan
+kernel 1-D yang sama, jadi nilainya identik dengan perhitungan per simbol. Tiap strategi lalu
+menandai simbol yang kondisinya terpicu lewat `batch_trigger(batch)`, dan hanya simbol/strategi
+itu yang diteruskan ke check_signal.
+"""
+import numpy as np
+import pandas as pd
+
+from indicators import FrameIndicators
+
+
+class BatchIndicators(FrameIndicators):
+    """FrameIndicators di atas BarBatch: setiap hasil berupa DataFrame (bar x simbol)."""
+    def true_range(self):
+        def compute():
+            high, low, close = self.column('high'), self.column('low'), self.column('close')
+            ranges = np.stack([(high - low).to_numpy(), (high - close.shift(1)).abs().to_numpy(), (low - close.shift(1)).abs().to_numpy()])
+            # fmax mengabaikan NaN seperti max(axis=1) pada versi per simbol
+            return pd.DataFrame(np.fmax.reduce(ranges, axis=0), index=high.index, columns=high.columns)
+        return self._get(('tr',), compute)
+
+
+class BarBatch:
+    """Bar beberapa simbol dengan panjang sama, ditumpuk per kolom menjadi (bar x simbol)."""
+    def __init__(self, rates_by_symbol):
+        self.symbols = list(rates_by_symbol)
+        self._rates = [rates_by_symbol[symbol] for symbol in self.symbols]
+        self.length = len(self._rates[0])
+        self._frames = {}
+        self.indicators = BatchIndicators(self, None)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, column):
+        frame = self._frames.get(column)
+        if frame is None:
+            frame = self._frames[column] = pd.DataFrame(np.column_stack([rates[column] for rates in self._rates]), columns=self.symbols)
+        return frame
+
+    def values(self, column):
+        return self[column].to_numpy()
+
+
+def batch_selection(batch, strategies):
+    """
+    simbol -> indeks strategi (urutan asli) yang perlu dievaluasi: yang terpicu, ditambah strategi
+    tanpa batch_trigger. `strategies` adalah instance untuk salah satu simbol; parameternya sama
+    untuk semua simbol.
+    """
+    selected = {symbol: [] for symbol in batch.symbols}
+    for index, strategy in enumerate(strategies):
+        mask = strategy.batch_trigger(batch)
+        for k, symbol in enumerate(batch.symbols):
+            if mask is None or mask[k]: selected[symbol].append(index)
+    return selected
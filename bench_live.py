@@ -0,0 +1,97 @@
+"""
+Benchmark skala loop live: menjalankan main() terhadap mt5_sim untuk beberapa jumlah simbol.
+
+    python bench_live.py --symbols 10,100,300 --duration 60 --speed 60 --latency-ms 1
+
+Setiap jumlah simbol dijalankan di proses baru (state global main.py bersih) dengan jam pasar
+dipercepat `speed` kali. Yang dilaporkan per jumlah simbol (semua dalam ms waktu nyata):
+- Siklus: keterlambatan mulai evaluasi simbol setelah bar ditutup (rata-rata / terburuk, termasuk
+  BAR_CLOSE_GRACE_SEC), dari metrik SymbolWorkerPool.
+- Tunggu gateway: waktu antri panggilan MT5 sebelum dieksekusi (pengganti lock wait mt_lock).
+- Bar -> order: dari bar ditutup sampai order_send diterima terminal simulasi.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_worker(args):
+    sys.path.insert(0, HERE)
+    import mt5_sim
+    sim = mt5_sim.configure(data_folder=args.data, symbols=args.worker, speed=args.speed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    sys.modules['MetaTrader5'] = mt5_sim
+    os.environ.update({'PAIRS_TO_TRADE': ','.join(sim.data), 'TIMEFRAME': 'M1', 'REPORT_INTERVAL_MINUTES': '100000',
+                       'TRADE_DB_FILE': os.path.join(args.workdir, 'trade_history.db'), 'SYMBOL_SPECS_FILE': os.path.join(args.workdir, 'symbol_specs.json')})
+    import main
+    from scheduler import BarCloseScheduler
+    main.setup_runtime() # main() tidak membuat ulang objek yang sudah dipasang
+    # Bot memakai jam simulasi: jadwal bar, metrik keterlambatan pool, dan umur snapshot
+    main.SCHEDULER = BarCloseScheduler(60, main.POOL.submit, main.BAR_CLOSE_GRACE_SEC, clock=sim.clock.time, time_scale=args.speed)
+    main.POOL.clock = sim.clock.time; main.SNAPSHOT.clock = sim.clock.time
+
+    bot = threading.Thread(target=main.main, name="Bot", daemon=True)
+    started = time.perf_counter(); bot.start()
+    time.sleep(args.duration)
+    main.stop_event.set(); bot.join(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    to_ms = 1000.0 / args.speed # detik simulasi -> ms nyata
+    lateness = main.POOL.lateness()
+    gateway = main.GATEWAY.metrics()
+    calls = sum(stats['calls'] for stats in gateway.values())
+    latency = sim.order_latency
+    result = {
+        'symbols': len(sim.data), 'seconds': round(elapsed, 1), 'evaluations': sum(count for count, _, _ in lateness.values()),
+        'cycle_avg_ms': sum(avg for _, avg, _ in lateness.values()) / max(len(lateness), 1) * to_ms,
+        'cycle_max_ms': max((worst for _, _, worst in lateness.values()), default=0.0) * to_ms,
+        'gateway_calls': calls, 'gateway_wait_avg_ms': sum(stats['wait_total'] for stats in gateway.values()) / max(calls, 1) * 1000,
+        'gateway_wait_max_ms': max((stats['wait_max'] for stats in gateway.values()), default=0.0) * 1000,
+        'orders': len(latency), 'order_avg_ms': sum(latency) / len(latency) * 1000 if latency else 0.0, 'order_max_ms': max(latency, default=0.0) * 1000,
+    }
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skala loop live terhadap mt5_sim.")
+    parser.add_argument('--symbols', default='10,100,300', help="Daftar jumlah simbol, dipisah koma")
+    parser.add_argument('--duration', type=float, default=60, help="Lama setiap run (detik nyata)")
+    parser.add_argument('--speed', type=float, default=60, help="Percepatan jam pasar (60 = satu bar M1 per detik)")
+    parser.add_argument('--latency-ms', type=float, default=1.0, help="Latensi per panggilan MT5 simulasi")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Variasi acak latensi (+-)")
+    parser.add_argument('--data', default=os.path.join(os.getcwd(), 'data'), help="Folder CSV yang diputar ulang")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker: return run_worker(args)
+
+    rows = []
+    for count in (int(value) for value in args.symbols.split(',') if value.strip()):
+        with tempfile.TemporaryDirectory() as workdir:
+            command = [sys.executable, os.path.abspath(__file__), '--worker', str(count), '--workdir', workdir, '--duration', str(args.duration),
+                       '--speed', str(args.speed), '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms), '--data', os.path.abspath(args.data)]
+            print(f"Menjalankan {count} simbol selama {args.duration:.0f} detik...", flush=True)
+            # Log bot (file & konsol) tetap di direktori kerja sementara; hanya baris hasil JSON yang dibaca
+            completed = subprocess.run(command, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            lines = [line for line in completed.stdout.splitlines() if line.startswith('{')]
+            if completed.returncode != 0 or not lines: print(f"  Gagal (kode {completed.returncode})."); continue
+            rows.append(json.loads(lines[-1]))
+
+    print("\n" + "="*96)
+    print(f"| {'Simbol':>6} | {'Evaluasi':>8} | {'Siklus avg/max (ms)':>20} | {'Tunggu gateway avg/max (ms)':>28} | {'Order':>5} | {'Bar->order avg/max (ms)':>23}")
+    print("-"*96)
+    for row in rows:
+        cycle = f"{row['cycle_avg_ms']:.1f}/{row['cycle_max_ms']:.1f}"
+        wait = f"{row['gateway_wait_avg_ms']:.2f}/{row['gateway_wait_max_ms']:.1f}"
+        order = f"{row['order_avg_ms']:.1f}/{row['order_max_ms']:.1f}"
+        print(f"| {row['symbols']:>6} | {row['evaluations']:>8} | {cycle:>20} | {wait:>28} | {row['orders']:>5} | {order:>23}")
+    print("="*96)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Penyimpanan data pasar kolumnar (Parquet) untuk backtester.
+
+Impor sekali dari CSV di data/ ke Parquet yang dipartisi per simbol dan bulan:
+
+    data_store/symbol=EURUSD/month=2024-01/*.parquet
+
+Saat backtest, `load()` hanya membaca kolom dan rentang waktu yang diminta. Partisi bulan di luar
+rentang tidak disentuh, dan row group lain dilewati lewat statistik min/max kolom `time`.
+File dibaca dengan memory-map, jadi tidak ada biaya parsing teks seperti pd.read_csv.
+"""
+import os
+import glob
+import shutil
+import argparse
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from helpers import get_env_var
+
+STORE_FOLDER = get_env_var('BACKTEST_STORE_FOLDER', 'data_store')
+COLUMNS = ['time', 'open', 'high', 'low', 'close', 'tick_volume']
+
+
+def _symbol_folder(symbol, store_folder=STORE_FOLDER):
+    return os.path.join(store_folder, f"symbol={symbol.upper()}")
+
+
+def has_symbol(symbol, store_folder=STORE_FOLDER):
+    return os.path.isdir(_symbol_folder(symbol, store_folder))
+
+
+def symbols(store_folder=STORE_FOLDER):
+    """Daftar simbol yang sudah diimpor ke store."""
+    return sorted(os.path.basename(path).split('=', 1)[1] for path in glob.glob(os.path.join(store_folder, "symbol=*")))
+
+
+def last_modified(symbol, store_folder=STORE_FOLDER):
+    files = glob.glob(os.path.join(_symbol_folder(symbol, store_folder), "**", "*.parquet"), recursive=True)
+    return max((os.path.getmtime(f) for f in files), default=0.0)
+
+
+def import_csv(csv_file, store_folder=STORE_FOLDER):
+    """Konversi satu CSV (format data/<SIMBOL>_*.csv) ke store; partisi simbol tersebut ditulis ulang."""
+    symbol = os.path.basename(csv_file).split('_')[0].upper()
+    df = pd.read_csv(csv_file, parse_dates=['timestamp'])
+    df.rename(columns={'timestamp': 'time', 'volume': 'tick_volume'}, inplace=True)
+    missing = [col for col in COLUMNS if col not in df.columns]
+    if missing: raise ValueError(f"Kolom yang dibutuhkan hilang dari CSV: {', '.join(missing)}")
+
+    df = df[COLUMNS].sort_values('time', kind='stable')
+    df['month'] = df['time'].dt.strftime('%Y-%m')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    symbol_folder = _symbol_folder(symbol, store_folder)
+    if os.path.isdir(symbol_folder): shutil.rmtree(symbol_folder) # Bulan lama yang tidak ada lagi di CSV ikut dibuang
+    # Row group kecil agar filter rentang waktu bisa melewati sebagian besar isi satu bulan
+    pq.write_to_dataset(table, symbol_folder, partition_cols=['month'], row_group_size=64 * 1024)
+    logging.info(f"{os.path.basename(csv_file)} diimpor ke {symbol_folder} ({len(df)} bar, {df['month'].nunique()} bulan).")
+    return len(df)
+
+
+def load(symbol, start=None, end=None, columns=COLUMNS, store_folder=STORE_FOLDER):
+    """
+    Baca bar `symbol` dengan start <= time < end (None = tanpa batas). Mengembalikan DataFrame
+    berkolom `columns` yang terurut waktu, atau None jika simbol belum ada di store.
+    """
+    if not has_symbol(symbol, store_folder): return None
+    filters = []
+    if start is not None:
+        start = pd.Timestamp(start); filters += [('month', '>=', start.strftime('%Y-%m')), ('time', '>=', start)]
+    if end is not None:
+        end = pd.Timestamp(end); filters += [('month', '<=', end.strftime('%Y-%m')), ('time', '<', end)]
+    partitioning = ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive')
+    table = pq.read_table(_symbol_folder(symbol, store_folder), columns=list(columns), filters=filters or None,
+                          partitioning=partitioning, memory_map=True)
+    df = table.to_pandas()
+    if 'time' in df.columns: df = df.sort_values('time', kind='stable').reset_index(drop=True)
+    return df
+
+
+# ---------------------------
+# FUNGSI UNTUK MENJALANKAN
+# ---------------------------
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | DATA STORE | %(message)s")
+    parser = argparse.ArgumentParser(description="Impor CSV di data/ ke store Parquet untuk backtester.")
+    parser.add_argument("csv", nargs="*", help="File CSV yang diimpor (default: semua CSV di data/).")
+    parser.add_argument("--store", default=STORE_FOLDER, help="Folder tujuan store Parquet.")
+    args = parser.parse_args()
+
+    csv_files = args.csv or sorted(glob.glob(os.path.join("data", "*.csv")))
+    if not csv_files: logging.error("Tidak ada file CSV yang ditemukan di folder 'data'.")
+    for csv_file in csv_files:
+        try: import_csv(csv_file, args.store)
+        except Exception as e: logging.error(f"Gagal mengimpor {csv_file}: {e}")
@@ -1,11 +1,29 @@
 import os
 import logging
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# .env dimuat di sini (bukan hanya di main.py) agar backtest & proses evaluator membaca parameter yang sama
+load_dotenv()
+
+# Parameter yang disuntikkan (mis. oleh optimizer) dan diutamakan di atas .env
+PARAM_OVERRIDES = {}
+
+@contextmanager
+def override_params(params):
+    """Selama blok `with`, get_env_var membaca nilai dari `params` (nama variabel .env -> nilai)."""
+    previous = dict(PARAM_OVERRIDES)
+    PARAM_OVERRIDES.update(params)
+    try:
+        yield
+    finally:
+        PARAM_OVERRIDES.clear(); PARAM_OVERRIDES.update(previous)
 
 def get_env_var(name, default, type_func=str):
-    value = os.getenv(name, default)
+    value = PARAM_OVERRIDES[name] if name in PARAM_OVERRIDES else os.getenv(name, default)
     try:
         if type_func == bool:
-            return value.lower() in ['true', '1', 't', 'y', 'yes']
+            return str(value).lower() in ['true', '1', 't', 'y', 'yes']
         return type_func(value)
     except (ValueError, TypeError):
         logging.warning(f"Variabel .env '{name}' tidak valid. Menggunakan default: {default}")
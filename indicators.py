@@ -0,0 +1,132 @@
+"""
+Cache indikator bersama untuk semua strategi.
+
+Semua strategi dalam satu siklus menerima frame OHLC yang sama. Daripada setiap
+strategi menghitung ulang ATR, SMA, std, dll., strategi meminta indikator lewat
+`INDICATOR_CACHE.get(symbol, ohlc)`. Setiap (indikator, parameter) hanya dihitung
+sekali per (simbol, waktu bar terakhir) dan entri lama dibuang otomatis.
+"""
+import threading
+import numpy as np
+import pandas as pd
+
+from bars import Bars
+
+
+class FrameIndicators:
+    """Indikator yang sudah dihitung untuk satu frame OHLC."""
+    def __init__(self, ohlc, last_time):
+        self.ohlc = ohlc
+        self.last_time = last_time
+        self._values = {}
+
+    def _get(self, key, compute):
+        value = self._values.get(key)
+        if value is None:
+            value = compute()
+            self._values[key] = value
+        return value
+
+    def column(self, column):
+        """Kolom OHLC sebagai Series; kolom Bars (ndarray) dibungkus tanpa salinan."""
+        def compute():
+            values = self.ohlc[column]
+            return pd.Series(values, copy=False) if isinstance(values, np.ndarray) else values
+        return self._get(('column', column), compute)
+
+    # --- Rolling dasar ---
+    def sma(self, column, period):
+        return self._get(('sma', column, period), lambda: self.column(column).rolling(window=period).mean())
+
+    def rolling_std(self, column, period):
+        return self._get(('std', column, period), lambda: self.column(column).rolling(window=period).std())
+
+    def rolling_max(self, column, period):
+        return self._get(('max', column, period), lambda: self._rolling_extreme(column, 'max', period))
+
+    def rolling_min(self, column, period):
+        return self._get(('min', column, period), lambda: self._rolling_extreme(column, 'min', period))
+
+    def _rolling_extreme(self, column, op, period):
+        # Bars: dari indeks ekstrem akar (sparse table), tanpa rolling ulang per window
+        if isinstance(self.ohlc, Bars): return pd.Series(self.ohlc.rolling_extreme(column, op, period), copy=False)
+        rolling = self.column(column).rolling(window=period)
+        return rolling.max() if op == 'max' else rolling.min()
+
+    # --- Indikator turunan ---
+    def true_range(self):
+        def compute():
+            high, low, close = self.column('high'), self.column('low'), self.column('close')
+            # fmax mengabaikan NaN (bar pertama) sama seperti pd.concat(...).max(axis=1), tanpa membangun DataFrame
+            ranges = np.fmax(np.fmax((high - low).to_numpy(), (high - close.shift(1)).abs().to_numpy()), (low - close.shift(1)).abs().to_numpy())
+            return pd.Series(ranges, index=high.index)
+        return self._get(('tr',), compute)
+
+    def atr(self, period):
+        return self._get(('atr', period), lambda: self.true_range().rolling(period).mean())
+
+    def rsi_averages(self, period):
+        """Rata-rata gain dan loss (SMA) seperti yang dipakai Rsi_Oversold."""
+        def compute():
+            delta = self.column('close').diff()
+            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+            return gain, loss
+        return self._get(('rsi_avg', period), compute)
+
+    def bollinger(self, period, std_dev):
+        """Mengembalikan (middle, upper, lower)."""
+        def compute():
+            middle_band = self.sma('close', period)
+            std = self.rolling_std('close', period)
+            return middle_band, middle_band + (std * std_dev), middle_band - (std * std_dev)
+        return self._get(('bollinger', period, std_dev), compute)
+
+    def bollinger_bandwidth(self, period, std_dev):
+        def compute():
+            middle_band, upper_band, lower_band = self.bollinger(period, std_dev)
+            return (upper_band - lower_band) / middle_band
+        return self._get(('bandwidth', period, std_dev), compute)
+
+    def stochastic(self, k_period, d_period):
+        """Mengembalikan (%K, %D)."""
+        def compute():
+            low_k = self.rolling_min('low', k_period)
+            high_k = self.rolling_max('high', k_period)
+            percent_k = 100 * ((self.column('close') - low_k) / (high_k - low_k))
+            return percent_k, percent_k.rolling(window=d_period).mean()
+        return self._get(('stoch', k_period, d_period), compute)
+
+
+class IndicatorCache:
+    """Satu entri FrameIndicators per simbol; entri diganti saat bar/frame baru masuk."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, ohlc):
+        if isinstance(ohlc, Bars): last_time = ohlc.last_time
+        else: last_time = ohlc['time'].iat[-1] if len(ohlc) else None
+        with self._lock:
+            entry = self._entries.get(symbol)
+            # Frame yang sama (objek yang sama) dengan bar terakhir yang sama -> pakai ulang.
+            # Bar yang sedang berjalan (iloc[-1]) bisa berubah tanpa mengubah waktunya,
+            # jadi frame baru dari siklus berikutnya selalu dihitung ulang.
+            if entry is not None and entry.ohlc is ohlc and entry.last_time == last_time:
+                self.hits += 1
+                return entry
+            entry = FrameIndicators(ohlc, last_time)
+            self._entries[symbol] = entry
+            self.misses += 1
+            return entry
+
+    def clear(self, symbol=None):
+        with self._lock:
+            if symbol is None: self._entries.clear()
+            else: self._entries.pop(symbol, None)
+
+
+# Instance global yang dipakai bersama oleh semua strategi
+INDICATOR_CACHE = IndicatorCache()
@@ -0,0 +1,172 @@
+"""
+Pipeline logging asinkron untuk bot live dan backtest.
+
+- setup_logging(): root logger hanya memasukkan record ke antrian (DeferredQueueHandler); satu
+  thread listener memformat dan menulis ke file (BatchedFileHandler: banyak baris per write(),
+  di-flush per batch, tiap `flush_interval` detik, dan langsung untuk WARNING ke atas) dan ke konsol.
+  Thread worker tidak pernah menunggu I/O log. Setelah fork (proses paralel backtest), listener
+  dinyalakan ulang di proses anak.
+- enable_trade_events(): sink JSONL opsional untuk event trade terstruktur (order live, posisi
+  backtest) lewat trade_event(); tanpa sink, trade_event() langsung kembali.
+- suppressed(): konteks untuk mode senyap backtest (log INFO strategi tidak dibuat sama sekali).
+"""
+import atexit
+from contextlib import contextmanager
+import json
+import logging
+import logging.handlers
+import multiprocessing.util
+import os
+import queue
+import sys
+import time
+
+_FLUSH = object() # Penanda dari listener saat antrian kosong selama flush_interval
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler tanpa format di thread pemanggil; pesan diformat oleh listener."""
+    def prepare(self, record):
+        # Antrian in-process: record dikirim apa adanya (tidak perlu dipickle), getMessage() di listener
+        return record
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener yang mem-flush handler saat antrian diam selama `flush_interval` detik."""
+    def __init__(self, log_queue, *handlers, flush_interval=1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        # SimpleQueue tidak punya task_done, jadi penanda _FLUSH aman dikembalikan ke _monitor
+        try: return self.queue.get(block, self.flush_interval if block else None)
+        except queue.Empty: return _FLUSH
+
+    def handle(self, record):
+        if record is _FLUSH:
+            for handler in self.handlers: handler.flush()
+            return
+        super().handle(record)
+
+
+class BatchedFileHandler(logging.Handler):
+    """Menulis record yang sudah diformat ke file per batch (dipanggil hanya dari thread listener)."""
+    def __init__(self, filename, batch_size=256, flush_interval=1.0, encoding='utf-8'):
+        super().__init__()
+        self.filename = filename; self.batch_size = batch_size; self.flush_interval = flush_interval
+        self.stream = open(filename, 'a', encoding=encoding)
+        self._buffer = []; self._last_flush = time.monotonic()
+
+    def render(self, record):
+        return self.format(record)
+
+    def emit(self, record):
+        try: self._buffer.append(self.render(record) + '\n')
+        except Exception: self.handleError(record); return
+        if len(self._buffer) >= self.batch_size or record.levelno >= logging.WARNING or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._buffer and not self.stream.closed:
+            self.stream.write(''.join(self._buffer)); self.stream.flush(); self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush(); self.stream.close(); super().close()
+
+
+class JsonlHandler(BatchedFileHandler):
+    """Satu objek JSON per baris dari record.event (dict)."""
+    def render(self, record):
+        return json.dumps(record.event, default=str)
+
+
+_listeners = []
+
+def _start(log_queue, handlers, flush_interval):
+    listener = BatchingQueueListener(log_queue, *handlers, flush_interval=flush_interval)
+    listener.start(); _listeners.append(listener)
+    return listener
+
+def _restart_in_child():
+    # Thread listener tidak ikut ter-fork: buat listener baru dengan antrian & handler yang sama
+    listeners = list(_listeners); _listeners.clear()
+    for listener in listeners:
+        # Record & baris yang belum ditulis milik proses induk; jangan ditulis dua kali
+        try:
+            while True: listener.queue.get_nowait()
+        except queue.Empty: pass
+        for handler in listener.handlers:
+            if isinstance(handler, BatchedFileHandler): handler._buffer.clear()
+        _start(listener.queue, listener.handlers, listener.flush_interval)
+
+def stop_logging():
+    """Tulis sisa antrian & buffer lalu hentikan semua listener (dipanggil otomatis saat exit)."""
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            # Seperti logging.shutdown(): stream yang sudah ditutup (mis. stderr milik pytest) diabaikan saat exit
+            try: handler.flush()
+            except (OSError, ValueError): pass
+
+def flush_at_worker_exit():
+    """
+    Panggil dari initializer proses worker multiprocessing: worker keluar lewat os._exit sehingga
+    atexit tidak jalan, tetapi finalizer multiprocessing tetap dijalankan sebelum keluar.
+    """
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=10)
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'): os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def setup_logging(logfile=None, fmt="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO, console=True, batch_size=256, flush_interval=1.0):
+    """Ganti handler root logger dengan pipeline antrian -> listener (file batch dan/atau konsol)."""
+    formatter = logging.Formatter(fmt); handlers = []
+    if logfile: handlers.append(BatchedFileHandler(logfile, batch_size, flush_interval))
+    if console: handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers: handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers): root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue)); root.setLevel(level)
+    return _start(log_queue, handlers, flush_interval)
+
+
+_TRADE_LOGGER = logging.getLogger('trade_events')
+_TRADE_LOGGER.propagate = False
+_trade_events_path = ''
+
+def enable_trade_events(path, batch_size=256, flush_interval=1.0):
+    """Aktifkan sink JSONL untuk trade_event(); path kosong = tidak ada sink."""
+    global _trade_events_path
+    if not path or _TRADE_LOGGER.handlers: return
+    _trade_events_path = path
+    log_queue = queue.SimpleQueue()
+    _TRADE_LOGGER.addHandler(DeferredQueueHandler(log_queue)); _TRADE_LOGGER.setLevel(logging.INFO)
+    _start(log_queue, [JsonlHandler(path, batch_size, flush_interval)], flush_interval)
+
+def trade_events_enabled():
+    return bool(_TRADE_LOGGER.handlers)
+
+def trade_events_path():
+    """Path sink JSONL yang aktif ('' = nonaktif), untuk diteruskan ke proses worker."""
+    return _trade_events_path if _TRADE_LOGGER.handlers else ''
+
+def trade_event(kind, **fields):
+    """Catat event trade terstruktur ({'event': kind, ...}) ke sink JSONL, jika aktif."""
+    if not _TRADE_LOGGER.handlers: return
+    fields['event'] = kind; fields.setdefault('ts', time.time())
+    _TRADE_LOGGER.info(kind, extra={'event': fields})
+
+
+@contextmanager
+def suppressed(enabled=True, level=logging.WARNING):
+    """Selama blok `with`, log root di bawah `level` tidak dibuat (mode senyap backtest)."""
+    root = logging.getLogger(); previous = root.level
+    if enabled: root.setLevel(max(previous, level))
+    try:
+        yield
+    finally:
+        root.setLevel(previous)
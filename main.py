@@ -8,7 +8,6 @@ Fitur:
 - Konfigurasi Terpusat: Semua pengaturan dikelola melalui file .env.
 - Logika Cerdas: Termasuk validasi breakout, penanganan stop level, dll.
 """
-import MetaTrader5 as mt
 import pandas as pd
 import numpy as np
 import threading
@@ -16,12 +15,27 @@ import time
 import logging
 import math
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from decimal import Decimal, ROUND_HALF_UP
 
 from helpers import get_env_var, AGGRESSION_LEVEL
-from strategies import STRATEGY_FACTORY
+import mt5_constants
+from bar_cache import BarCache
+from bars import Bars
+from range_index import StreamExtremes
+from batch_indicators import BarBatch, batch_selection
+from signal_memo import SignalMemo
+from market_snapshot import MarketSnapshot
+from symbol_specs import SYMBOL_SPECS, SymbolSpec
+from trade_store import TradeStore
+from log_pipeline import setup_logging, enable_trade_events
+from process_eval import ProcessEvaluator
+from scheduler import BarCloseScheduler, TIMEFRAME_SECONDS
+from symbol_pool import SymbolWorkerPool
+from mt5_gateway import MT5Gateway, PRIORITY_ORDER, PRIORITY_MARKET, PRIORITY_DATA, PRIORITY_HISTORY
+from strategies import STRATEGY_FACTORY, MAGIC_STRATEGY, is_bot_position
+from strategies.strategy_base import set_order_sender
 
 # ---------------------------
 # 1. SETUP KONFIGURASI DAN LOGGING
@@ -45,72 +59,127 @@ SERVER = get_env_var('MT5_SERVER', None)
 
 # Pengaturan Global
 TIMEFRAME_STR = get_env_var('TIMEFRAME', 'M1')
-TIMEFRAME_MAP = {"M1": mt.TIMEFRAME_M1, "M5": mt.TIMEFRAME_M5, "M15": mt.TIMEFRAME_M15, "H1": mt.TIMEFRAME_H1}
-INTERVAL = TIMEFRAME_MAP.get(TIMEFRAME_STR.upper(), mt.TIMEFRAME_M1)
-LOOP_DELAY_SEC = get_env_var('LOOP_DELAY_SEC', 60, int)
+TIMEFRAME_MAP = {"M1": mt5_constants.TIMEFRAME_M1, "M5": mt5_constants.TIMEFRAME_M5, "M15": mt5_constants.TIMEFRAME_M15, "H1": mt5_constants.TIMEFRAME_H1}
+INTERVAL = TIMEFRAME_MAP.get(TIMEFRAME_STR.upper(), mt5_constants.TIMEFRAME_M1)
+# Evaluasi dijalankan tepat setelah bar TIMEFRAME ditutup (+ grace), lalu dikonfirmasi dengan waktu bar broker
+BAR_CLOSE_GRACE_SEC = get_env_var('BAR_CLOSE_GRACE_SEC', 0.5, float)
+BAR_CONFIRM_RETRY_SEC = get_env_var('BAR_CONFIRM_RETRY_SEC', 0.5, float)
+BAR_CONFIRM_RETRIES = get_env_var('BAR_CONFIRM_RETRIES', 10, int)
+# Jumlah thread yang mengevaluasi simbol (tidak lagi satu thread per pair)
+WORKER_POOL_SIZE = get_env_var('WORKER_POOL_SIZE', 4, int)
+# > 0: strategi dievaluasi di proses terpisah (bar lewat shared memory), proses ini hanya eksekusi order
+EVAL_PROCESSES = get_env_var('EVAL_PROCESSES', 0, int)
+# true: indikator semua pair dihitung sekaligus per bar, hanya pair dengan strategi terpicu yang dievaluasi
+BATCH_EVAL = get_env_var('BATCH_EVAL', 'false', bool)
 MAX_ALLOWED_SPREAD = get_env_var('MAX_ALLOWED_SPREAD', 50.0, float)
+# Lebar bucket spread (point) untuk memo sinyal; strategi dievaluasi ulang di bar yang sama hanya jika bucket berubah (0 = per bar saja)
+SIGNAL_MEMO_SPREAD_POINTS = get_env_var('SIGNAL_MEMO_SPREAD_POINTS', 5.0, float)
+# Umur maksimum snapshot posisi + tick semua pair sebelum diambil ulang dari MT5
+SNAPSHOT_MAX_AGE_SEC = get_env_var('SNAPSHOT_MAX_AGE_SEC', 0.5, float)
 AGGRESSION_LEVEL = get_env_var('AGGRESSION_LEVEL', 'medium').lower()
 REPORT_INTERVAL_MINUTES = get_env_var('REPORT_INTERVAL_MINUTES', 60, int)
+# Spesifikasi simbol (digits, point, tick size, stops level, contract size) disimpan ke file ini untuk start cepat
+SYMBOL_SPECS_FILE = get_env_var('SYMBOL_SPECS_FILE', 'symbol_specs.json')
+SYMBOL_SPECS_TTL_HOURS = get_env_var('SYMBOL_SPECS_TTL_HOURS', 24, float)
+# History trade tertutup (SQLite) untuk laporan kinerja, dipakai ulang setelah restart
+TRADE_DB_FILE = get_env_var('TRADE_DB_FILE', 'trade_history.db')
 LOGFILE = "mt5_bot_v2.6.log"
-
-# Setup logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(threadName)s | %(message)s", handlers=[logging.FileHandler(LOGFILE), logging.StreamHandler()])
+# Event trade terstruktur (JSONL) untuk analisis; kosong = nonaktif
+TRADE_EVENTS_FILE = get_env_var('TRADE_EVENTS_FILE', '')
 
 # Kunci global dan event
 mt_lock = threading.Lock()
 stop_event = threading.Event()
+# Paket MetaTrader5, logging, gateway dan objek bersama lainnya dipasang oleh setup_runtime(), bukan saat impor:
+# proses evaluator hasil spawn (Windows) mengimpor ulang modul ini dan tidak boleh memuat MT5 / membuka file log
+mt = None
+GATEWAY = SNAPSHOT = BAR_CACHE = SIGNAL_MEMO = POOL = SCHEDULER = None
 
 # ---------------------------
 # 2. FUNGSI WRAPPER MT5
 # ---------------------------
 def mt_initialize_and_login():
-    with mt_lock:
-        if not mt.initialize(login=LOGIN, password=PASSWORD, server=SERVER): logging.error(f"MT5 init/login gagal: {mt.last_error()}"); return False
-        logging.info(f"Login berhasil ke MT5 {LOGIN}@{SERVER}"); return True
+    GATEWAY.start()
+    if not GATEWAY.call('initialize', mt.initialize, login=LOGIN, password=PASSWORD, server=SERVER, priority=PRIORITY_ORDER):
+        logging.error(f"MT5 init/login gagal: {GATEWAY.call('last_error', mt.last_error, priority=PRIORITY_ORDER)}"); GATEWAY.stop(); return False
+    logging.info(f"Login berhasil ke MT5 {LOGIN}@{SERVER}"); return True
 def mt_shutdown_safe():
-    with mt_lock: mt.shutdown(); logging.info("Koneksi MT5 ditutup.")
+    GATEWAY.stop() # Request yang masih mengantri diselesaikan dulu
+    GATEWAY.call('shutdown', mt.shutdown); logging.info("Koneksi MT5 ditutup.")
 def get_symbol_tick(symbol):
-    with mt_lock: return mt.symbol_info_tick(symbol)
+    return GATEWAY.call('symbol_info_tick', mt.symbol_info_tick, symbol, priority=PRIORITY_MARKET, coalesce=True)
+def get_symbol_ticks(symbols):
+    # Tick semua simbol dalam satu request gateway (satu sweep di thread gateway)
+    return GATEWAY.call('symbol_info_tick_all', lambda: {symbol: mt.symbol_info_tick(symbol) for symbol in symbols}, priority=PRIORITY_MARKET)
+def copy_rates(symbol, timeframe, start_pos, rows):
+    return GATEWAY.call('copy_rates', mt.copy_rates_from_pos, symbol, timeframe, start_pos, rows, priority=PRIORITY_DATA, coalesce=True)
 def copy_ohlc(symbol, timeframe, rows):
-    with mt_lock: rates = mt.copy_rates_from_pos(symbol, timeframe, 0, rows)
+    rates = copy_rates(symbol, timeframe, 0, rows)
     if rates is None: return pd.DataFrame()
     df = pd.DataFrame(rates); df['time'] = pd.to_datetime(df['time'], unit='s'); return df
+def positions_get_all():
+    # Satu positions_get() untuk semua simbol; worker yang meminta bersamaan berbagi hasilnya
+    return GATEWAY.call('positions_get', mt.positions_get, priority=PRIORITY_MARKET, coalesce=True)
 def positions_get_symbol(symbol):
-    with mt_lock: pos = mt.positions_get(symbol=symbol)
-    return pos if pos else []
+    positions = positions_get_all()
+    return [p for p in positions if p.symbol == symbol] if positions else []
+def positions_get_bot():
+    # Posisi milik bot ini saja: terminal memfilter pair yang dipantau, magic strategi difilter di sini.
+    # Posisi lama (dibuka sebelum magic dipakai: magic 0, komentar "BotV...") tetap dihitung, sama seperti reporter
+    positions = GATEWAY.call('positions_get', mt.positions_get, priority=PRIORITY_MARKET, coalesce=True, **symbol_group())
+    return [p for p in positions if is_bot_position(p)] if positions else []
 def order_send_request(request):
-    with mt_lock: return mt.order_send(request)
+    return GATEWAY.call('order_send', mt.order_send, request, priority=PRIORITY_ORDER)
 def get_symbol_info(symbol):
-    with mt_lock: return mt.symbol_info(symbol)
-def get_history_deals(start_date, end_date):
-    with mt_lock: return mt.history_deals_get(start_date, end_date)
+    return GATEWAY.call('symbol_info', mt.symbol_info, symbol, priority=PRIORITY_DATA, coalesce=True)
+def load_symbol_specs():
+    # Satu panggilan bulk untuk spesifikasi semua simbol di terminal (bukan symbol_info per strategi)
+    infos = GATEWAY.call('symbols_get', mt.symbols_get, priority=PRIORITY_DATA)
+    return {info.name: SymbolSpec.from_info(info) for info in infos} if infos else None
+def symbol_select(symbol, enable=True):
+    return GATEWAY.call('symbol_select', mt.symbol_select, symbol, enable, priority=PRIORITY_DATA)
+def get_history_deals(start_date, end_date, **filters):
+    return GATEWAY.call('history_deals_get', mt.history_deals_get, start_date, end_date, priority=PRIORITY_HISTORY, coalesce=True, **filters)
+
+# Pair yang dipantau bot ini (diisi main()); dipakai sebagai filter group MT5 untuk posisi & history
+TRADED_SYMBOLS = []
+def symbol_group():
+    return {'group': ','.join(TRADED_SYMBOLS)} if TRADED_SYMBOLS else {}
 
 class TradeReporter:
-    def __init__(self):
+    def __init__(self, path=None):
         self.lock = threading.Lock()
-        self.processed_tickets = set()
-        self.trade_log = []
+        # Trade tertutup & high-water mark disimpan di SQLite (trade_store.py); restart tidak memindai ulang history
+        self.store = TradeStore(path or TRADE_DB_FILE)
     def update_history(self):
         with self.lock:
-            from_date = datetime.now() - timedelta(days=1); to_date = datetime.now()
-            deals = get_history_deals(from_date, to_date)
-            if deals is None: return
+            # Hanya deal setelah high-water mark (deal.time = waktu server sebagai epoch, jadi dikirim sebagai UTC);
+            # tanpa high-water mark, mulai dari 24 jam terakhir seperti sebelumnya
+            last_deal_time = self.store.last_deal_time
+            from_date = datetime.fromtimestamp(last_deal_time, timezone.utc) if last_deal_time is not None else datetime.now(timezone.utc) - timedelta(days=1)
+            # Batas akhir dilebihkan agar offset waktu server broker tidak memotong deal terbaru
+            deals = get_history_deals(from_date, datetime.now(timezone.utc) + timedelta(days=1), **symbol_group())
+            if not deals: return
+            trades = []
             for deal in deals:
-                if deal.entry == mt.DEAL_ENTRY_OUT and deal.ticket not in self.processed_tickets:
-                    strategy_name = "Unknown"
+                if deal.entry != mt.DEAL_ENTRY_OUT: continue
+                # Strategi dari magic number; komentar hanya untuk order lama sebelum magic dipakai
+                strategy_name = MAGIC_STRATEGY.get(deal.magic)
+                if strategy_name is None:
+                    if not deal.comment.startswith('BotV'): continue # Trade manual / bot lain di akun yang sama
                     parts = deal.comment.split(' ')
-                    if len(parts) > 1: strategy_name = parts[1]
-                    self.trade_log.append({'ticket': deal.ticket, 'symbol': deal.symbol, 'strategy': strategy_name, 'profit': deal.profit})
-                    self.processed_tickets.add(deal.ticket)
+                    strategy_name = parts[1] if len(parts) > 1 else "Unknown"
+                trades.append((deal.ticket, deal.time, deal.symbol, strategy_name, deal.profit))
+            added = self.store.add(trades, max(deal.time for deal in deals))
+            if added: logging.debug(f"Reporter: {added} trade tertutup baru disimpan.")
     def generate_summary(self):
         with self.lock:
-            if not self.trade_log: return {"total_trades": 0}
-            df = pd.DataFrame(self.trade_log)
-            total_trades = len(df); wins = df[df['profit'] > 0]; losses = df[df['profit'] <= 0]
-            total_pnl = df['profit'].sum(); win_rate = (len(wins) / total_trades) * 100 if total_trades > 0 else 0
-            total_profit = wins['profit'].sum(); total_loss = abs(losses['profit'].sum())
-            profit_factor = total_profit / total_loss if total_loss > 0 else 999
-            return {"total_trades": total_trades, "wins": len(wins), "losses": len(losses), "win_rate_pct": win_rate, "total_pnl": total_pnl, "profit_factor": profit_factor, "avg_win": wins['profit'].mean() if len(wins) > 0 else 0, "avg_loss": losses['profit'].mean() if len(losses) > 0 else 0}
+            total = self.store.totals()
+            if total.count == 0: return {"total_trades": 0}
+            profit_factor = total.gross_profit / abs(total.gross_loss) if total.gross_loss < 0 else 999
+            return {"total_trades": total.count, "wins": total.wins, "losses": total.losses, "win_rate_pct": total.wins / total.count * 100, "total_pnl": total.pnl, "profit_factor": profit_factor,
+                    "avg_win": total.gross_profit / total.wins if total.wins else 0, "avg_loss": total.gross_loss / total.losses if total.losses else 0,
+                    "by_strategy": self.store.totals('strategy')}
     def display_report(self):
         summary = self.generate_summary()
         if summary["total_trades"] == 0: logging.info("Laporan Kinerja: Belum ada trade yang ditutup."); return
@@ -118,6 +187,9 @@ class TradeReporter:
         report_str += f"| Total Trade     : {summary['total_trades']}\n| Profit      : {summary['wins']}\n| Lose       : {summary['losses']}\n| Win Rate        : {summary['win_rate_pct']:.2f} %\n"
         report_str += "-"*45 + "\n"
         report_str += f"| Total P/L       : {summary['total_pnl']:.2f}\n| Rata2 Profit: {summary['avg_win']:.2f}\n| Rata2 Lose : {summary['avg_loss']:.2f}\n| Profit Factor   : {summary['profit_factor']:.2f}\n"
+        report_str += "-"*45 + "\n"
+        for strategy, aggregate in sorted(summary['by_strategy'].items()):
+            report_str += f"| {strategy:<22}: {aggregate.count} trade, {aggregate.wins} win, P/L {aggregate.pnl:.2f}\n"
         report_str += "="*45 + "\n"; print(report_str)
 
 # ---------------------------
@@ -125,27 +197,123 @@ class TradeReporter:
 # ---------------------------
 
 
-def pair_worker(symbol, volume):
-    strategies = [StrategyClass(symbol, volume) for StrategyClass in STRATEGY_FACTORY.values()]
-    logging.info(f"[{symbol}] Worker dimulai dengan {len(strategies)} strategi, volume {volume}")
-    while not stop_event.is_set():
-        try:
-            if positions_get_symbol(symbol): time.sleep(LOOP_DELAY_SEC); continue
-            tick = get_symbol_tick(symbol)
-            if tick is None or (tick.ask - tick.bid) > MAX_ALLOWED_SPREAD * strategies[0].info.point:
-                time.sleep(LOOP_DELAY_SEC); continue
-            ohlc = copy_ohlc(symbol, INTERVAL, 200)
-            if ohlc.empty or ohlc.shape[0] < 50: time.sleep(LOOP_DELAY_SEC); continue
-            for strategy in strategies:
-                strategy.check_signal(ohlc, tick)
-                if strategy.order_sent:
-                    logging.info(f"[{symbol}] Order dikirim oleh {strategy.__class__.__name__}. Menghentikan pengecekan untuk siklus ini.")
-                    break
-            for strategy in strategies: strategy.order_sent = False
-        except Exception as e:
-            logging.exception(f"[{symbol}] Error di worker loop: {e}")
-        time.sleep(LOOP_DELAY_SEC)
-    logging.info(f"[{symbol}] Worker berhenti.")
+def symbol_spec(symbol, strategies):
+    """SymbolSpec milik strategi simbol ini; diambil ulang jika belum tersedia saat strategi dibuat."""
+    info = strategies[0].info
+    if info is None:
+        # Simbol tidak dikenal saat start (SYMBOL_SPECS mencoba loader lagi paling sering tiap menit)
+        info = SYMBOL_SPECS.get(symbol)
+        if info is not None:
+            for strategy in strategies: strategy.info = info; strategy.digits = info.digits; strategy.point = info.point
+    return info
+
+
+def evaluate_symbol(symbol, strategies, state):
+    """
+    Evaluasi semua strategi untuk bar yang baru ditutup. Mengembalikan True jika perlu dicoba lagi
+    sebentar lagi (broker belum membuka bar baru, spread terlalu lebar, atau data belum cukup).
+    """
+    if SNAPSHOT.positions(symbol): return False
+    info = symbol_spec(symbol, strategies)
+    if info is None:
+        logging.warning(f"[{symbol}] Spesifikasi simbol belum tersedia, evaluasi dilewati."); return False
+    tick = SNAPSHOT.tick(symbol)
+    if tick is None or (tick.ask - tick.bid) > MAX_ALLOWED_SPREAD * info.point: return True
+    rates = BAR_CACHE.rates(symbol, INTERVAL)
+    if rates is None or len(rates) < 50: return True
+    # Strategi hanya melihat bar yang sudah ditutup (iloc[-2]); bar yang sama berarti broker belum membuka bar baru
+    closed_bar_time = int(rates['time'][-2])
+    new_bar = closed_bar_time != state.get('last_closed_bar')
+    state['last_closed_bar'] = closed_bar_time
+    # BATCH_EVAL: cukup strategi yang terpicu di batch untuk bar ini (None = semua strategi)
+    selection = BATCH_SELECTION.get(symbol)
+    selected = selection[1] if selection is not None and selection[0] == closed_bar_time else range(len(strategies))
+    # Strategi yang sudah dievaluasi untuk (bar tertutup, bucket spread) ini dilewati
+    selected = SIGNAL_MEMO.pending(symbol, list(selected), SIGNAL_MEMO.key(closed_bar_time, tick, info.point))
+    if selected and EVALUATOR is not None:
+        # Sinyal dihitung di proses evaluator; order dieksekusi di sini oleh strategi aslinya
+        for index, order_type, price, sl, tp in EVALUATOR.evaluate(symbol, rates, tick, selected):
+            strategies[index]._create_order(order_type, price, sl, tp)
+            if strategies[index].order_sent: break
+    elif selected:
+        ohlc = Bars.from_rates(rates)
+        # Ekstrem lookback dilanjutkan dari siklus sebelumnya (deque per simbol)
+        ohlc.use_stream(state.setdefault('extremes', StreamExtremes()))
+        for index in selected:
+            strategies[index].check_signal(ohlc, tick)
+            if strategies[index].order_sent: break
+    # Order baru mengubah posisi: cek posisi berikutnya harus melihat snapshot baru
+    if any(strategy.order_sent for strategy in strategies): SNAPSHOT.invalidate()
+    for strategy in strategies:
+        if strategy.order_sent: logging.info(f"[{symbol}] Order dikirim oleh {strategy.__class__.__name__}. Menghentikan pengecekan untuk siklus ini.")
+        strategy.order_sent = False
+    return not new_bar
+
+# Strategi & state per simbol; diisi oleh main() sebelum scheduler berjalan
+SYMBOL_STRATEGIES = {}
+SYMBOL_STATE = {}
+# BATCH_EVAL: scheduler hanya membangunkan BATCH_KEY; hasil batch per simbol -> (waktu bar tertutup, indeks strategi)
+BATCH_KEY = '*BATCH*'
+BATCH_SELECTION = {}
+BATCH_STATE = {'dispatched': 0, 'skipped': 0}
+
+def batch_task(bar_close, attempt):
+    """
+    Hitung indikator semua simbol dalam satu pass (BarBatch), lalu kirim ke pool hanya simbol yang
+    punya strategi terpicu. Simbol yang bar tertutupnya belum sejajar dengan batch (atau datanya
+    belum penuh) dievaluasi penuh lewat jalur per simbol seperti biasa.
+    """
+    rates_by_symbol = {symbol: BAR_CACHE.rates(symbol, INTERVAL) for symbol in SYMBOL_STRATEGIES}
+    full = {symbol: rates for symbol, rates in rates_by_symbol.items() if rates is not None and len(rates) == BAR_CACHE.rows}
+    closed_bar_time = max((int(rates['time'][-2]) for rates in full.values()), default=None)
+    if closed_bar_time is None:
+        # Belum ada pair dengan data penuh: evaluasi per pair seperti biasa
+        for symbol in SYMBOL_STRATEGIES: POOL.submit(symbol, bar_close)
+        return
+    if closed_bar_time == BATCH_STATE.get('last_closed_bar'):
+        # Broker belum membuka bar baru untuk pair mana pun
+        if attempt < BAR_CONFIRM_RETRIES: SCHEDULER.retry(BATCH_KEY, BAR_CONFIRM_RETRY_SEC, bar_close, attempt + 1)
+        return
+    BATCH_STATE['last_closed_bar'] = closed_bar_time
+    aligned = {symbol: rates for symbol, rates in full.items() if int(rates['time'][-2]) == closed_bar_time}
+    # Parameter strategi sama untuk semua pair, jadi instance pair mana pun bisa menghitung trigger batch
+    selection = batch_selection(BarBatch(aligned), next(iter(SYMBOL_STRATEGIES.values())))
+    for symbol in SYMBOL_STRATEGIES:
+        if symbol in selection:
+            BATCH_SELECTION[symbol] = (closed_bar_time, selection[symbol])
+            if not selection[symbol]: BATCH_STATE['skipped'] += 1; continue
+        BATCH_STATE['dispatched'] += 1
+        POOL.submit(symbol, bar_close)
+    logging.debug(f"Batch {len(aligned)}/{len(SYMBOL_STRATEGIES)} pair: {sum(1 for indices in selection.values() if indices)} pair terpicu.")
+
+def symbol_task(symbol, bar_close, attempt):
+    # Dijalankan oleh SymbolWorkerPool; satu simbol tidak pernah berjalan di dua thread sekaligus
+    if symbol == BATCH_KEY: return batch_task(bar_close, attempt)
+    if evaluate_symbol(symbol, SYMBOL_STRATEGIES[symbol], SYMBOL_STATE[symbol]) and attempt < BAR_CONFIRM_RETRIES:
+        SCHEDULER.retry(symbol, BAR_CONFIRM_RETRY_SEC, bar_close, attempt + 1)
+
+EVALUATOR = None # ProcessEvaluator, dibuat oleh main() jika EVAL_PROCESSES > 0
+
+def setup_runtime():
+    """Pasang logging, paket MetaTrader5, gateway dan objek bersama sekali per proses (dipanggil main())."""
+    global mt, GATEWAY, SNAPSHOT, BAR_CACHE, SIGNAL_MEMO, POOL, SCHEDULER
+    if GATEWAY is not None: return
+    import MetaTrader5 as mt
+    # Worker hanya memasukkan record ke antrian; file (batch) & konsol ditulis thread listener
+    setup_logging(LOGFILE, "%(asctime)s | %(levelname)s | %(threadName)s | %(message)s")
+    enable_trade_events(TRADE_EVENTS_FILE)
+    # Semua panggilan MT5 lewat satu thread gateway; mt_lock hanya dipakai saat gateway belum berjalan
+    GATEWAY = MT5Gateway(mt_lock)
+    set_order_sender(order_send_request) # Strategi tidak mengimpor main; pengirim order disuntikkan
+    # Spesifikasi simbol dimuat sekali (symbols_get) dan dibagi semua strategi (lihat symbol_specs.py)
+    SYMBOL_SPECS.configure(load_symbol_specs, SYMBOL_SPECS_FILE, SYMBOL_SPECS_TTL_HOURS * 3600)
+    # Posisi & tick semua pair diambil sekali per siklus dan dibagi ke semua worker (lihat market_snapshot.py)
+    SNAPSHOT = MarketSnapshot(positions_get_bot, get_symbol_ticks, SNAPSHOT_MAX_AGE_SEC)
+    # Cache bar per simbol: setelah load awal hanya bar terbaru yang diminta ke MT5 setiap siklus
+    BAR_CACHE = BarCache(copy_rates, rows=200, refresh_rows=get_env_var('BAR_CACHE_REFRESH_BARS', 3, int))
+    SIGNAL_MEMO = SignalMemo(SIGNAL_MEMO_SPREAD_POINTS)
+    POOL = SymbolWorkerPool(WORKER_POOL_SIZE, symbol_task)
+    SCHEDULER = BarCloseScheduler(TIMEFRAME_SECONDS.get(TIMEFRAME_STR.upper(), 60), POOL.submit, BAR_CLOSE_GRACE_SEC)
 
 def reporting_worker(reporter, interval_seconds):
     logging.info("Reporter worker dimulai.")
@@ -155,13 +323,13 @@ def reporting_worker(reporter, interval_seconds):
             time.sleep(1)
         if not stop_event.is_set():
             reporter.update_history(); reporter.display_report()
+            logging.info(GATEWAY.format_metrics()); logging.info(POOL.format_lateness()); logging.info(SIGNAL_MEMO.format_stats()); logging.info(SNAPSHOT.format_stats())
     logging.info("Reporter worker berhenti.")
 
 def main():
+    setup_runtime()
     if not mt_initialize_and_login(): return
     logging.info(f"===== Bot Dimulai dengan Tingkat Agresivitas: {AGGRESSION_LEVEL.upper()} =====")
-    reporter = TradeReporter()
-    reporter.update_history()
     
     pairs_str = get_env_var('PAIRS_TO_TRADE', ''); volumes_str = get_env_var('VOLUMES', '')
     default_volume = get_env_var('DEFAULT_VOLUME', 0.01, float)
@@ -169,21 +337,39 @@ def main():
     volume_map = {v.split(':')[0].strip().upper(): float(v.split(':')[1]) for v in volumes_str.split(',') if ':' in v}
 
     if not pairs_list: logging.error("Tidak ada pair di PAIRS_TO_TRADE .env. Bot berhenti."); return
+    TRADED_SYMBOLS[:] = pairs_list
+    reporter = TradeReporter()
+    reporter.update_history()
         
+    global EVALUATOR
+    if EVAL_PROCESSES > 0:
+        EVALUATOR = ProcessEvaluator(EVAL_PROCESSES, BAR_CACHE.rows)
+        logging.info(f"Strategi dievaluasi di {EVAL_PROCESSES} proses evaluator (shared memory).")
+
     threads = []
     for symbol in pairs_list:
         volume = volume_map.get(symbol, default_volume)
         info = get_symbol_info(symbol)
-        if not (info and info.visible):
-            with mt_lock: mt.symbol_select(symbol, True)
-        t = threading.Thread(target=pair_worker, name=f"Worker-{symbol}", args=(symbol, volume), daemon=True)
-        threads.append(t); t.start()
+        if not (info and info.visible): symbol_select(symbol, True)
+        SYMBOL_STRATEGIES[symbol] = [StrategyClass(symbol, volume) for StrategyClass in STRATEGY_FACTORY.values()]
+        SYMBOL_STATE[symbol] = {}
+        if EVALUATOR is not None: EVALUATOR.register(symbol, volume, SYMBOL_STRATEGIES[symbol][0].info)
+        logging.info(f"[{symbol}] Siap dengan {len(SYMBOL_STRATEGIES[symbol])} strategi, volume {volume}")
+    SNAPSHOT.watch(pairs_list)
+
+    threads += POOL.start(stop_event)
+    if BATCH_EVAL: SCHEDULER.add(BATCH_KEY); logging.info("BATCH_EVAL aktif: indikator semua pair dihitung sekaligus per bar.")
+    else:
+        for symbol in pairs_list: SCHEDULER.add(symbol)
+
+    scheduler_thread = threading.Thread(target=SCHEDULER.run, name="Scheduler", args=(stop_event,), daemon=True)
+    threads.append(scheduler_thread); scheduler_thread.start()
 
     report_interval_sec = REPORT_INTERVAL_MINUTES * 60
     report_thread = threading.Thread(target=reporting_worker, name="Reporter", args=(reporter, report_interval_sec), daemon=True)
     threads.append(report_thread); report_thread.start()
 
-    logging.info(f"================ {len(pairs_list)} WORKER TRADING + 1 REPORTER DIMULAI ================")
+    logging.info(f"================ {len(pairs_list)} PAIR DI {WORKER_POOL_SIZE} WORKER POOL + 1 REPORTER + SCHEDULER DIMULAI ================")
     try:
         while all(t.is_alive() for t in threads): time.sleep(1)
     except KeyboardInterrupt:
@@ -192,6 +378,9 @@ def main():
     finally:
         logging.info("Menampilkan Laporan Kinerja Final...")
         reporter.update_history(); reporter.display_report()
+        logging.info(GATEWAY.format_metrics()); logging.info(POOL.format_lateness()); logging.info(SIGNAL_MEMO.format_stats()); logging.info(SNAPSHOT.format_stats())
+        if BATCH_EVAL: logging.info(f"Batch: {BATCH_STATE['dispatched']} evaluasi pair dikirim, {BATCH_STATE['skipped']} dilewati (tidak ada strategi terpicu).")
+        if EVALUATOR is not None: EVALUATOR.close()
         mt_shutdown_safe()
 
 if __name__ == "__main__":
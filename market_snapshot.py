@@ -0,0 +1,50 @@
+"""
+Snapshot pasar per siklus untuk loop live: posisi terbuka dan tick semua simbol yang dipantau.
+
+Sebelum strategi berjalan, setiap simbol perlu cek posisi dan tick. Alih-alih 2 panggilan MT5
+per simbol, snapshot mengambil semua posisi dengan satu positions_get() dan tick semua simbol
+dalam satu sweep, lalu melayani semua worker dari memori sampai umurnya melewati `max_age`.
+Worker pertama yang menemukan snapshot kedaluwarsa memperbaruinya; worker lain menunggu dan
+memakai hasil yang sama. Setelah order terkirim snapshot di-invalidate, jadi cek posisi
+berikutnya selalu melihat posisi baru.
+"""
+import threading
+import time
+
+
+class MarketSnapshot:
+    def __init__(self, fetch_positions, fetch_ticks, max_age=0.5, clock=time.monotonic):
+        # fetch_ticks(symbols) -> dict simbol -> tick (None jika gagal)
+        self.fetch_positions = fetch_positions; self.fetch_ticks = fetch_ticks
+        self.max_age = max_age; self.clock = clock
+        self.symbols = []
+        self._lock = threading.Lock()
+        self._positions = {}; self._ticks = {}
+        self._taken = None # Waktu clock saat snapshot terakhir diambil (None = belum ada / invalid)
+        self.refreshes = 0; self.served = 0
+
+    def watch(self, symbols):
+        with self._lock: self.symbols = list(symbols); self._taken = None
+
+    def invalidate(self):
+        with self._lock: self._taken = None
+
+    def _current(self):
+        with self._lock:
+            if self._taken is None or self.clock() - self._taken > self.max_age:
+                positions = self.fetch_positions() or ()
+                self._positions = {}
+                for position in positions: self._positions.setdefault(position.symbol, []).append(position)
+                self._ticks = self.fetch_ticks(self.symbols)
+                self._taken = self.clock(); self.refreshes += 1
+            self.served += 1
+            return self._positions, self._ticks
+
+    def positions(self, symbol):
+        return self._current()[0].get(symbol, [])
+
+    def tick(self, symbol):
+        return self._current()[1].get(symbol)
+
+    def format_stats(self):
+        return f"Snapshot Pasar: {self.refreshes} refresh (posisi + {len(self.symbols)} tick), {self.served} permintaan dilayani dari memori."
@@ -0,0 +1,17 @@
+"""
+Konstanta MetaTrader5 yang dipakai strategi, dengan nilai yang sama seperti paket MetaTrader5.
+
+Strategi mengimpor modul ini (`import mt5_constants as mt`) alih-alih paket MetaTrader5, jadi
+backtest dan proses evaluator bisa memuat strategi tanpa paket/terminal MT5. main.py memakai
+konstanta timeframe di sini agar modulnya bisa diimpor (mis. oleh proses evaluator hasil spawn)
+tanpa memuat paket MetaTrader5.
+"""
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+ORDER_FILLING_IOC = 1
+TRADE_RETCODE_DONE = 10009
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_H1 = 16385
@@ -0,0 +1,138 @@
+"""
+Gateway tunggal untuk koneksi MetaTrader5.
+
+Semua panggilan MT5 dikirim sebagai request ke satu thread gateway yang memegang koneksi:
+- Antrian prioritas: order didahulukan, disusul tick/posisi, data bar/info, lalu history.
+- Request identik yang masih menunggu di antrian (mis. positions_get() dari banyak worker pada
+  siklus yang sama) digabung menjadi satu panggilan dan berbagi satu Future.
+- Setiap tipe panggilan dicatat: jumlah, jumlah yang digabung, waktu tunggu antrian dan latensi.
+
+Selama thread gateway belum berjalan (mis. di backtest) atau setelah ia benar-benar berhenti,
+request dieksekusi langsung di thread pemanggil di bawah lock yang diberikan, jadi perilakunya sama
+seperti wrapper mt_lock lama. Thread gateway juga mengeksekusi di bawah lock yang sama, sehingga
+tidak pernah ada dua panggilan MT5 bersamaan, termasuk saat shutdown.
+"""
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+PRIORITY_ORDER = 0
+PRIORITY_MARKET = 1
+PRIORITY_DATA = 2
+PRIORITY_HISTORY = 3
+_PRIORITY_STOP = 99 # Request yang sudah mengantri tetap dieksekusi sebelum gateway berhenti
+
+
+class _Request:
+    __slots__ = ('call_type', 'func', 'args', 'kwargs', 'key', 'future', 'enqueued')
+
+    def __init__(self, call_type, func, args, kwargs, key):
+        self.call_type = call_type; self.func = func; self.args = args; self.kwargs = kwargs
+        self.key = key; self.future = Future(); self.enqueued = time.perf_counter()
+
+
+class MT5Gateway:
+    def __init__(self, lock=None):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._state_lock = threading.Lock()
+        self._inline_lock = lock or threading.Lock()
+        self._pending = {} # kunci coalesce -> request yang masih di antrian
+        self._metrics = {}
+        self._thread = None
+        self._stopping = False # Penanda stop sudah dikirim
+        self._closed = False # Thread gateway sudah berhenti menerima dari antrian
+
+    @property
+    def running(self):
+        # Selama thread masih hidup (termasuk setelah stop() atau join yang timeout), request tetap diantrikan
+        return self._thread is not None and self._thread.is_alive() and not self._closed
+
+    def start(self):
+        with self._state_lock:
+            if self._thread is not None and self._thread.is_alive(): return
+            self._stopping = False; self._closed = False
+            self._thread = threading.Thread(target=self._run, name="MT5-Gateway", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10):
+        with self._state_lock:
+            if self._thread is None or self._stopping: return
+            self._stopping = True
+            self._queue.put((_PRIORITY_STOP, next(self._seq), None))
+        self._thread.join(timeout=timeout)
+
+    def submit(self, call_type, func, *args, priority=PRIORITY_DATA, coalesce=False, **kwargs):
+        """Kirim panggilan `func(*args, **kwargs)` dan kembalikan Future hasilnya."""
+        key = (call_type, args, tuple(sorted(kwargs.items()))) if coalesce else None
+        request = _Request(call_type, func, args, kwargs, key)
+        with self._state_lock:
+            if self.running:
+                pending = self._pending.get(key) if key is not None else None
+                if pending is not None:
+                    self._stats(call_type)['coalesced'] += 1
+                    return pending.future
+                if key is not None: self._pending[key] = request
+                self._queue.put((priority, next(self._seq), request))
+                return request.future
+        with self._inline_lock: self._execute(request)
+        return request.future
+
+    def call(self, call_type, func, *args, priority=PRIORITY_DATA, coalesce=False, **kwargs):
+        """Seperti submit(), tetapi menunggu dan mengembalikan hasilnya."""
+        return self.submit(call_type, func, *args, priority=priority, coalesce=coalesce, **kwargs).result()
+
+    def _run(self):
+        while True:
+            _, _, request = self._queue.get()
+            if request is None: break
+            with self._state_lock:
+                # Request yang masuk setelah ini dimulai harus melihat data baru, bukan hasil ini
+                if request.key is not None: self._pending.pop(request.key, None)
+            with self._inline_lock: self._execute(request)
+        with self._state_lock: self._closed = True # Request baru dieksekusi inline mulai dari sini
+        # Request yang masuk antrian bersamaan dengan penanda stop tetap diselesaikan
+        while True:
+            try: _, _, request = self._queue.get_nowait()
+            except queue.Empty: break
+            if request is None: continue
+            with self._state_lock:
+                if request.key is not None: self._pending.pop(request.key, None)
+            with self._inline_lock: self._execute(request)
+
+    def _execute(self, request):
+        started = time.perf_counter()
+        try: request.future.set_result(request.func(*request.args, **request.kwargs))
+        except Exception as e: request.future.set_exception(e)
+        finished = time.perf_counter()
+        with self._state_lock:
+            stats = self._stats(request.call_type)
+            wait = started - request.enqueued; latency = finished - started
+            stats['calls'] += 1; stats['wait_total'] += wait; stats['latency_total'] += latency
+            stats['wait_max'] = max(stats['wait_max'], wait); stats['latency_max'] = max(stats['latency_max'], latency)
+
+    def _stats(self, call_type):
+        stats = self._metrics.get(call_type)
+        if stats is None:
+            stats = self._metrics[call_type] = {'calls': 0, 'coalesced': 0, 'wait_total': 0.0, 'wait_max': 0.0, 'latency_total': 0.0, 'latency_max': 0.0}
+        return stats
+
+    def metrics(self):
+        """Salinan metrik per tipe panggilan (waktu dalam detik)."""
+        with self._state_lock: return {call_type: dict(stats) for call_type, stats in self._metrics.items()}
+
+    def format_metrics(self):
+        metrics = self.metrics()
+        if not metrics: return "Metrik Gateway MT5: belum ada panggilan."
+        report_str = "\n" + "="*78 + "\n" + " " * 28 + "METRIK GATEWAY MT5" + "\n" + "="*78 + "\n"
+        report_str += f"| {'Tipe':<18}|{'Panggilan':>10}|{'Digabung':>9}|{'Tunggu avg/max (ms)':>20}|{'Latensi avg/max (ms)':>21}\n"
+        report_str += "-"*78 + "\n"
+        for call_type, stats in sorted(metrics.items()):
+            calls = max(stats['calls'], 1)
+            wait = f"{stats['wait_total'] / calls * 1000:.1f}/{stats['wait_max'] * 1000:.1f}"
+            latency = f"{stats['latency_total'] / calls * 1000:.1f}/{stats['latency_max'] * 1000:.1f}"
+            report_str += f"| {call_type:<18}|{stats['calls']:>10}|{stats['coalesced']:>9}|{wait:>20}|{latency:>21}\n"
+        report_str += "="*78 + "\n"
+        return report_str
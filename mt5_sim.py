@@ -0,0 +1,223 @@
+"""
+Pengganti paket MetaTrader5 untuk uji beban loop live, memutar ulang CSV di data/.
+
+Modul ini meniru fungsi MT5 yang dipakai main.py (initialize, symbol_info, symbols_get,
+symbol_info_tick, copy_rates_from_pos, positions_get, order_send, history_deals_get, symbol_select,
+dll.), jadi main.py bisa dijalankan tanpa terminal dengan memasangnya sebagai MetaTrader5:
+
+    import sys, mt5_sim
+    mt5_sim.configure(symbols=100, speed=60, latency_ms=1.0)
+    sys.modules['MetaTrader5'] = mt5_sim
+    import main
+
+- Setiap simbol memakai OHLC salah satu CSV (digeser per simbol agar tidak identik) di atas grid
+  waktu M1 bersama. Simbol ke-k di atas jumlah file diberi nama "<SIMBOL>.<k>".
+- Jam dipercepat (`speed` detik pasar per detik nyata), mulai `warmup_bars` bar setelah awal data.
+  Bot harus memakai SIM.clock.time sebagai jamnya (lihat bench_live.py).
+- Setiap panggilan API menunggu `latency_ms` (+- `jitter_ms`) seperti round trip ke terminal.
+- Posisi ditutup saat bar tertutup menyentuh SL/TP (SL didahulukan jika keduanya tersentuh), dan
+  menghasilkan deal DEAL_ENTRY_OUT dengan profit seperti backtest.
+- Hanya M1: parameter timeframe diabaikan.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+import fnmatch
+import glob
+import os
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+TIMEFRAME_M1 = 1; TIMEFRAME_M5 = 5; TIMEFRAME_M15 = 15; TIMEFRAME_H1 = 16385
+ORDER_TYPE_BUY = 0; ORDER_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1; ORDER_FILLING_IOC = 1
+TRADE_RETCODE_DONE = 10009; TRADE_RETCODE_INVALID = 10013
+DEAL_ENTRY_IN = 0; DEAL_ENTRY_OUT = 1
+
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+SymbolInfo = namedtuple('SymbolInfo', 'name visible digits point trade_tick_size trade_stops_level trade_contract_size spread')
+TradePosition = namedtuple('TradePosition', 'ticket time type magic volume price_open sl tp price_current profit symbol comment')
+TradeDeal = namedtuple('TradeDeal', 'ticket order time type entry magic position_id volume price profit symbol comment')
+OrderSendResult = namedtuple('OrderSendResult', 'retcode deal order volume price bid ask comment request_id retcode_external request')
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+BAR_SECONDS = 60
+
+
+class SimClock:
+    """Jam pasar yang berjalan `speed` kali lebih cepat dari waktu nyata."""
+    def __init__(self, start, speed):
+        self.start = start; self.speed = speed
+        self._origin = time.perf_counter()
+
+    def time(self):
+        return self.start + (time.perf_counter() - self._origin) * self.speed
+
+
+class Simulator:
+    def __init__(self, data_folder='data', symbols=None, speed=60.0, latency_ms=0.0, jitter_ms=0.0, spread_points=10, warmup_bars=200):
+        files = sorted(glob.glob(os.path.join(data_folder, '*.csv')))
+        if not files: raise FileNotFoundError(f"Tidak ada CSV di {data_folder}")
+        sources = []
+        for csv_file in files:
+            df = pd.read_csv(csv_file, parse_dates=['timestamp'])
+            sources.append((os.path.basename(csv_file).split('_')[0].upper(), df))
+        length = min(len(df) for _, df in sources)
+        if length <= warmup_bars: raise ValueError(f"Data terlalu pendek ({length} bar) untuk warmup {warmup_bars} bar")
+        count = symbols if isinstance(symbols, int) else len(sources)
+        names = symbols if isinstance(symbols, (list, tuple)) else [sources[k % len(sources)][0] + (f".{k // len(sources)}" if k >= len(sources) else '') for k in range(count)]
+        # Grid M1 bersama untuk semua simbol, mulai dari bar pertama CSV pertama
+        self.base = int(sources[0][1]['timestamp'].iloc[0].timestamp()) // BAR_SECONDS * BAR_SECONDS
+        self.length = length
+        self.data = {}; self.info = {}
+        for k, name in enumerate(names):
+            _, df = sources[k % len(sources)]
+            shift = (k // len(sources)) * 997 % length
+            columns = {column: np.roll(df[column].to_numpy(float)[:length], -shift) for column in ('open', 'high', 'low', 'close')}
+            columns['tick_volume'] = np.roll(df['volume'].to_numpy()[:length], -shift)
+            self.data[name] = columns
+            digits = 3 if 'JPY' in name else 5; point = 10.0 ** -digits
+            self.info[name] = SymbolInfo(name, False, digits, point, point, 0, 100000.0, spread_points)
+        self.clock = SimClock(self.base + warmup_bars * BAR_SECONDS, speed)
+        self.latency = latency_ms / 1000.0; self.jitter = jitter_ms / 1000.0
+        self._lock = threading.Lock()
+        self._tickets = iter(range(1000, 1 << 62))
+        self.positions = {} # ticket -> dict posisi terbuka
+        self.deals = []
+        self.calls = {}
+        self.order_latency = [] # detik nyata dari bar ditutup sampai order_send diterima
+
+    # --- Waktu & data ---
+    def index(self):
+        """Indeks bar yang sedang berjalan."""
+        return min(int((self.clock.time() - self.base) // BAR_SECONDS), self.length - 1)
+
+    def rates(self, symbol, start_pos, count):
+        data = self.data.get(symbol)
+        if data is None: return None
+        end = self.index() - start_pos + 1; start = max(0, end - count)
+        if end <= start: return None
+        rates = np.zeros(end - start, dtype=RATES_DTYPE)
+        rates['time'] = self.base + np.arange(start, end) * BAR_SECONDS
+        for column in ('open', 'high', 'low', 'close', 'tick_volume'): rates[column] = data[column][start:end]
+        rates['spread'] = self.info[symbol].spread
+        return rates
+
+    def tick(self, symbol):
+        data = self.data.get(symbol)
+        if data is None: return None
+        now = self.clock.time(); bid = data['close'][self.index()]
+        ask = bid + self.info[symbol].spread * self.info[symbol].point
+        return Tick(int(now), bid, ask, bid, 0, int(now * 1000), 6, 0.0)
+
+    # --- Posisi & deal ---
+    def _settle(self):
+        """Tutup posisi yang SL/TP-nya tersentuh oleh bar tertutup sejak terakhir dicek."""
+        closed_index = self.index() - 1
+        for ticket, position in list(self.positions.items()):
+            data = self.data[position['symbol']]; start = position['checked'] + 1
+            if closed_index < start: continue
+            low = data['low'][start:closed_index + 1]; high = data['high'][start:closed_index + 1]
+            if position['type'] == ORDER_TYPE_BUY: sl_hit = low <= position['sl']; tp_hit = high >= position['tp']
+            else: sl_hit = high >= position['sl']; tp_hit = low <= position['tp']
+            hits = np.flatnonzero(sl_hit | tp_hit)
+            position['checked'] = closed_index
+            if not len(hits): continue
+            price = position['sl'] if sl_hit[hits[0]] else position['tp']
+            direction = 1 if position['type'] == ORDER_TYPE_BUY else -1
+            profit = (price - position['price_open']) * direction * self.info[position['symbol']].trade_contract_size * position['volume']
+            bar_time = self.base + (start + hits[0] + 1) * BAR_SECONDS - 1
+            self._deal(position, DEAL_ENTRY_OUT, 1 - position['type'], price, round(profit, 2), bar_time)
+            del self.positions[ticket]
+
+    def _deal(self, position, entry, deal_type, price, profit, deal_time):
+        self.deals.append(TradeDeal(next(self._tickets), position['ticket'], int(deal_time), deal_type, entry, position['magic'],
+                                    position['ticket'], position['volume'], price, profit, position['symbol'], position['comment']))
+
+    def order_send(self, request):
+        symbol = request.get('symbol'); tick = self.tick(symbol)
+        if tick is None or request.get('action') != TRADE_ACTION_DEAL or request.get('type') not in (ORDER_TYPE_BUY, ORDER_TYPE_SELL):
+            return OrderSendResult(TRADE_RETCODE_INVALID, 0, 0, 0.0, 0.0, 0.0, 0.0, 'Invalid request', 0, 0, request)
+        price = tick.ask if request['type'] == ORDER_TYPE_BUY else tick.bid
+        ticket = next(self._tickets)
+        position = {'ticket': ticket, 'time': tick.time, 'type': request['type'], 'magic': request.get('magic', 0), 'volume': request['volume'],
+                    'price_open': price, 'sl': request.get('sl', 0.0), 'tp': request.get('tp', 0.0), 'symbol': symbol,
+                    'comment': request.get('comment', ''), 'checked': self.index() - 1}
+        self.positions[ticket] = position
+        self._deal(position, DEAL_ENTRY_IN, request['type'], price, 0.0, tick.time)
+        bar_close = self.base + self.index() * BAR_SECONDS
+        self.order_latency.append((self.clock.time() - bar_close) / self.clock.speed)
+        return OrderSendResult(TRADE_RETCODE_DONE, self.deals[-1].ticket, ticket, request['volume'], price, tick.bid, tick.ask, 'Request executed', 0, 0, request)
+
+    def position_list(self, symbol=None, group=None, ticket=None):
+        result = []
+        for position in self.positions.values():
+            if symbol is not None and position['symbol'] != symbol: continue
+            if ticket is not None and position['ticket'] != ticket: continue
+            if group is not None and not _in_group(position['symbol'], group): continue
+            price = self.tick(position['symbol']).bid
+            result.append(TradePosition(position['ticket'], position['time'], position['type'], position['magic'], position['volume'],
+                                        position['price_open'], position['sl'], position['tp'], price, 0.0, position['symbol'], position['comment']))
+        return tuple(result)
+
+
+def _in_group(symbol, group):
+    # Sintaks group MT5 disederhanakan: pola dipisah koma, '*' wildcard, '!' pengecualian
+    included = False
+    for pattern in group.split(','):
+        pattern = pattern.strip()
+        if pattern.startswith('!'):
+            if fnmatch.fnmatchcase(symbol, pattern[1:]): return False
+        elif fnmatch.fnmatchcase(symbol, pattern): included = True
+    return included
+
+def _epoch(value):
+    if isinstance(value, datetime):
+        return (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+    return float(value)
+
+
+SIM = None # Simulator aktif, dibuat oleh configure()
+_last_error = (1, 'Success')
+
+def configure(**kwargs):
+    """Buat Simulator baru (argumen sama dengan Simulator) dan pakai untuk semua panggilan API."""
+    global SIM
+    SIM = Simulator(**kwargs)
+    return SIM
+
+def _call(name, func):
+    sim = SIM
+    if sim is None: raise RuntimeError("mt5_sim belum dikonfigurasi (panggil mt5_sim.configure())")
+    if sim.latency or sim.jitter: time.sleep(max(0.0, sim.latency + random.uniform(-sim.jitter, sim.jitter)))
+    with sim._lock:
+        sim.calls[name] = sim.calls.get(name, 0) + 1
+        sim._settle()
+        return func(sim)
+
+# --- API MetaTrader5 ---
+def initialize(*args, **kwargs): return _call('initialize', lambda sim: True)
+def login(*args, **kwargs): return _call('login', lambda sim: True)
+def shutdown(): return True
+def last_error(): return _last_error
+def symbol_info(symbol): return _call('symbol_info', lambda sim: sim.info.get(symbol))
+def symbols_get(group=None): return _call('symbols_get', lambda sim: tuple(info for name, info in sim.info.items() if group is None or _in_group(name, group)))
+def symbol_select(symbol, enable=True):
+    def select(sim):
+        if symbol not in sim.info: return False
+        sim.info[symbol] = sim.info[symbol]._replace(visible=bool(enable)); return True
+    return _call('symbol_select', select)
+def symbol_info_tick(symbol): return _call('symbol_info_tick', lambda sim: sim.tick(symbol))
+def copy_rates_from_pos(symbol, timeframe, start_pos, count): return _call('copy_rates_from_pos', lambda sim: sim.rates(symbol, start_pos, count))
+def positions_get(symbol=None, group=None, ticket=None): return _call('positions_get', lambda sim: sim.position_list(symbol, group, ticket))
+def positions_total(): return _call('positions_total', lambda sim: len(sim.positions))
+def order_send(request): return _call('order_send', lambda sim: sim.order_send(request))
+def history_deals_get(date_from, date_to, group=None, **kwargs):
+    def deals(sim):
+        start, end = _epoch(date_from), _epoch(date_to)
+        return tuple(deal for deal in sim.deals if start <= deal.time <= end and (group is None or _in_group(deal.symbol, group)))
+    return _call('history_deals_get', deals)
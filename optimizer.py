@@ -0,0 +1,166 @@
+"""
+Optimizer parameter strategi (grid / random search) di atas engine backtest.
+
+Ruang pencarian ditulis dalam file JSON per strategi. Kunci = nama strategi di STRATEGY_FACTORY,
+nilai = nama variabel .env -> daftar nilai, atau rentang {"min", "max", "step"}:
+
+    {"breakout": {"BREAKOUT_SL_ATR_MULT": [1.0, 1.5, 2.0],
+                  "BREAKOUT_TP_ATR_MULT": {"min": 2.0, "max": 4.0, "step": 0.5}}}
+
+Setiap kombinasi membuat instance strategi dengan parameter yang disuntikkan lewat
+helpers.override_params (bukan .env), lalu strategi itu dijalankan sendirian pada setiap CSV.
+CSV dimuat sekali per proses worker dan frame yang sama dipakai untuk semua kombinasi, sehingga
+indikator dengan parameter yang sama (mis. ATR 14) hanya dihitung sekali lewat INDICATOR_CACHE.
+"""
+import os
+import json
+import random
+import argparse
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from helpers import override_params
+from backtest import Backtester, data_files, DATA_FOLDER, INITIAL_BALANCE, START_INDEX, WINDOW_BARS, ENGINE
+from strategies import STRATEGY_FACTORY
+
+OUTPUT_FILE = "optimizer_results.csv"
+SORT_COLUMNS = ['pnl', 'win_rate', 'profit_factor', 'max_drawdown']
+
+# ---------------------------
+# RUANG PENCARIAN
+# ---------------------------
+def _expand_values(spec):
+    # Daftar nilai apa adanya; rentang {"min","max","step"} dijabarkan (int jika semua batasnya int)
+    if isinstance(spec, list): return spec
+    if isinstance(spec, dict):
+        values = np.arange(spec['min'], spec['max'] + spec['step'] / 2, spec['step'])
+        if all(isinstance(spec[k], int) for k in ('min', 'max', 'step')): return [int(v) for v in values]
+        return [round(float(v), 10) for v in values]
+    return [spec]
+
+def _sample_value(spec, rng):
+    if isinstance(spec, list): return rng.choice(spec)
+    if isinstance(spec, dict):
+        if 'step' in spec: return rng.choice(_expand_values(spec))
+        if isinstance(spec['min'], int) and isinstance(spec['max'], int): return rng.randint(spec['min'], spec['max'])
+        return rng.uniform(spec['min'], spec['max'])
+    return spec
+
+def build_combinations(space, samples=0, seed=None):
+    """Daftar (nama_strategi, params): grid penuh jika samples=0, atau `samples` kombinasi acak per strategi."""
+    rng = random.Random(seed); combinations = []
+    for strategy_name, params in space.items():
+        key = strategy_name.lower()
+        if key not in STRATEGY_FACTORY:
+            raise ValueError(f"Strategi '{strategy_name}' tidak ditemukan. Pilihan: {', '.join(STRATEGY_FACTORY)}")
+        names = list(params)
+        if samples:
+            combinations += [(key, {name: _sample_value(params[name], rng) for name in names}) for _ in range(samples)]
+        else:
+            combinations += [(key, dict(zip(names, values))) for values in itertools.product(*(_expand_values(params[name]) for name in names))]
+    return combinations
+
+# ---------------------------
+# METRIK
+# ---------------------------
+def summarize(trades):
+    """P/L, win rate, profit factor dan max drawdown dari daftar trade (urut waktu tutup)."""
+    profits = np.array([trade['profit'] for trade in trades], dtype=float)
+    if not len(profits): return {'trades': 0, 'pnl': 0.0, 'win_rate': 0.0, 'profit_factor': 0.0, 'max_drawdown': 0.0}
+    gross_profit = profits[profits > 0].sum(); gross_loss = -profits[profits < 0].sum()
+    equity = INITIAL_BALANCE + np.cumsum(profits)
+    peak = np.maximum.accumulate(np.maximum(equity, INITIAL_BALANCE))
+    return {
+        'trades': len(profits), 'pnl': profits.sum(), 'win_rate': (profits > 0).mean() * 100,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else (np.inf if gross_profit > 0 else 0.0),
+        'max_drawdown': (peak - equity).max(),
+    }
+
+# ---------------------------
+# WORKER EVALUASI
+# ---------------------------
+_frames = {} # csv_file -> DataFrame, dimuat sekali per proses
+
+def _init_worker():
+    # Log per trade dimatikan; ribuan kombinasi akan membanjiri konsol
+    logging.getLogger().setLevel(logging.WARNING)
+
+def _load_frame(backtester, csv_file):
+    if csv_file not in _frames: _frames[csv_file] = backtester._load_data(csv_file)
+    return _frames[csv_file]
+
+def evaluate_combination(task):
+    csv_file, strategy_name, params, window, engine = task
+    symbol = os.path.basename(csv_file).split('_')[0].upper()
+    backtester = Backtester(); backtester.show_progress = False; backtester.quiet = True
+    df = _load_frame(backtester, csv_file)
+    if df is None or len(df) <= START_INDEX: return None
+
+    with override_params(params):
+        strategies, sim_info = backtester._setup_strategies(symbol, [STRATEGY_FACTORY[strategy_name]])
+    backtester._simulate(symbol, df, strategies, sim_info, window, engine)
+    return {'symbol': symbol, 'strategy': strategy_name, **summarize(backtester.trade_history), 'params': json.dumps(params)}
+
+# ---------------------------
+# OPTIMIZER
+# ---------------------------
+def optimize(space, csv_files, jobs=1, samples=0, seed=None, window=WINDOW_BARS, engine=ENGINE, sort_by='pnl'):
+    combinations = build_combinations(space, samples, seed)
+    # Urut per CSV lalu per strategi: satu chunk worker memakai frame & indikator yang sama
+    tasks = [(csv_file, name, params, window, engine) for csv_file in csv_files for name, params in combinations]
+    logging.info(f"Mengevaluasi {len(combinations)} kombinasi x {len(csv_files)} simbol = {len(tasks)} backtest di {jobs} proses...")
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            chunksize = max(1, len(tasks) // (jobs * 8))
+            rows = list(tqdm(pool.map(evaluate_combination, tasks, chunksize=chunksize), total=len(tasks), desc="Optimasi", unit="kombinasi"))
+    else:
+        _init_worker()
+        rows = [evaluate_combination(task) for task in tqdm(tasks, desc="Optimasi", unit="kombinasi")]
+
+    table = pd.DataFrame([row for row in rows if row])
+    if table.empty: return table
+    # max_drawdown: makin kecil makin baik; metrik lain makin besar makin baik
+    table = table.sort_values(['symbol', sort_by], ascending=[True, sort_by == 'max_drawdown'], kind='stable').reset_index(drop=True)
+    table.insert(0, 'rank', table.groupby('symbol').cumcount() + 1)
+    return table
+
+def print_table(table, top=10):
+    report_str = "\n" + "="*50 + "\n" + " " * 14 + "HASIL OPTIMASI" + "\n" + "="*50 + "\n"
+    for symbol, group in table.groupby('symbol', sort=False):
+        report_str += f"\n--- {symbol} (top {min(top, len(group))} dari {len(group)}) ---\n"
+        report_str += group.head(top).to_string(index=False, float_format=lambda v: f"{v:.2f}") + "\n"
+    report_str += "="*50 + "\n"
+    print(report_str)
+
+# ---------------------------
+# FUNGSI UNTUK MENJALANKAN
+# ---------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid / random search parameter strategi pada file CSV di folder data/.")
+    parser.add_argument("space", help="File JSON ruang pencarian (lihat optimizer_space.example.json).")
+    parser.add_argument("--csv", nargs="*", help="File CSV yang dipakai (default: semua CSV di data/).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Jumlah proses paralel.")
+    parser.add_argument("--random", type=int, default=0, metavar="N", help="Ambil N kombinasi acak per strategi (0 = grid penuh).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed untuk --random.")
+    parser.add_argument("--sort", choices=SORT_COLUMNS, default="pnl", help="Metrik untuk peringkat.")
+    parser.add_argument("--top", type=int, default=10, help="Jumlah baris teratas per simbol yang dicetak.")
+    parser.add_argument("--window", type=int, default=WINDOW_BARS, help="Jumlah bar trailing per evaluasi (0 = history penuh).")
+    parser.add_argument("--engine", choices=["vector", "bar"], default=ENGINE, help="Engine replay backtest.")
+    args = parser.parse_args()
+
+    with open(args.space) as f: space = json.load(f)
+    csv_files = args.csv or data_files()
+    if not csv_files:
+        logging.error(f"Tidak ada file CSV yang ditemukan di folder '{DATA_FOLDER}'.")
+    else:
+        table = optimize(space, csv_files, args.jobs, args.random, args.seed, args.window, args.engine, args.sort)
+        if table.empty: logging.info("Optimasi selesai. Tidak ada hasil.")
+        else:
+            table.to_csv(OUTPUT_FILE, index=False)
+            print_table(table, args.top)
+            logging.info(f"Hasil optimasi disimpan ke {OUTPUT_FILE}")
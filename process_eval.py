@@ -0,0 +1,140 @@
+"""
+Evaluasi strategi di proses terpisah dengan bar di shared memory (mode live, EVAL_PROCESSES > 0).
+
+Proses utama tetap satu-satunya pemilik koneksi MT5. Untuk setiap simbol, buffer bar (array rates
+MT5) ditulis ke satu blok `multiprocessing.shared_memory`:
+
+    [panjang (int64)] [rates x kapasitas]
+
+Proses evaluator membaca blok itu langsung (tanpa pickle data bar), menjalankan semua strategi,
+dan mengembalikan *order intent* (indeks strategi, tipe, harga, SL, TP). Proses utama lalu
+mengeksekusi intent lewat `_create_order` strategi aslinya (order_send_request), berurutan
+sampai satu order berhasil, sama seperti loop per thread.
+
+Setiap simbol selalu dievaluasi oleh proses yang sama (afinitas), jadi cache indikator dan
+instance strategi di proses evaluator tetap hangat.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import threading
+from types import SimpleNamespace
+import numpy as np
+
+_HEADER = np.dtype(np.int64).itemsize
+
+
+class SharedBars:
+    """Blok shared memory berisi buffer bar satu simbol (sisi pemilik)."""
+    def __init__(self, dtype, capacity):
+        self.dtype = dtype; self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(create=True, size=_HEADER + dtype.itemsize * capacity)
+        self._length = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self._data = np.ndarray((capacity,), dtype=dtype, buffer=self.shm.buf, offset=_HEADER)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, rates):
+        rates = rates[-self.capacity:]
+        self._data[:len(rates)] = rates; self._length[0] = len(rates)
+
+    def close(self):
+        del self._length, self._data
+        self.shm.close(); self.shm.unlink()
+
+
+def _attach(name, dtype, capacity):
+    """View read-only ke buffer bar di shared memory (sisi evaluator); blok di-cache per proses."""
+    shm = _attached.get(name)
+    if shm is None: shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    length = int(np.ndarray((1,), dtype=np.int64, buffer=shm.buf)[0])
+    rates = np.ndarray((capacity,), dtype=dtype, buffer=shm.buf, offset=_HEADER)[:length]
+    rates.flags.writeable = False
+    return rates
+
+
+class ProcessEvaluator:
+    def __init__(self, processes, capacity=200, mp_context=None):
+        # Satu executor 1-proses per slot agar simbol bisa dipatok ke proses tertentu.
+        # Dengan spawn (Windows) proses anak mengimpor ulang skrip utama; main.py tidak punya efek samping saat impor
+        self._executors = [ProcessPoolExecutor(max_workers=1, mp_context=mp_context, initializer=_init_evaluator) for _ in range(processes)]
+        self.capacity = capacity
+        self._symbols = {} # simbol -> (executor, volume, info)
+        self._shared = {}
+        self._shared_lock = threading.Lock() # evaluate() dipanggil dari banyak thread pool; satu blok per simbol
+        self._pending = set() # Future yang belum selesai, dibatalkan saat close()
+
+    def register(self, symbol, volume, info):
+        # info: SymbolSpec (dikirim ke proses evaluator sebagai dict lewat pickle)
+        self._symbols[symbol] = (self._executors[len(self._symbols) % len(self._executors)], volume, info)
+
+    def evaluate(self, symbol, rates, tick, selected=None):
+        """
+        Daftar intent (indeks_strategi, order_type, price, sl, tp) untuk bar & tick ini.
+        `selected`: indeks strategi yang dievaluasi (None = semua).
+        """
+        executor, volume, info = self._symbols[symbol]
+        with self._shared_lock:
+            shared = self._shared.get(symbol)
+            if shared is None: shared = self._shared[symbol] = SharedBars(rates.dtype, self.capacity)
+        shared.publish(rates)
+        tick = {'time': tick.time, 'ask': tick.ask, 'bid': tick.bid, 'last': tick.last}
+        future = executor.submit(_evaluate, symbol, volume, info, shared.name, rates.dtype, self.capacity, tick, selected)
+        with self._shared_lock: self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+        return future.result()
+
+    def _discard_pending(self, future):
+        with self._shared_lock: self._pending.discard(future)
+
+    def close(self):
+        # Setara shutdown(cancel_futures=True) yang baru ada sejak Python 3.9: antrean dibatalkan dulu,
+        # evaluasi yang sedang berjalan ditunggu sampai selesai
+        with self._shared_lock: pending = list(self._pending)
+        for future in pending: future.cancel()
+        for executor in self._executors: executor.shutdown(wait=True)
+        with self._shared_lock:
+            for shared in self._shared.values(): shared.close()
+            self._shared.clear()
+
+
+# ---------------------------
+# SISI PROSES EVALUATOR
+# ---------------------------
+_attached = {} # nama blok shared memory -> SharedMemory
+_strategies = {} # simbol -> instance strategi milik proses ini
+_streams = {} # simbol -> StreamExtremes milik proses ini
+_intents = []
+
+def _init_evaluator():
+    # Batch log yang diwarisi lewat fork ditulis saat proses berhenti (worker keluar tanpa atexit)
+    from log_pipeline import flush_at_worker_exit
+    flush_at_worker_exit()
+    # Muat class strategi aktif sekali per proses (tanpa main.py / MetaTrader5)
+    from strategies import STRATEGY_FACTORY
+    for _ in STRATEGY_FACTORY.values(): pass
+
+def _strategies_for(symbol, volume, info):
+    from strategies import STRATEGY_FACTORY
+    strategies = _strategies.get(symbol)
+    if strategies is None:
+        strategies = _strategies[symbol] = [StrategyClass(symbol, volume) for StrategyClass in STRATEGY_FACTORY.values()]
+        for index, strategy in enumerate(strategies):
+            strategy.info = info
+            if info is not None: strategy.digits = info.digits; strategy.point = info.point
+            # Order tidak dikirim dari sini; dicatat sebagai intent untuk proses pemilik MT5
+            strategy._create_order = lambda order_type, price, sl, tp, index=index: _intents.append((index, order_type, price, sl, tp))
+    return strategies
+
+def _evaluate(symbol, volume, info, shm_name, dtype, capacity, tick, selected=None):
+    from bars import Bars
+    from range_index import StreamExtremes
+    strategies = _strategies_for(symbol, volume, info)
+    ohlc = Bars.from_rates(_attach(shm_name, dtype, capacity))
+    ohlc.use_stream(_streams.setdefault(symbol, StreamExtremes()))
+    tick = SimpleNamespace(**tick)
+    # Semua strategi (terpilih) dievaluasi; pemilik mengeksekusi intent berurutan sampai satu order berhasil
+    _intents.clear()
+    for strategy in (strategies if selected is None else [strategies[index] for index in selected]): strategy.check_signal(ohlc, tick)
+    return list(_intents)
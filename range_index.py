@@ -0,0 +1,114 @@
+"""
+Indeks min/max window untuk kolom bar (high/low/close).
+
+Strategi yang mencari ekstrem lookback (Breakout, Fakeout, Engulfing_Reversal) dan indikator
+rolling max/min (Stochastic, Ichimoku) meminta nilainya lewat Bars.highest()/lowest()/
+rolling_extreme() alih-alih memotong dan mereduksi window setiap bar:
+
+- RangeExtremes: sparse table per (kolom, op) di atas array bar akar. Dibangun sekali (level
+  ditambah sesuai panjang window terpanjang yang diminta), lalu setiap query window O(1). Di
+  backtest akarnya adalah seluruh history simbol, jadi semua window per bar memakai tabel yang sama.
+- StreamExtremes: untuk stream live satu simbol. Setiap bentuk window (kolom, op, panjang, jarak
+  ke ujung) punya deque monoton yang diisi bar tertutup baru saja (berdasarkan waktu bar), jadi
+  tiap siklus O(1) amortized per window. Window yang memuat bar berjalan tidak di-stream.
+
+min/max bersifat eksak, jadi hasilnya sama persis dengan reduksi/rolling pandas. NaN diabaikan
+(fmin/fmax) seperti min()/max() pandas.
+"""
+from collections import deque
+import numpy as np
+
+_OPS = {'max': np.fmax, 'min': np.fmin}
+
+
+class SparseTable:
+    """Min/max window sembarang di atas satu array; level k = ekstrem window sepanjang 2**k."""
+    def __init__(self, values, op):
+        self.op = _OPS[op]
+        self.levels = [np.asarray(values, dtype=float)]
+
+    def _level(self, k):
+        while len(self.levels) <= k:
+            previous = self.levels[-1]; half = 1 << (len(self.levels) - 1)
+            self.levels.append(self.op(previous[:-half], previous[half:]))
+        return self.levels[k]
+
+    def query(self, start, stop):
+        """Ekstrem values[start:stop] (start < stop)."""
+        k = (stop - start).bit_length() - 1
+        level = self._level(k)
+        return self.op(level[start], level[stop - (1 << k)])
+
+    def query_window(self, length, starts):
+        """Ekstrem values[s:s+length] untuk setiap s di `starts` (vektor)."""
+        k = length.bit_length() - 1
+        level = self._level(k)
+        return self.op(level[starts], level[starts + length - (1 << k)])
+
+
+class RangeExtremes:
+    """Sparse table per (kolom, op) untuk satu Bars akar, dibangun saat pertama diminta."""
+    def __init__(self, bars):
+        self.bars = bars
+        self._tables = {}
+
+    def _table(self, column, op):
+        table = self._tables.get((column, op))
+        if table is None: table = self._tables[(column, op)] = SparseTable(self.bars[column], op)
+        return table
+
+    def query(self, column, op, start, stop):
+        return self._table(column, op).query(start, stop)
+
+    def rolling(self, column, op, period, start, stop):
+        """
+        Seperti rolling(period).max()/min() pandas pada baris [start, stop) akar: NaN untuk
+        `period - 1` baris pertama window itu.
+        """
+        values = np.full(stop - start, np.nan)
+        if period <= stop - start:
+            values[period - 1:] = self._table(column, op).query_window(period, np.arange(start, stop - period + 1))
+        return values
+
+
+class MonotonicWindow:
+    """Ekstrem window geser sepanjang `length` bar dengan deque monoton (waktu_bar, nilai)."""
+    def __init__(self, length, op):
+        self.length = length; self.is_max = op == 'max'
+        self._deque = deque()
+        self.last_time = None
+
+    def advance(self, times, values, stop):
+        """Ekstrem values[stop-length:stop] dengan hanya memasukkan bar yang belum pernah dilihat."""
+        first = stop - self.length
+        position = int(np.searchsorted(times, self.last_time)) if self.last_time is not None else stop
+        if position < stop and times[position] == self.last_time and position >= first - 1:
+            position += 1
+        else:
+            # Celah (koneksi putus, evaluasi terlewat banyak) atau waktu mundur: isi ulang window
+            self._deque.clear(); position = first
+        window = self._deque
+        for index in range(position, stop):
+            value = values[index]
+            if self.is_max:
+                while window and window[-1][1] <= value: window.pop()
+            else:
+                while window and window[-1][1] >= value: window.pop()
+            window.append((times[index], value))
+        if stop > 0: self.last_time = times[stop - 1]
+        while window and window[0][0] < times[first]: window.popleft()
+        return window[0][1]
+
+
+class StreamExtremes:
+    """Deque monoton per bentuk window untuk stream bar live satu simbol."""
+    def __init__(self):
+        self._windows = {}
+
+    def query(self, bars, column, op, start, stop):
+        # Hanya window yang seluruhnya berisi bar tertutup (nilainya tidak berubah lagi)
+        if stop >= len(bars): return None
+        key = (column, op, stop - start, len(bars) - stop)
+        window = self._windows.get(key)
+        if window is None: window = self._windows[key] = MonotonicWindow(stop - start, op)
+        return window.advance(bars['time'], bars[column], stop)
@@ -0,0 +1,62 @@
+"""
+Scheduler yang membangunkan evaluasi simbol tepat setelah bar TIMEFRAME ditutup.
+
+Semua simbol ada di satu heap (waktu_bangun, seq, simbol, waktu_close_bar, percobaan). Thread
+scheduler tidur sampai entri terdekat jatuh tempo, lalu memanggil
+`dispatch(symbol, bar_close, attempt)` dan langsung menjadwalkan simbol itu untuk bar berikutnya.
+Jika broker belum membuka bar baru saat dicek, worker bisa meminta `retry()` singkat untuk bar
+yang sama.
+
+Batas bar dihitung dari epoch (UTC). Offset waktu server broker yang berupa jam penuh tidak
+menggeser batas M1/M5/M15/H1, jadi konfirmasi akhir tetap dari waktu bar yang dikirim broker.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+
+TIMEFRAME_SECONDS = {"M1": 60, "M5": 300, "M15": 900, "H1": 3600}
+
+
+class BarCloseScheduler:
+    def __init__(self, timeframe_seconds, dispatch, grace_sec=0.5, clock=time.time, time_scale=1.0):
+        # time_scale: detik `clock` per detik nyata (> 1 untuk jam simulasi yang dipercepat, lihat bench_live.py)
+        self.timeframe_seconds = timeframe_seconds; self.dispatch = dispatch
+        self.grace_sec = grace_sec; self.clock = clock; self.time_scale = time_scale
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def bar_close_after(self, t):
+        """Batas bar pertama yang > t."""
+        return (math.floor(t / self.timeframe_seconds) + 1) * self.timeframe_seconds
+
+    def add(self, symbol, immediate=True):
+        # immediate: evaluasi bar yang sudah ditutup sekarang juga (seperti siklus pertama loop lama)
+        now = self.clock(); next_close = self.bar_close_after(now)
+        if immediate: self._push(now, symbol, next_close - self.timeframe_seconds, 0, True)
+        else: self._push(next_close + self.grace_sec, symbol, next_close, 0, True)
+
+    def retry(self, symbol, delay, bar_close, attempt):
+        """Jadwalkan ulang evaluasi bar `bar_close` setelah `delay` detik (tanpa mengubah jadwal rutin)."""
+        self._push(self.clock() + delay, symbol, bar_close, attempt, False)
+
+    def _push(self, wake, symbol, bar_close, attempt, regular):
+        with self._cond:
+            heapq.heappush(self._heap, (wake, next(self._seq), symbol, bar_close, attempt, regular))
+            self._cond.notify()
+
+    def run(self, stop_event):
+        while not stop_event.is_set():
+            with self._cond:
+                if not self._heap: self._cond.wait(timeout=1.0); continue
+                wait = self._heap[0][0] - self.clock()
+                # Tidur maksimal 1 detik (nyata) agar stop_event tetap cepat direspons
+                if wait > 0: self._cond.wait(timeout=min(wait / self.time_scale, 1.0)); continue
+                _, _, symbol, bar_close, attempt, regular = heapq.heappop(self._heap)
+                if regular:
+                    # Setelah jeda panjang (mis. laptop sleep) lompat ke bar berikutnya, bukan mengejar semua
+                    next_close = max(bar_close + self.timeframe_seconds, self.bar_close_after(self.clock()) - self.timeframe_seconds)
+                    heapq.heappush(self._heap, (next_close + self.grace_sec, next(self._seq), symbol, next_close, 0, True))
+            self.dispatch(symbol, bar_close, attempt)
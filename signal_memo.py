@@ -0,0 +1,41 @@
+"""
+Memo keputusan strategi untuk loop live.
+
+Setiap strategi hanya dievaluasi sekali per (simbol, strategi, waktu bar tertutup, bucket spread).
+Evaluasi ulang untuk bar tertutup yang sama (mis. retry scheduler saat broker belum membuka bar
+baru) langsung dilewati; strategi baru dijalankan lagi jika bar tertutupnya berganti, atau jika
+spread pindah bucket (kondisi tick berubah cukup jauh untuk SL/TP dan filter spread).
+
+Penghitung dedupe ditampilkan di laporan periodik.
+"""
+import threading
+
+
+class SignalMemo:
+    """Key (waktu bar tertutup, bucket spread) terakhir yang sudah dievaluasi per (simbol, strategi)."""
+    def __init__(self, spread_bucket_points=5):
+        self.spread_bucket_points = spread_bucket_points
+        self._lock = threading.Lock()
+        self._keys = {} # (simbol, indeks strategi) -> key terakhir yang sudah dievaluasi
+        self.evaluated = 0 # Evaluasi strategi yang benar-benar dijalankan
+        self.strategy_hits = 0 # Evaluasi strategi yang dilewati karena memo
+        self.bar_dedupe = 0 # Evaluasi simbol yang seluruhnya dilewati (tidak ada bar tertutup baru)
+
+    def key(self, closed_bar_time, tick, point):
+        if self.spread_bucket_points <= 0 or not point: return (closed_bar_time, 0)
+        return (closed_bar_time, int((tick.ask - tick.bid) / (point * self.spread_bucket_points)))
+
+    def pending(self, symbol, indices, key):
+        """Indeks strategi dari `indices` yang belum dievaluasi untuk `key`; langsung ditandai sudah."""
+        with self._lock:
+            fresh = [index for index in indices if self._keys.get((symbol, index)) != key]
+            for index in fresh: self._keys[(symbol, index)] = key
+            self.evaluated += len(fresh); self.strategy_hits += len(indices) - len(fresh)
+            if indices and not fresh: self.bar_dedupe += 1
+        return fresh
+
+    def format_stats(self):
+        with self._lock: evaluated, hits, bar_dedupe = self.evaluated, self.strategy_hits, self.bar_dedupe
+        total = evaluated + hits
+        return (f"Memo Sinyal: {evaluated} evaluasi strategi dijalankan, {hits} dilewati memo "
+                f"({hits / total * 100 if total else 0:.1f}%), {bar_dedupe} evaluasi simbol tanpa bar tertutup baru.")
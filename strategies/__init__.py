@@ -1,19 +1,84 @@
-import os
+"""
+Registry strategi lazy.
+
+STRATEGY_MANIFEST mendaftar semua strategi (kunci -> modul, nama class) tanpa mengimpornya.
+Modul strategi baru diimpor saat class-nya pertama kali diminta dari STRATEGY_FACTORY, dan hanya
+strategi yang aktif (ENABLED_STRATEGIES, kosong = semua) yang ada di factory. Mengimpor paket ini
+tidak memuat main.py maupun MetaTrader5, jadi backtest dan proses evaluator start dengan cepat.
+
+Urutan manifest adalah urutan evaluasi strategi (strategi pertama yang mengirim order menghentikan
+pengecekan untuk siklus itu).
+"""
+from collections.abc import Mapping
 import importlib
+import logging
+import zlib
+
+from helpers import get_env_var
+
+STRATEGY_MANIFEST = {
+    'stochastic_divergence': ('stochastic_divergence', 'Stochastic_Divergence'),
+    'bollinger_reversal':    ('bollinger_reversal', 'Bollinger_Reversal'),
+    'breakout':              ('breakout', 'Breakout'),
+    'supply_demand':         ('supply_demand', 'Supply_Demand'),
+    'ichimoku_crossover':    ('ichimoku_crossover', 'Ichimoku_Crossover'),
+    'engulfing_reversal':    ('engulfing_reversal', 'Engulfing_Reversal'),
+    'rsi_oversold':          ('rsi', 'Rsi_Oversold'),
+    'bollinger_squeeze':     ('bollinger_squeeze', 'Bollinger_Squeeze'),
+    'fakeout':               ('fakeout', 'Fakeout'),
+    'ma_crossover':          ('ma', 'Ma_Crossover'),
+}
+
+# Magic number per strategi untuk order, posisi, dan history deal. Diturunkan dari nama strategi
+# (crc32), jadi tetap sama walau strategi lain ditambah/dihapus atau urutan manifest berubah.
+MAGIC_BASE = get_env_var('MAGIC_BASE', 270000, int)
+
+def build_magic_tables(manifest, base):
+    """(magic -> nama class, kunci strategi -> magic); RuntimeError jika dua strategi mendapat magic yang sama."""
+    magic_strategy = {}; strategy_magic = {}
+    for strategy_key, (_, class_name) in manifest.items():
+        magic = base + zlib.crc32(strategy_key.encode()) % 10000
+        if magic in magic_strategy: raise RuntimeError(f"Magic number {magic} bentrok: {magic_strategy[magic]} dan {class_name}")
+        magic_strategy[magic] = class_name; strategy_magic[strategy_key] = magic
+    return magic_strategy, strategy_magic
+
+MAGIC_STRATEGY, STRATEGY_MAGIC = build_magic_tables(STRATEGY_MANIFEST, MAGIC_BASE)
+
+
+def is_bot_position(position):
+    """Posisi milik bot: magic strategi, atau posisi lama sebelum magic dipakai (magic 0, komentar "BotV...")."""
+    return position.magic in MAGIC_STRATEGY or (position.magic == 0 and position.comment.startswith('BotV'))
+
+
+class LazyStrategyFactory(Mapping):
+    """Kunci strategi -> class; modulnya diimpor saat pertama diminta."""
+    def __init__(self, keys):
+        self._keys = list(keys)
+        self._classes = {}
+
+    def __getitem__(self, key):
+        if key not in self._keys: raise KeyError(key)
+        strategy_class = self._classes.get(key)
+        if strategy_class is None:
+            module_name, class_name = STRATEGY_MANIFEST[key]
+            strategy_class = getattr(importlib.import_module(f"strategies.{module_name}"), class_name)
+            strategy_class.magic = STRATEGY_MAGIC[key]
+            self._classes[key] = strategy_class
+            logging.debug("Strategi dimuat: %s", key)
+        return strategy_class
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def enabled_strategies():
+    """Kunci strategi aktif (ENABLED_STRATEGIES, dipisah koma; kosong = semua), urutan manifest."""
+    enabled = {key.strip().lower() for key in get_env_var('ENABLED_STRATEGIES', '').split(',') if key.strip()}
+    unknown = enabled - set(STRATEGY_MANIFEST)
+    if unknown: logging.warning("ENABLED_STRATEGIES tidak dikenal, diabaikan: %s", ', '.join(sorted(unknown)))
+    return [key for key in STRATEGY_MANIFEST if not enabled or key in enabled]
 
-# Secara otomatis menemukan dan mendaftarkan semua class strategi
-STRATEGY_FACTORY = {}
-
-for filename in os.listdir(os.path.dirname(__file__)):
-    if filename.endswith(".py") and filename not in ["__init__.py", "strategy_base.py"]:
-        module_name = filename[:-3]
-        module = importlib.import_module(f"strategies.{module_name}")
-        
-        # Cari class di dalam file yang merupakan turunan dari Strategy
-        for item_name in dir(module):
-            item = getattr(module, item_name)
-            if isinstance(item, type) and issubclass(item, module.Strategy) and item is not module.Strategy:
-                # Gunakan nama class sebagai kunci (lowercase)
-                strategy_key = item.__name__.lower()
-                STRATEGY_FACTORY[strategy_key] = item
-                print(f"Strategi ditemukan dan didaftarkan: {strategy_key}")
\ No newline at end of file
+STRATEGY_FACTORY = LazyStrategyFactory(enabled_strategies())
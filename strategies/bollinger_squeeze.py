@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
-import MetaTrader5 as mt
+import numpy as np
+import mt5_constants as mt
 from helpers import get_env_var
 from strategies.strategy_base import Strategy
 
@@ -13,17 +14,15 @@ class Bollinger_Squeeze(Strategy):
         self.sl_mult = get_env_var('BOLLINGER_SQUEEZE_SL_ATR_MULT', 2.0, float)
         self.tp_mult = get_env_var('BOLLINGER_SQUEEZE_TP_ATR_MULT', 4.0, float)
         self.atr_period = 14
-        logging.info(f"{self.symbol} [Bollinger_Squeeze]: Strategi aktif (period={self.period}, lookback={self.lookback})")
+        logging.info("%s [Bollinger_Squeeze]: Strategi aktif (period=%s, lookback=%s)", self.symbol, self.period, self.lookback)
 
     def check_signal(self, ohlc, tick):
         if len(ohlc) < self.lookback: return
 
         # 1. Hitung Bollinger Bands dan Bandwidth
-        middle_band = ohlc['close'].rolling(window=self.period).mean()
-        std = ohlc['close'].rolling(window=self.period).std()
-        upper_band = middle_band + (std * self.std_dev)
-        lower_band = middle_band - (std * self.std_dev)
-        bandwidth = (upper_band - lower_band) / middle_band
+        ind = self._indicators(ohlc)
+        middle_band, upper_band, lower_band = ind.bollinger(self.period, self.std_dev)
+        bandwidth = ind.bollinger_bandwidth(self.period, self.std_dev)
 
         # 2. Cek Kondisi Squeeze
         # Squeeze terjadi jika bandwidth candle sebelumnya adalah yang terendah dalam periode lookback
@@ -33,14 +32,14 @@ class Bollinger_Squeeze(Strategy):
             return
 
         # 3. Jika sedang dalam squeeze, cek sinyal breakout pada candle terakhir
-        signal_candle = ohlc.iloc[-2]
+        signal_candle = ohlc[-2]
         
         atr_val = self._calculate_atr(ohlc).iloc[-1]
         if pd.isna(atr_val) or atr_val == 0: atr_val = (tick.ask * 0.005)
 
         # 4. Sinyal BUY: Tutup di atas Upper Band
         if signal_candle['close'] > upper_band.iloc[-2]:
-            logging.info(f"{self.symbol}: Sinyal Bollinger Squeeze BUY terdeteksi.")
+            logging.info("%s: Sinyal Bollinger Squeeze BUY terdeteksi.", self.symbol)
             sl_ideal = tick.ask - (atr_val * self.sl_mult)
             tp_ideal = tick.ask + (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
@@ -49,14 +48,38 @@ class Bollinger_Squeeze(Strategy):
 
         # 5. Sinyal SELL: Tutup di bawah Lower Band
         if signal_candle['close'] < lower_band.iloc[-2]:
-            logging.info(f"{self.symbol}: Sinyal Bollinger Squeeze SELL terdeteksi.")
+            logging.info("%s: Sinyal Bollinger Squeeze SELL terdeteksi.", self.symbol)
             sl_ideal = tick.bid + (atr_val * self.sl_mult)
             tp_ideal = tick.bid - (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_SELL, tick.bid, sl, tp)
 
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
- 
\ No newline at end of file
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        if len(batch) < self.lookback: return self._no_trigger(batch)
+        ind = batch.indicators
+        middle_band, upper_band, lower_band = ind.bollinger(self.period, self.std_dev)
+        bandwidth = ind.bollinger_bandwidth(self.period, self.std_dev)
+        is_in_squeeze = bandwidth.to_numpy()[-3] <= bandwidth.iloc[-self.lookback:-3].min().to_numpy()
+        close = batch.values('close')[-2]
+        return is_in_squeeze & ((close > upper_band.to_numpy()[-2]) | (close < lower_band.to_numpy()[-2]))
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        ind = self._indicators(ohlc)
+        middle_band, upper_band, lower_band = ind.bollinger(self.period, self.std_dev)
+        bandwidth = ind.bollinger_bandwidth(self.period, self.std_dev)
+        enough = np.arange(1, len(ohlc) + 1) >= self.lookback
+        if self.lookback > 3:
+            # min(bandwidth.iloc[-lookback:-3]) = min jendela (lookback-3) bar yang berakhir di bar j-3 (NaN dilewati)
+            recent_min = bandwidth.rolling(self.lookback - 3, min_periods=1).min().shift(3).to_numpy(float)
+            is_in_squeeze = enough & (bandwidth.shift(2).to_numpy(float) <= recent_min)
+        else:
+            is_in_squeeze = np.zeros(len(ohlc), dtype=bool)
+        signal_close = ohlc['close'].shift(1).to_numpy(float)
+        buy = is_in_squeeze & (signal_close > upper_band.shift(1).to_numpy(float))
+        sell = is_in_squeeze & (signal_close < lower_band.shift(1).to_numpy(float))
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, buy, sell,
+                                  ask - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  bid + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult))
@@ -1,6 +1,7 @@
-import MetaTrader5 as mt
+import mt5_constants as mt
 from helpers import get_env_var, AGGRESSION_LEVEL # Kita akan buat file helpers
 import pandas as pd
+import numpy as np
 import logging
 
 from strategies.strategy_base import Strategy
@@ -32,21 +33,55 @@ class Breakout(Strategy):
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_SELL, tick.bid, sl, tp)
     def _is_confirmed(self, ohlc_df, direction='long'):
-        if ohlc_df.shape[0] < self.lookback + self.confirmation + 1: return False
-        lookback_data = ohlc_df.iloc[-(self.lookback + self.confirmation + 1):-(self.confirmation + 1)]
-        confirm_data = ohlc_df.iloc[-(self.confirmation + 1):-1]
-        if direction == 'long': return (confirm_data['close'] > lookback_data['high'].max()).all()
-        else: return (confirm_data['close'] < lookback_data['low'].min()).all()
+        if len(ohlc_df) < self.lookback + self.confirmation + 1: return False
+        lookback_start, lookback_stop = -(self.lookback + self.confirmation + 1), -(self.confirmation + 1)
+        confirm_close = ohlc_df['close'][-(self.confirmation + 1):-1]
+        if direction == 'long': return (confirm_close > ohlc_df.highest('high', lookback_start, lookback_stop)).all()
+        else: return (confirm_close < ohlc_df.lowest('low', lookback_start, lookback_stop)).all()
     def _is_breakout_candle_valid(self, ohlc_df, direction):
-        breakout_candle = ohlc_df.iloc[-2]; total_range = breakout_candle['high'] - breakout_candle['low']
+        breakout_candle = ohlc_df[-2]; total_range = breakout_candle['high'] - breakout_candle['low']
         body_size = abs(breakout_candle['close'] - breakout_candle['open'])
-        if total_range > 0 and (body_size / total_range) < self.min_body_ratio: logging.info(f"{self.symbol}: Breakout DITOLAK. Badan candle terlalu kecil."); return False
-        avg_volume = ohlc_df['tick_volume'].iloc[-self.vol_period-2:-2].mean()
-        if breakout_candle['tick_volume'] < avg_volume * self.vol_mult: logging.info(f"{self.symbol}: Breakout DITOLAK. Volume terlalu rendah."); return False
+        if total_range > 0 and (body_size / total_range) < self.min_body_ratio: logging.info("%s: Breakout DITOLAK. Badan candle terlalu kecil.", self.symbol); return False
+        avg_volume = ohlc_df['tick_volume'][-self.vol_period-2:-2].mean()
+        if breakout_candle['tick_volume'] < avg_volume * self.vol_mult: logging.info("%s: Breakout DITOLAK. Volume terlalu rendah.", self.symbol); return False
         mid_point = (breakout_candle['high'] + breakout_candle['low']) / 2
         if (direction == 'long' and breakout_candle['close'] < mid_point) or (direction == 'short' and breakout_candle['close'] > mid_point):
-            logging.info(f"{self.symbol}: Breakout DITOLAK. Penutupan candle lemah."); return False
-        logging.info(f"{self.symbol}: Kualitas breakout TERVALIDASI."); return True
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']; tr1 = high - low; tr2 = (high - close.shift(1)).abs(); tr3 = (low - close.shift(1)).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1); return tr.rolling(self.atr_period).mean()
+            logging.info("%s: Breakout DITOLAK. Penutupan candle lemah.", self.symbol); return False
+        logging.info("%s: Kualitas breakout TERVALIDASI.", self.symbol); return True
+
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        # Hanya konfirmasi breakout; validasi candle (badan/volume) tetap di check_signal
+        window = self.lookback + self.confirmation + 1
+        if len(batch) < window: return self._no_trigger(batch)
+        confirm_close = batch.values('close')[-(self.confirmation + 1):-1]
+        max_high = batch['high'].iloc[-window:-(self.confirmation + 1)].max().to_numpy()
+        min_low = batch['low'].iloc[-window:-(self.confirmation + 1)].min().to_numpy()
+        return (confirm_close > max_high).all(axis=0) | (confirm_close < min_low).all(axis=0)
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        ind = self._indicators(ohlc); c = self.confirmation
+        enough = np.arange(1, len(ohlc) + 1) >= self.lookback + c + 1
+        # Jendela lookback berakhir di bar j-c-1, candle konfirmasi adalah bar j-c .. j-1
+        lookback_high = ind.rolling_max('high', self.lookback).shift(c + 1).to_numpy(float)
+        lookback_low = ind.rolling_min('low', self.lookback).shift(c + 1).to_numpy(float)
+        long_setup = enough & (ind.rolling_min('close', c).shift(1).to_numpy(float) > lookback_high)
+        short_setup = enough & (ind.rolling_max('close', c).shift(1).to_numpy(float) < lookback_low) & ~long_setup
+        if self.validate_candle:
+            valid_long, valid_short = self._breakout_candle_masks(ohlc)
+            long_setup = long_setup & valid_long; short_setup = short_setup & valid_short
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, long_setup, short_setup,
+                                  ask - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  bid + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult))
+    def _breakout_candle_masks(self, ohlc_df):
+        # Versi vektor dari _is_breakout_candle_valid; candle breakout = bar j-1
+        candle = ohlc_df[['open', 'high', 'low', 'close', 'tick_volume']].shift(1)
+        total_range = candle['high'] - candle['low']; body_size = (candle['close'] - candle['open']).abs()
+        body_ok = ~((total_range > 0) & ((body_size / total_range) < self.min_body_ratio))
+        avg_volume = ohlc_df['tick_volume'].rolling(self.vol_period).mean().shift(2)
+        volume_ok = ~(candle['tick_volume'] < avg_volume * self.vol_mult)
+        mid_point = (candle['high'] + candle['low']) / 2
+        valid = (body_ok & volume_ok).to_numpy(bool)
+        return valid & ~(candle['close'] < mid_point).to_numpy(bool), valid & ~(candle['close'] > mid_point).to_numpy(bool)
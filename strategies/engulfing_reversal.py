@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
-import MetaTrader5 as mt
+import numpy as np
+import mt5_constants as mt
 from helpers import get_env_var
 from strategies.strategy_base import Strategy
 
@@ -12,15 +13,15 @@ class Engulfing_Reversal(Strategy):
         self.sl_mult = get_env_var('ENGULFING_REVERSAL_SL_ATR_MULT', 1.5, float)
         self.tp_mult = get_env_var('ENGULFING_REVERSAL_TP_ATR_MULT', 3.0, float)
         self.atr_period = 14
-        logging.info(f"{self.symbol} [Engulfing_Reversal]: Strategi aktif (lookback={self.trend_lookback})")
+        logging.info("%s [Engulfing_Reversal]: Strategi aktif (lookback=%s)", self.symbol, self.trend_lookback)
 
     def check_signal(self, ohlc, tick):
         # Kita butuh setidaknya 3 candle untuk mengevaluasi pola
         if len(ohlc) < self.trend_lookback + 3: return
 
         # Identifikasi candle
-        prev_candle = ohlc.iloc[-3]
-        signal_candle = ohlc.iloc[-2]
+        prev_candle = ohlc[-3]
+        signal_candle = ohlc[-2]
         
         atr_val = self._calculate_atr(ohlc).iloc[-1]
         if pd.isna(atr_val) or atr_val == 0: atr_val = (tick.ask * 0.005)
@@ -34,10 +35,10 @@ class Engulfing_Reversal(Strategy):
                                 signal_candle['close'] > signal_candle['open'] and
                                 signal_candle['open'] < prev_candle['close'] and
                                 signal_candle['close'] > prev_candle['open'] and
-                                signal_candle['low'] <= ohlc['low'].iloc[-self.trend_lookback-2:-2].min())
+                                signal_candle['low'] <= ohlc.lowest('low', -self.trend_lookback-2, -2))
                                 
         if is_bullish_engulfing:
-            logging.info(f"{self.symbol}: Sinyal Bullish Engulfing terdeteksi.")
+            logging.info("%s: Sinyal Bullish Engulfing terdeteksi.", self.symbol)
             sl_ideal = signal_candle['low'] - (atr_val * self.sl_mult)
             tp_ideal = tick.ask + (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
@@ -49,16 +50,38 @@ class Engulfing_Reversal(Strategy):
                                 signal_candle['close'] < signal_candle['open'] and
                                 signal_candle['open'] > prev_candle['close'] and
                                 signal_candle['close'] < prev_candle['open'] and
-                                signal_candle['high'] >= ohlc['high'].iloc[-self.trend_lookback-2:-2].max())
+                                signal_candle['high'] >= ohlc.highest('high', -self.trend_lookback-2, -2))
 
         if is_bearish_engulfing:
-            logging.info(f"{self.symbol}: Sinyal Bearish Engulfing terdeteksi.")
+            logging.info("%s: Sinyal Bearish Engulfing terdeteksi.", self.symbol)
             sl_ideal = signal_candle['high'] + (atr_val * self.sl_mult)
             tp_ideal = tick.bid - (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_SELL, tick.bid, sl, tp)
 
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        if len(batch) < self.trend_lookback + 3: return self._no_trigger(batch)
+        opens, closes = batch.values('open'), batch.values('close')
+        prev_open, prev_close, signal_open, signal_close = opens[-3], closes[-3], opens[-2], closes[-2]
+        recent_low = batch['low'].iloc[-self.trend_lookback-2:-2].min().to_numpy()
+        recent_high = batch['high'].iloc[-self.trend_lookback-2:-2].max().to_numpy()
+        bullish = (prev_close < prev_open) & (signal_close > signal_open) & (signal_open < prev_close) & (signal_close > prev_open) & (batch.values('low')[-2] <= recent_low)
+        bearish = (prev_close > prev_open) & (signal_close < signal_open) & (signal_open > prev_close) & (signal_close < prev_open) & (batch.values('high')[-2] >= recent_high)
+        return bullish | bearish
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        ind = self._indicators(ohlc)
+        enough = np.arange(1, len(ohlc) + 1) >= self.trend_lookback + 3
+        prev_candle = ohlc[['open', 'close']].shift(2); signal_candle = ohlc[['open', 'high', 'low', 'close']].shift(1)
+        p_open, p_close = prev_candle['open'].to_numpy(float), prev_candle['close'].to_numpy(float)
+        s_open, s_high, s_low, s_close = (signal_candle[c].to_numpy(float) for c in ('open', 'high', 'low', 'close'))
+        recent_low = ind.rolling_min('low', self.trend_lookback).shift(2).to_numpy(float)
+        recent_high = ind.rolling_max('high', self.trend_lookback).shift(2).to_numpy(float)
+        is_bullish_engulfing = enough & (p_close < p_open) & (s_close > s_open) & (s_open < p_close) & (s_close > p_open) & (s_low <= recent_low)
+        is_bearish_engulfing = enough & (p_close > p_open) & (s_close < s_open) & (s_open > p_close) & (s_close < p_open) & (s_high >= recent_high)
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, is_bullish_engulfing, is_bearish_engulfing,
+                                  s_low - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  s_high + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult))
@@ -1,5 +1,6 @@
-import MetaTrader5 as mt
+import mt5_constants as mt
 import pandas as pd
+import numpy as np
 import logging
 from .strategy_base import Strategy
 from helpers import get_env_var
@@ -13,30 +14,31 @@ class Ichimoku_Crossover(Strategy):
         self.sl_mult = get_env_var('ICHIMOKU_SL_ATR_MULT', 2.5, float)
         self.tp_mult = get_env_var('ICHIMOKU_TP_ATR_MULT', 5.0, float)
         self.atr_period = 14
-        logging.info(f"{self.symbol} [Ichimoku_Crossover]: Strategi aktif (p={self.tenkan_p},{self.kijun_p},{self.senkou_b_p})")
+        logging.info("%s [Ichimoku_Crossover]: Strategi aktif (p=%s,%s,%s)", self.symbol, self.tenkan_p, self.kijun_p, self.senkou_b_p)
 
     def check_signal(self, ohlc, tick):
         # 1. Hitung semua komponen Ichimoku
+        ind = self._indicators(ohlc)
         # Tenkan-sen (Conversion Line)
-        tenkan_high = ohlc['high'].rolling(window=self.tenkan_p).max()
-        tenkan_low = ohlc['low'].rolling(window=self.tenkan_p).min()
+        tenkan_high = ind.rolling_max('high', self.tenkan_p)
+        tenkan_low = ind.rolling_min('low', self.tenkan_p)
         tenkan_sen = (tenkan_high + tenkan_low) / 2
 
         # Kijun-sen (Base Line)
-        kijun_high = ohlc['high'].rolling(window=self.kijun_p).max()
-        kijun_low = ohlc['low'].rolling(window=self.kijun_p).min()
+        kijun_high = ind.rolling_max('high', self.kijun_p)
+        kijun_low = ind.rolling_min('low', self.kijun_p)
         kijun_sen = (kijun_high + kijun_low) / 2
 
         # Senkou Span A (Leading Span A)
         senkou_a = ((tenkan_sen + kijun_sen) / 2).shift(self.kijun_p)
 
         # Senkou Span B (Leading Span B)
-        senkou_b_high = ohlc['high'].rolling(window=self.senkou_b_p).max()
-        senkou_b_low = ohlc['low'].rolling(window=self.senkou_b_p).min()
+        senkou_b_high = ind.rolling_max('high', self.senkou_b_p)
+        senkou_b_low = ind.rolling_min('low', self.senkou_b_p)
         senkou_b = ((senkou_b_high + senkou_b_low) / 2).shift(self.kijun_p)
         
         # Chikou Span (Lagging Span)
-        chikou_span = ohlc['close'].shift(-self.kijun_p)
+        chikou_span = ind.column('close').shift(-self.kijun_p)
 
         # 2. Ambil nilai-nilai terbaru untuk pengecekan sinyal
         # Kita butuh 3 candle terakhir untuk mendeteksi cross: [-3] (sebelum cross) dan [-2] (setelah cross)
@@ -48,7 +50,7 @@ class Ichimoku_Crossover(Strategy):
         last_tenkan = tenkan_sen.iloc[-2]
         last_kijun = kijun_sen.iloc[-2]
         
-        last_close = ohlc['close'].iloc[-2]
+        last_close = ohlc['close'][-2]
         
         # Nilai Kumo (Awan) pada saat candle sinyal terjadi
         # Ingat, Kumo diproyeksikan ke depan, jadi kita lihat nilai Kumo di masa lalu
@@ -57,7 +59,7 @@ class Ichimoku_Crossover(Strategy):
         
         # Nilai Chikou Span
         chikou_at_signal = chikou_span.iloc[-2-self.kijun_p] # Chikou saat ini
-        price_for_chikou = ohlc['close'].iloc[-2-self.kijun_p] # Harga yang dibandingkan dengan Chikou
+        price_for_chikou = ohlc['close'][-2-self.kijun_p] # Harga yang dibandingkan dengan Chikou
 
         atr_val = self._calculate_atr(ohlc).iloc[-1]
         if pd.isna(atr_val) or atr_val == 0: atr_val = (tick.ask * 0.005)
@@ -68,7 +70,7 @@ class Ichimoku_Crossover(Strategy):
         is_chikou_free_bullish = chikou_at_signal > price_for_chikou
         
         if is_bullish_cross and is_above_kumo and is_chikou_free_bullish:
-            logging.info(f"{self.symbol}: Sinyal Ichimoku Golden Cross (STRONG) terdeteksi.")
+            logging.info("%s: Sinyal Ichimoku Golden Cross (STRONG) terdeteksi.", self.symbol)
             sl_ideal = tick.ask - (atr_val * self.sl_mult)
             tp_ideal = tick.ask + (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
@@ -81,13 +83,44 @@ class Ichimoku_Crossover(Strategy):
         is_chikou_free_bearish = chikou_at_signal < price_for_chikou
 
         if is_bearish_cross and is_below_kumo and is_chikou_free_bearish:
-            logging.info(f"{self.symbol}: Sinyal Ichimoku Death Cross (STRONG) terdeteksi.")
+            logging.info("%s: Sinyal Ichimoku Death Cross (STRONG) terdeteksi.", self.symbol)
             sl_ideal = tick.bid + (atr_val * self.sl_mult)
             tp_ideal = tick.bid - (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_SELL, tick.bid, sl, tp)
-            
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
\ No newline at end of file
+
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        # Cross Tenkan/Kijun saja; filter Kumo dan Chikou tetap di check_signal
+        if len(batch) < self.senkou_b_p + self.kijun_p: return self._no_trigger(batch)
+        ind = batch.indicators
+        tenkan_sen = ((ind.rolling_max('high', self.tenkan_p) + ind.rolling_min('low', self.tenkan_p)) / 2).to_numpy()
+        kijun_sen = ((ind.rolling_max('high', self.kijun_p) + ind.rolling_min('low', self.kijun_p)) / 2).to_numpy()
+        bullish = (tenkan_sen[-3] < kijun_sen[-3]) & (tenkan_sen[-2] > kijun_sen[-2])
+        bearish = (tenkan_sen[-3] > kijun_sen[-3]) & (tenkan_sen[-2] < kijun_sen[-2])
+        return bullish | bearish
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        ind = self._indicators(ohlc)
+        tenkan_sen = (ind.rolling_max('high', self.tenkan_p) + ind.rolling_min('low', self.tenkan_p)) / 2
+        kijun_sen = (ind.rolling_max('high', self.kijun_p) + ind.rolling_min('low', self.kijun_p)) / 2
+        senkou_a = ((tenkan_sen + kijun_sen) / 2).shift(self.kijun_p)
+        senkou_b = ((ind.rolling_max('high', self.senkou_b_p) + ind.rolling_min('low', self.senkou_b_p)) / 2).shift(self.kijun_p)
+        enough = np.arange(1, len(ohlc) + 1) >= self.senkou_b_p + self.kijun_p
+
+        prev_tenkan, prev_kijun = tenkan_sen.shift(2).to_numpy(float), kijun_sen.shift(2).to_numpy(float)
+        last_tenkan, last_kijun = tenkan_sen.shift(1).to_numpy(float), kijun_sen.shift(1).to_numpy(float)
+        last_close = ohlc['close'].shift(1).to_numpy(float)
+        kumo_a_at_signal, kumo_b_at_signal = senkou_a.shift(1).to_numpy(float), senkou_b.shift(1).to_numpy(float)
+        # Chikou pada candle sinyal = close candle sinyal; dibandingkan dengan close kijun_p bar sebelumnya
+        price_for_chikou = ohlc['close'].shift(1 + self.kijun_p).to_numpy(float)
+
+        buy = (enough & (prev_tenkan < prev_kijun) & (last_tenkan > last_kijun)
+               & (last_close > kumo_a_at_signal) & (last_close > kumo_b_at_signal) & (last_close > price_for_chikou))
+        sell = (enough & (prev_tenkan > prev_kijun) & (last_tenkan < last_kijun)
+                & (last_close < kumo_a_at_signal) & (last_close < kumo_b_at_signal) & (last_close < price_for_chikou))
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, buy, sell,
+                                  ask - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  bid + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult))
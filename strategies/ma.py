@@ -2,7 +2,8 @@ import logging
 from helpers import get_env_var
 from strategies.strategy_base import Strategy
 import pandas as pd
-import MetaTrader5 as mt
+import numpy as np
+import mt5_constants as mt
 
 class Ma_Crossover(Strategy):
     def __init__(self, symbol, volume):
@@ -12,12 +13,13 @@ class Ma_Crossover(Strategy):
         self.sl_mult = get_env_var('MA_CROSSOVER_SL_ATR_MULT', 2.0, float)
         self.tp_mult = get_env_var('MA_CROSSOVER_TP_ATR_MULT', 4.0, float)
         self.atr_period = 14 # Menggunakan ATR untuk SL/TP
-        logging.info(f"{self.symbol} [Ma_Crossover]: Strategi aktif (fast={self.fast_period}, slow={self.slow_period})")
+        logging.info("%s [Ma_Crossover]: Strategi aktif (fast=%s, slow=%s)", self.symbol, self.fast_period, self.slow_period)
 
     def check_signal(self, ohlc, tick):
         # 1. Hitung Moving Averages
-        fast_ma = ohlc['close'].rolling(window=self.fast_period).mean()
-        slow_ma = ohlc['close'].rolling(window=self.slow_period).mean()
+        ind = self._indicators(ohlc)
+        fast_ma = ind.sma('close', self.fast_period)
+        slow_ma = ind.sma('close', self.slow_period)
 
         # 2. Identifikasi sinyal crossover pada candle terakhir yang sudah close
         # Kita butuh 3 candle terakhir untuk mendeteksi cross: [-3] dan [-2]
@@ -32,7 +34,7 @@ class Ma_Crossover(Strategy):
 
         # 3. Cek Sinyal BUY (Golden Cross)
         if prev_fast < prev_slow and last_fast > last_slow:
-            logging.info(f"{self.symbol}: Sinyal Golden Cross terdeteksi.")
+            logging.info("%s: Sinyal Golden Cross terdeteksi.", self.symbol)
             sl_ideal = tick.ask - (atr_val * self.sl_mult)
             tp_ideal = tick.ask + (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
@@ -41,13 +43,29 @@ class Ma_Crossover(Strategy):
 
         # 4. Cek Sinyal SELL (Death Cross)
         if prev_fast > prev_slow and last_fast < last_slow:
-            logging.info(f"{self.symbol}: Sinyal Death Cross terdeteksi.")
+            logging.info("%s: Sinyal Death Cross terdeteksi.", self.symbol)
             sl_ideal = tick.bid + (atr_val * self.sl_mult)
             tp_ideal = tick.bid - (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_SELL, tick.bid, sl, tp)
 
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        ind = batch.indicators
+        fast_ma = ind.sma('close', self.fast_period).to_numpy(); slow_ma = ind.sma('close', self.slow_period).to_numpy()
+        golden = (fast_ma[-3] < slow_ma[-3]) & (fast_ma[-2] > slow_ma[-2])
+        death = (fast_ma[-3] > slow_ma[-3]) & (fast_ma[-2] < slow_ma[-2])
+        return golden | death
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        ind = self._indicators(ohlc)
+        fast_ma = ind.sma('close', self.fast_period); slow_ma = ind.sma('close', self.slow_period)
+        prev_fast, prev_slow = fast_ma.shift(2).to_numpy(float), slow_ma.shift(2).to_numpy(float)
+        last_fast, last_slow = fast_ma.shift(1).to_numpy(float), slow_ma.shift(1).to_numpy(float)
+        buy = (prev_fast < prev_slow) & (last_fast > last_slow)
+        sell = (prev_fast > prev_slow) & (last_fast < last_slow)
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, buy, sell,
+                                  ask - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  bid + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult))
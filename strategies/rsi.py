@@ -1,5 +1,6 @@
-import MetaTrader5 as mt
+import mt5_constants as mt
 import logging
+import numpy as np
 from helpers import AGGRESSION_LEVEL, get_env_var
 from strategies.strategy_base import Strategy
 
@@ -12,12 +13,26 @@ class Rsi_Oversold(Strategy):
         if AGGRESSION_LEVEL == 'high': self.level = 35
         elif AGGRESSION_LEVEL == 'low': self.level = 25
     def check_signal(self, ohlc, tick):
-        delta = ohlc['close'].diff(); gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
+        gain, loss = self._indicators(ohlc).rsi_averages(self.period)
         if loss.iloc[-1] == 0: return
         rs = gain / loss; rsi = 100 - (100 / (1 + rs)); last_rsi = rsi.iloc[-2]
         if last_rsi < self.level:
-            logging.info(f"{self.symbol}: Sinyal RSI Oversold terdeteksi! RSI={last_rsi:.2f} (Level={self.level})")
+            logging.info("%s: Sinyal RSI Oversold terdeteksi! RSI=%.2f (Level=%s)", self.symbol, last_rsi, self.level)
             sl_ideal = tick.ask - (self.sl_pips * self.point); tp_ideal = tick.ask + (self.tp_pips * self.point)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_BUY, tick.ask, sl, tp)
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        # Syarat loss bar berjalan (iloc[-1]) dicek ulang di check_signal
+        gain, loss = batch.indicators.rsi_averages(self.period)
+        with np.errstate(divide='ignore', invalid='ignore'): last_rsi = 100 - (100 / (1 + gain.to_numpy()[-2] / loss.to_numpy()[-2]))
+        return last_rsi < self.level
+
+    # --- Mode vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        gain, loss = self._indicators(ohlc).rsi_averages(self.period)
+        rs = gain / loss; rsi = 100 - (100 / (1 + rs))
+        buy = (loss.to_numpy(float) != 0) & (rsi.shift(1).to_numpy(float) < self.level)
+        sl_ideal = ask - (self.sl_pips * self.point); tp_ideal = ask + (self.tp_pips * self.point)
+        no_sell = np.zeros(len(ohlc), dtype=bool)
+        return self._signal_frame(ohlc, buy, no_sell, sl_ideal, tp_ideal, np.nan, np.nan)
@@ -1,4 +1,4 @@
-import MetaTrader5 as mt
+import mt5_constants as mt
 import pandas as pd
 import numpy as np
 import logging
@@ -15,20 +15,18 @@ class Stochastic_Divergence(Strategy):
         self.sl_mult = get_env_var('STOCHASTIC_DIVERGENCE_SL_ATR_MULT', 1.5, float)
         self.tp_mult = get_env_var('STOCHASTIC_DIVERGENCE_TP_ATR_MULT', 3.0, float)
         self.atr_period = 14
-        logging.info(f"{self.symbol} [Stochastic_Divergence]: Strategi aktif (k={self.k_period}, lookback={self.lookback})")
+        logging.info("%s [Stochastic_Divergence]: Strategi aktif (k=%s, lookback=%s)", self.symbol, self.k_period, self.lookback)
 
     def check_signal(self, ohlc, tick):
         # 1. Hitung Stochastic Oscillator (%K dan %D)
-        low_k = ohlc['low'].rolling(window=self.k_period).min()
-        high_k = ohlc['high'].rolling(window=self.k_period).max()
-        percent_k = 100 * ((ohlc['close'] - low_k) / (high_k - low_k))
-        percent_d = percent_k.rolling(window=self.d_period).mean()
+        percent_k, percent_d = self._indicators(ohlc).stochastic(self.k_period, self.d_period)
 
         # Kita perlu data yang cukup
         if len(ohlc) < self.lookback + 5: return
 
         # Ambil data harga dan stochastic untuk periode lookback
-        prices = ohlc['close'].iloc[-self.lookback:]
+        # Index posisi 0..lookback-1, jadi stochastic pada pivot diambil dengan iloc
+        prices = pd.Series(ohlc['close'][-self.lookback:])
         stoch = percent_d.iloc[-self.lookback:]
 
         atr_val = self._calculate_atr(ohlc).iloc[-1]
@@ -47,12 +45,12 @@ class Stochastic_Divergence(Strategy):
             # Kondisi: Puncak harga naik (Higher High)
             if last_price_peak > prev_price_peak:
                 # Cari puncak stochastic yang sesuai
-                stoch_at_last_peak = stoch.loc[price_swing_highs.index[-1]]
-                stoch_at_prev_peak = stoch.loc[price_swing_highs.index[-2]]
+                stoch_at_last_peak = stoch.iloc[price_swing_highs.index[-1]]
+                stoch_at_prev_peak = stoch.iloc[price_swing_highs.index[-2]]
                 
                 # Kondisi: Puncak stochastic turun (Lower High)
                 if stoch_at_last_peak < stoch_at_prev_peak:
-                    logging.info(f"{self.symbol}: Sinyal Bearish Divergence Stochastic terdeteksi.")
+                    logging.info("%s: Sinyal Bearish Divergence Stochastic terdeteksi.", self.symbol)
                     sl_ideal = tick.bid + (atr_val * self.sl_mult)
                     tp_ideal = tick.bid - (atr_val * self.tp_mult)
                     sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
@@ -72,18 +70,68 @@ class Stochastic_Divergence(Strategy):
             # Kondisi: Lembah harga turun (Lower Low)
             if last_price_valley < prev_price_valley:
                 # Cari lembah stochastic yang sesuai
-                stoch_at_last_valley = stoch.loc[price_swing_lows.index[-1]]
-                stoch_at_prev_valley = stoch.loc[price_swing_lows.index[-2]]
+                stoch_at_last_valley = stoch.iloc[price_swing_lows.index[-1]]
+                stoch_at_prev_valley = stoch.iloc[price_swing_lows.index[-2]]
 
                 # Kondisi: Lembah stochastic naik (Higher Low)
                 if stoch_at_last_valley > stoch_at_prev_valley:
-                    logging.info(f"{self.symbol}: Sinyal Bullish Divergence Stochastic terdeteksi.")
+                    logging.info("%s: Sinyal Bullish Divergence Stochastic terdeteksi.", self.symbol)
                     sl_ideal = tick.ask - (atr_val * self.sl_mult)
                     tp_ideal = tick.ask + (atr_val * self.tp_mult)
                     sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
                     self._create_order(mt.ORDER_TYPE_BUY, tick.ask, sl, tp)
-                    
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
\ No newline at end of file
+
+    # --- Versi vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        percent_k, percent_d = self._indicators(ohlc).stochastic(self.k_period, self.d_period)
+        close = ohlc['close'].to_numpy(float); stoch = percent_d.to_numpy(float)
+        prev_close = ohlc['close'].shift(1).to_numpy(float); next_close = ohlc['close'].shift(-1).to_numpy(float)
+        enough = np.arange(1, len(ohlc) + 1) >= self.lookback + 5
+        sell = enough & self._divergence_rows(close, stoch, (prev_close < close) & (next_close < close), 1)
+        buy = enough & self._divergence_rows(close, stoch, (prev_close > close) & (next_close > close), -1)
+        atr_val = self._atr_values(ohlc, ask)
+        return self._signal_frame(ohlc, buy, sell,
+                                  ask - (atr_val * self.sl_mult), ask + (atr_val * self.tp_mult),
+                                  bid + (atr_val * self.sl_mult), bid - (atr_val * self.tp_mult), buy_first=False)
+
+    def _divergence_rows(self, close, stoch, pivots, sign):
+        # Baris j: dua pivot terakhir di jendela lookback yang berakhir di bar j. Pivot butuh tetangga
+        # di dalam jendela, jadi hanya bar j-lookback+2 .. j-1 yang bisa menjadi pivot.
+        rows = np.arange(len(close))
+        latest = np.maximum.accumulate(np.where(pivots, rows, -1)) if len(close) else rows
+        last = np.concatenate(([-1], latest))[:-1] # Pivot terakhir <= j-1
+        prev = np.where(last > 0, latest[np.maximum(last - 1, 0)], -1) # Pivot sebelum pivot terakhir
+        found = prev >= rows - self.lookback + 2
+        last = np.where(found, last, 0); prev = np.where(found, prev, 0)
+        return found & ((close[last] - close[prev]) * sign > 0) & ((stoch[last] - stoch[prev]) * sign < 0)
+
+    # --- Pra-filter batch lintas simbol (live) ---
+    def batch_trigger(self, batch):
+        if len(batch) < self.lookback + 5: return self._no_trigger(batch)
+        percent_k, percent_d = batch.indicators.stochastic(self.k_period, self.d_period)
+        prices = batch.values('close')[-self.lookback:]; stoch = percent_d.to_numpy()[-self.lookback:]
+        missing = np.full((1, prices.shape[1]), np.nan)
+        prev_prices = np.vstack([missing, prices[:-1]]); next_prices = np.vstack([prices[1:], missing])
+        return self._divergence(prices, stoch, prev_prices < prices, next_prices < prices, 1) | \
+               self._divergence(prices, stoch, prev_prices > prices, next_prices > prices, -1)
+
+    @classmethod
+    def _divergence(cls, prices, stoch, before, after, sign):
+        # Pivot di bar tertutup terakhir bergantung pada bar berjalan yang masih bisa berubah sebelum
+        # check_signal: kedua kemungkinan (pivot / bukan pivot) dianggap terpicu
+        pivots = before & after
+        pivots[-2] = before[-2]
+        maybe_pivot = cls._last_two_diverge(prices, stoch, pivots, sign)
+        pivots[-2] = False
+        return maybe_pivot | cls._last_two_diverge(prices, stoch, pivots, sign)
+
+    @staticmethod
+    def _last_two_diverge(prices, stoch, pivots, sign):
+        # Dua pivot terakhir per simbol: harga makin ekstrem (sign) sementara stochastic berlawanan
+        rows = np.arange(len(prices))[:, None]; columns = np.arange(prices.shape[1])
+        last = np.where(pivots, rows, -1).max(axis=0)
+        prev = np.where(pivots & (rows < last), rows, -1).max(axis=0)
+        found = prev >= 0; last = np.where(found, last, 0); prev = np.where(found, prev, 0)
+        price_move = (prices[last, columns] - prices[prev, columns]) * sign
+        stoch_move = (stoch[last, columns] - stoch[prev, columns]) * sign
+        return found & (price_move > 0) & (stoch_move < 0)
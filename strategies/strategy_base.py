@@ -1,25 +1,27 @@
 # strategies/strategy_base.py
-import MetaTrader5 as mt
+import mt5_constants as mt
 from decimal import Decimal, ROUND_HALF_UP
 import logging
+import numpy as np
+import pandas as pd
+
+from indicators import INDICATOR_CACHE
+from symbol_specs import SYMBOL_SPECS
+from log_pipeline import trade_event
 
-# Variabel global mt_lock dan order_send_request perlu di-pass atau di-import
-# Cara termudah adalah membuatnya bisa diakses secara global (meski bukan praktik terbaik, tapi paling simpel untuk kasus ini)
-from main import mt_lock, order_send_request
 
 class Strategy:
     # ... (Tempelkan seluruh isi class Strategy di sini) ...
+    magic = 0 # Diisi per class oleh strategies/__init__.py (MAGIC_STRATEGY)
+    order_sender = None # Disuntikkan lewat set_order_sender(); backtest & proses evaluator mengganti _create_order
+
     def __init__(self, symbol, volume):
         self.symbol = symbol
         self.volume = volume
         self.order_sent = False
         
-        # Coba dapatkan info dari MT5 jika terhubung, jika tidak gunakan fallback
-        try:
-            from main import get_symbol_info # Coba impor
-            self.info = get_symbol_info(self.symbol)
-        except ImportError:
-            self.info = None # Akan diisi oleh backtester nanti
+        # Spesifikasi simbol dibagi semua strategi (symbol_specs.py); None jika belum ada sumbernya
+        self.info = SYMBOL_SPECS.get(self.symbol)
 
         if self.info:
             self.digits = self.info.digits
@@ -29,24 +31,79 @@ class Strategy:
             self.digits = 5 if "JPY" not in symbol.upper() else 3
             self.point = 0.00001 if "JPY" not in symbol.upper() else 0.001
     
-    def check_signal(self, ohlc_df, tick): raise NotImplementedError
+    # ohlc adalah Bars (bars.py) di live dan backtest; strategi yang belum di-port bisa memakai ohlc.to_frame()
+    def check_signal(self, ohlc, tick): raise NotImplementedError
+
+    # Nilai kolom 'direction' dari signals() jika tidak ada sinyal
+    NO_SIGNAL = -1
+
+    def signals(self, ohlc_df, ask, bid):
+        """
+        Versi vektor (opsional) dari check_signal untuk backtest.
+
+        Baris j hasilnya sama dengan keputusan check_signal(ohlc_df.iloc[:j+1], tick) dengan
+        tick.ask = ask[j] dan tick.bid = bid[j]. Mengembalikan DataFrame (index sama dengan
+        ohlc_df) berkolom 'direction' (ORDER_TYPE_BUY/SELL atau NO_SIGNAL), 'sl' dan 'tp'
+        (SL/TP ideal sebelum _get_final_sl_tp). None berarti strategi hanya punya jalur per-bar.
+        """
+        return None
+
+    def batch_trigger(self, batch):
+        """
+        Pra-filter lintas simbol (opsional) untuk mode live BATCH_EVAL.
+
+        `batch` adalah BarBatch (bar x simbol). Mengembalikan array bool sepanjang batch.symbols:
+        False hanya jika check_signal pasti tidak memberi sinyal untuk bar tertutup terakhir simbol
+        itu. Bar berjalan (baris terakhir) masih bisa berubah sebelum check_signal, jadi syarat yang
+        bergantung padanya harus dianggap terpenuhi. None berarti strategi selalu dievaluasi.
+        """
+        return None
+
+    def _no_trigger(self, batch):
+        return np.zeros(len(batch.symbols), dtype=bool)
+
+    def _atr_values(self, ohlc_df, ask):
+        # Sama seperti fallback di check_signal: ATR NaN/0 diganti 0.5% dari harga ask
+        atr = self._calculate_atr(ohlc_df).to_numpy(float)
+        return np.where(np.isnan(atr) | (atr == 0), ask * 0.005, atr)
+
+    def _signal_frame(self, ohlc_df, buy, sell, buy_sl, buy_tp, sell_sl, sell_tp, buy_first=True):
+        # Gabungkan mask BUY/SELL menjadi satu frame sinyal; urutan pengecekan mengikuti check_signal
+        direction = np.full(len(ohlc_df), self.NO_SIGNAL)
+        sl = np.full(len(ohlc_df), np.nan); tp = np.full(len(ohlc_df), np.nan)
+        first, second = ((buy, mt.ORDER_TYPE_BUY, buy_sl, buy_tp), (sell, mt.ORDER_TYPE_SELL, sell_sl, sell_tp)) if buy_first else \
+                        ((sell, mt.ORDER_TYPE_SELL, sell_sl, sell_tp), (buy, mt.ORDER_TYPE_BUY, buy_sl, buy_tp))
+        for mask, order_type, sl_values, tp_values in (second, first):
+            direction = np.where(mask, order_type, direction)
+            sl = np.where(mask, sl_values, sl); tp = np.where(mask, tp_values, tp)
+        return pd.DataFrame({'direction': direction, 'sl': sl, 'tp': tp}, index=ohlc_df.index)
+
+    def _indicators(self, ohlc_df):
+        # Indikator dibagi dengan strategi lain yang menerima frame yang sama di siklus ini
+        return INDICATOR_CACHE.get(self.symbol, ohlc_df)
+
+    def _calculate_atr(self, ohlc_df):
+        return self._indicators(ohlc_df).atr(self.atr_period)
     
     def _create_order(self, order_type, price, sl, tp):
-        if sl is None or tp is None or sl == 0 or tp == 0: logging.error(f"[{self.symbol}|{self.__class__.__name__}] Kalkulasi SL/TP gagal, order dibatalkan."); return
+        if sl is None or tp is None or sl == 0 or tp == 0: logging.error("[%s|%s] Kalkulasi SL/TP gagal, order dibatalkan.", self.symbol, self.__class__.__name__); return
         order_type_str = "BUY" if order_type == mt.ORDER_TYPE_BUY else "SELL"
-        log_message = f"-> MENGIRIM ORDER [{self.__class__.__name__}]: {order_type_str} {self.symbol} {self.volume} @ {price:.{self.digits}f} (SL: {sl:.{self.digits}f}, TP: {tp:.{self.digits}f})"
-        logging.info(log_message)
-        request = {"action": mt.TRADE_ACTION_DEAL, "symbol": self.symbol, "volume": float(self.volume), "type": order_type, "price": price, "sl": sl, "tp": tp, "comment": f"BotV2.7 {self.__class__.__name__}", "type_time": mt.TRADE_ACTION_DEAL, "type_filling": mt.ORDER_FILLING_IOC}
-        res = order_send_request(request)
+        logging.info("-> MENGIRIM ORDER [%s]: %s %s %s @ %.*f (SL: %.*f, TP: %.*f)", self.__class__.__name__, order_type_str, self.symbol, self.volume,
+                     self.digits, price, self.digits, sl, self.digits, tp)
+        request = {"action": mt.TRADE_ACTION_DEAL, "symbol": self.symbol, "volume": float(self.volume), "type": order_type, "price": price, "sl": sl, "tp": tp, "magic": self.magic, "comment": f"BotV2.7 {self.__class__.__name__}", "type_time": mt.TRADE_ACTION_DEAL, "type_filling": mt.ORDER_FILLING_IOC}
+        if self.order_sender is None: logging.error("[%s|%s] Pengirim order belum dipasang, order dibatalkan.", self.symbol, self.__class__.__name__); return
+        res = self.order_sender(request)
+        trade_event('order', symbol=self.symbol, strategy=self.__class__.__name__, magic=self.magic, type=order_type_str, volume=float(self.volume),
+                    price=price, sl=sl, tp=tp, retcode=getattr(res, 'retcode', None), ticket=getattr(res, 'order', None))
         if getattr(res, "retcode", None) == mt.TRADE_RETCODE_DONE:
             self.order_sent = True
-            logging.info(f"   -- BERHASIL: Order untuk {self.symbol} diterima (Ticket: {res.order}).")
+            logging.info("   -- BERHASIL: Order untuk %s diterima (Ticket: %s).", self.symbol, res.order)
         else:
-            logging.error(f"   -- GAGAL: Order untuk {self.symbol} ditolak. Kode: {getattr(res, 'retcode', 'N/A')}, Komentar: '{getattr(res, 'comment', 'N/A')}'")
+            logging.error("   -- GAGAL: Order untuk %s ditolak. Kode: %s, Komentar: '%s'", self.symbol, getattr(res, 'retcode', 'N/A'), getattr(res, 'comment', 'N/A'))
 
     def _get_final_sl_tp(self, order_type, tick, sl_price_ideal, tp_price_ideal):
         if not all([self.info, self.info.trade_tick_size > 0]): return None, None
-        tick_size = Decimal(str(self.info.trade_tick_size)); ask = Decimal(str(tick.ask)); bid = Decimal(str(tick.bid))
+        tick_size = self.info.tick_size_decimal; ask = Decimal(str(tick.ask)); bid = Decimal(str(tick.bid))
         sl = Decimal(str(sl_price_ideal)); tp = Decimal(str(tp_price_ideal))
         if order_type == mt.ORDER_TYPE_BUY:
             if sl >= bid: sl = bid - tick_size
@@ -54,9 +111,8 @@ class Strategy:
         else:
             if sl <= ask: sl = ask + tick_size
             if tp >= bid: tp = bid - tick_size
-        stops_level = self.info.trade_stops_level
-        if stops_level > 0:
-            min_stop_distance = Decimal(str(stops_level)) * Decimal(str(self.info.point))
+        if self.info.trade_stops_level > 0:
+            min_stop_distance = self.info.min_stop_distance
             validation_price = bid if order_type == mt.ORDER_TYPE_BUY else ask
             if order_type == mt.ORDER_TYPE_BUY:
                 if (validation_price - sl) < min_stop_distance: sl = validation_price - min_stop_distance
@@ -64,4 +120,9 @@ class Strategy:
                 if (sl - validation_price) < min_stop_distance: sl = validation_price - min_stop_distance
         sl = (sl / tick_size).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * tick_size
         tp = (tp / tick_size).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * tick_size
-        return float(sl), float(tp)
\ No newline at end of file
+        return float(sl), float(tp)
+
+
+def set_order_sender(sender):
+    """Pasang fungsi pengirim order (request dict -> hasil order_send) untuk semua strategi (main.py)."""
+    Strategy.order_sender = staticmethod(sender)
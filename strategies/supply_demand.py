@@ -1,9 +1,84 @@
-import MetaTrader5 as mt
+import mt5_constants as mt
+import numpy as np
 import pandas as pd
 import logging
 from .strategy_base import Strategy
 from helpers import get_env_var
 
+class ZoneIndex:
+    """
+    Indeks zona supply/demand satu simbol, diperbarui secara inkremental setiap ada bar tertutup baru.
+
+    Kandidat zona adalah base candle (bar k, badan > 0) yang didahului candle eksplosif (bar k-1,
+    badan > base * explosive_mult). Candle eksplosif bearish membentuk zona supply, bullish membentuk
+    zona demand, dan zonanya adalah high/low base candle. Zona "sudah diuji" jika ada candle sejak
+    base candle (termasuk base candle itu sendiri dan bar berjalan, sama seperti loop lama) yang
+    menyentuh zona. Untuk setiap zona disimpan low terendah dan high tertinggi sejak base candle
+    (suffix min/max); karena base candle sendiri selalu menyentuh zonanya, syarat suffix ini sama
+    persis dengan pengecekan per candle.
+    """
+    def __init__(self, explosive_mult):
+        self.explosive_mult = explosive_mult
+        self._reset()
+
+    def _reset(self):
+        self.first_time = None; self.last_time = None # Rentang bar tertutup yang sudah masuk indeks
+        self.time = np.empty(0, dtype=np.int64) # Waktu base candle, urut naik
+        self.supply = np.empty(0, dtype=bool) # True = supply, False = demand
+        self.high = np.empty(0); self.low = np.empty(0)
+        self.min_low = np.empty(0); self.max_high = np.empty(0)
+
+    def update(self, bars):
+        """Masukkan bar tertutup (bars[:-1]) yang belum ada di indeks; muat ulang jika ada celah."""
+        closed = bars[:-1]; times = closed['time']
+        if not len(times): self._reset(); return
+        start = int(np.searchsorted(times, self.last_time, side='right')) if self.last_time is not None else 0
+        # Indeks lama hanya bisa dilanjutkan jika bar terakhirnya masih ada di window dan window tidak mundur
+        if self.last_time is None or start == 0 or times[start - 1] != self.last_time or times[0] < self.first_time:
+            self._reset(); start = 0
+        if start < len(times): self._append(closed, start)
+        self.first_time = times[0]; self.last_time = times[-1]
+        # Candle eksplosif harus masih di dalam window, jadi base candle paling awal adalah bar ke-1
+        keep = self.time > times[0]
+        if not keep.all():
+            self.time, self.supply, self.high, self.low, self.min_low, self.max_high = (values[keep] for values in (self.time, self.supply, self.high, self.low, self.min_low, self.max_high))
+
+    def _append(self, closed, start):
+        opens, closes, highs, lows = closed['open'], closed['close'], closed['high'], closed['low']
+        new_lows, new_highs = lows[start:], highs[start:]
+        # Zona yang sudah ada: perbarui suffix min/max dengan bar tertutup baru
+        if len(self.time):
+            self.min_low = np.fmin(self.min_low, np.nanmin(new_lows)); self.max_high = np.fmax(self.max_high, np.nanmax(new_highs))
+        # Zona baru: base candle di bar baru (minimal bar ke-1 agar candle eksplosifnya ada)
+        first = max(start, 1)
+        if first >= len(closes): return
+        body = np.abs(closes - opens)
+        base_range = body[first:]; explosive_range = body[first - 1:-1]
+        explosive_open = opens[first - 1:-1]; explosive_close = closes[first - 1:-1]
+        candidate = (base_range > 0) & (explosive_range > base_range * self.explosive_mult)
+        index = np.flatnonzero(candidate) + first
+        suffix_low = np.fmin.accumulate(lows[first:][::-1])[::-1]; suffix_high = np.fmax.accumulate(highs[first:][::-1])[::-1]
+        self.time = np.concatenate([self.time, closed['time'][index]])
+        self.supply = np.concatenate([self.supply, (explosive_close < explosive_open)[index - first]])
+        self.high = np.concatenate([self.high, highs[index]]); self.low = np.concatenate([self.low, lows[index]])
+        self.min_low = np.concatenate([self.min_low, suffix_low[index - first]])
+        self.max_high = np.concatenate([self.max_high, suffix_high[index - first]])
+
+    def latest_untested(self, bars, tested_zones):
+        """(supply, demand) terbaru yang belum diuji sebagai dict {'high', 'low'}, atau None."""
+        min_low = np.fmin(self.min_low, bars['low'][-1]); max_high = np.fmax(self.max_high, bars['high'][-1])
+        untested = ~((min_low <= self.high) & (max_high >= self.low))
+        last_supply = last_demand = None
+        for index in np.flatnonzero(untested)[::-1]:
+            zone = (self.high[index], self.low[index])
+            if zone in tested_zones: continue
+            if self.supply[index]:
+                if last_supply is None: last_supply = {'high': zone[0], 'low': zone[1]}
+            elif last_demand is None: last_demand = {'high': zone[0], 'low': zone[1]}
+            if last_supply and last_demand: break
+        return last_supply, last_demand
+
+
 class Supply_Demand(Strategy):
     def __init__(self, symbol, volume):
         super().__init__(symbol, volume)
@@ -13,7 +88,8 @@ class Supply_Demand(Strategy):
         self.tp_mult = get_env_var('SUPPLY_DEMAND_TP_ATR_MULT', 3.0, float)
         self.atr_period = 14
         self.last_tested_zones = {} # Untuk melacak zona yang sudah diuji
-        logging.info(f"{self.symbol} [Supply_Demand]: Strategi aktif (lookback={self.lookback})")
+        self.zone_index = ZoneIndex(self.explosive_mult) # Zona kandidat, diperbarui per bar tertutup
+        logging.info("%s [Supply_Demand]: Strategi aktif (lookback=%s)", self.symbol, self.lookback)
 
     def check_signal(self, ohlc, tick):
         if len(ohlc) < self.lookback: return
@@ -21,48 +97,16 @@ class Supply_Demand(Strategy):
         atr_val = self._calculate_atr(ohlc).iloc[-1]
         if pd.isna(atr_val) or atr_val == 0: return
 
-        # 1. Cari zona Supply dan Demand yang paling baru dan belum diuji
-        last_supply = None
-        last_demand = None
-
-        # Iterasi dari candle terbaru ke belakang untuk menemukan zona
-        for i in range(2, len(ohlc) - 1):
-            base_candle = ohlc.iloc[-i]
-            explosive_candle = ohlc.iloc[-i-1] # Candle sebelum base_candle
-            
-            base_range = abs(base_candle['close'] - base_candle['open'])
-            explosive_range = abs(explosive_candle['close'] - explosive_candle['open'])
-
-            if base_range > 0 and explosive_range > (base_range * self.explosive_mult):
-                # Ditemukan pola base + explosive candle
-                
-                # Cek Supply Zone (Drop-Base-Drop atau Rally-Base-Drop)
-                if explosive_candle['close'] < explosive_candle['open']: # Candle eksplosif bearish
-                    zone_high = base_candle['high']
-                    zone_low = base_candle['low']
-                    
-                    # Jika belum ada supply zone atau zona ini lebih baru
-                    if last_supply is None and not self._was_zone_tested(zone_high, zone_low, ohlc.iloc[-i:]):
-                        last_supply = {'high': zone_high, 'low': zone_low}
-                        
-                # Cek Demand Zone (Rally-Base-Rally atau Drop-Base-Rally)
-                if explosive_candle['close'] > explosive_candle['open']: # Candle eksplosif bullish
-                    zone_high = base_candle['high']
-                    zone_low = base_candle['low']
-
-                    if last_demand is None and not self._was_zone_tested(zone_high, zone_low, ohlc.iloc[-i:]):
-                        last_demand = {'high': zone_high, 'low': zone_low}
-            
-            # Hentikan pencarian jika kedua zona sudah ditemukan
-            if last_supply and last_demand:
-                break
+        # 1. Zona Supply dan Demand yang paling baru dan belum diuji (dari indeks zona per simbol)
+        self.zone_index.update(ohlc)
+        last_supply, last_demand = self.zone_index.latest_untested(ohlc, self.last_tested_zones)
 
         # 2. Cek sinyal entry
-        last_close = ohlc['close'].iloc[-2]
+        last_close = ohlc['close'][-2]
 
         # Sinyal SELL: Harga masuk ke Supply Zone dari bawah
         if last_supply and (last_close <= last_supply['high']) and (last_close >= last_supply['low']):
-            logging.info(f"{self.symbol}: Sinyal Supply Zone terdeteksi. Zona: {last_supply['low']:.{self.digits}f}-{last_supply['high']:.{self.digits}f}")
+            logging.info("%s: Sinyal Supply Zone terdeteksi. Zona: %.*f-%.*f", self.symbol, self.digits, last_supply['low'], self.digits, last_supply['high'])
             sl_ideal = last_supply['high'] + (atr_val * self.sl_buffer_atr)
             tp_ideal = tick.bid - (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_SELL, tick, sl_ideal, tp_ideal)
@@ -72,24 +116,13 @@ class Supply_Demand(Strategy):
 
         # Sinyal BUY: Harga masuk ke Demand Zone dari atas
         if last_demand and (last_close <= last_demand['high']) and (last_close >= last_demand['low']):
-            logging.info(f"{self.symbol}: Sinyal Demand Zone terdeteksi. Zona: {last_demand['low']:.{self.digits}f}-{last_demand['high']:.{self.digits}f}")
+            logging.info("%s: Sinyal Demand Zone terdeteksi. Zona: %.*f-%.*f", self.symbol, self.digits, last_demand['low'], self.digits, last_demand['high'])
             sl_ideal = last_demand['low'] - (atr_val * self.sl_buffer_atr)
             tp_ideal = tick.ask + (atr_val * self.tp_mult)
             sl, tp = self._get_final_sl_tp(mt.ORDER_TYPE_BUY, tick, sl_ideal, tp_ideal)
             self._create_order(mt.ORDER_TYPE_BUY, tick.ask, sl, tp)
             self._mark_zone_as_tested(last_demand['high'], last_demand['low'])
             
-    def _was_zone_tested(self, zone_high, zone_low, future_candles):
-        """Cek apakah harga sudah kembali dan menyentuh zona ini."""
-        # Cek history internal
-        if (zone_high, zone_low) in self.last_tested_zones:
-            return True
-        # Cek candle setelah zona terbentuk
-        for index, candle in future_candles.iterrows():
-            if candle['low'] <= zone_high and candle['high'] >= zone_low:
-                return True
-        return False
-        
     def _mark_zone_as_tested(self, zone_high, zone_low):
         """Tandai zona agar tidak ditradingkan lagi."""
         self.last_tested_zones[(zone_high, zone_low)] = True
@@ -97,7 +130,11 @@ class Supply_Demand(Strategy):
         if len(self.last_tested_zones) > 50:
             self.last_tested_zones.pop(next(iter(self.last_tested_zones)))
 
-    def _calculate_atr(self, ohlc_df):
-        high, low, close = ohlc_df['high'], ohlc_df['low'], ohlc_df['close']
-        tr = pd.concat([(high - low), (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-        return tr.rolling(self.atr_period).mean()
\ No newline at end of file
+    # --- Versi vektor untuk backtest ---
+    def signals(self, ohlc, ask, bid):
+        # Zona dianggap sudah diuji oleh candle sejak base candle, termasuk base candle itu sendiri
+        # yang selalu menyentuh zonanya (lihat ZoneIndex), jadi latest_untested tidak pernah memberi
+        # zona dan check_signal tidak pernah mengirim order. Jika aturan zona diubah, fungsi ini
+        # harus ikut diubah (tests/test_engine_parity.py membandingkannya dengan engine per bar).
+        no_signal = np.zeros(len(ohlc), dtype=bool)
+        return self._signal_frame(ohlc, no_signal, no_signal, np.nan, np.nan, np.nan, np.nan)
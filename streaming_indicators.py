@@ -0,0 +1,249 @@
+"""
+Indikator streaming O(1) per bar untuk live loop.
+
+Setiap kelas menyimpan state-nya sendiri dan diperbarui dengan `update(...)` setiap
+kali satu bar close, tanpa menghitung ulang seluruh jendela. Algoritma rolling mean
+dan variance meniru implementasi rolling pandas (Kahan/Welford dengan add/remove)
+sehingga hasilnya sama dengan `indicators.FrameIndicators` (diuji oleh
+tests/test_streaming_indicators.py, termasuk warm-up dan data berisi NaN).
+"""
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+def _div(a, b):
+    # Pembagian dengan semantik float numpy (x/0 -> inf, 0/0 -> NaN)
+    if b == 0:
+        if a == 0 or a != a: return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _fmax(*values):
+    # Maksimum yang mengabaikan NaN seperti np.fmax (NaN hanya jika semua nilai NaN)
+    valid = [value for value in values if value == value]
+    return max(valid) if valid else NAN
+
+
+# ---------------------------
+# ROLLING DASAR
+# ---------------------------
+class StreamingSMA:
+    """Rolling mean dengan penjumlahan Kahan, sama seperti `Series.rolling(n).mean()`."""
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        # pandas memakai kompensasi Kahan terpisah untuk penambahan dan pengurangan
+        self.nobs = 0; self.sum_x = 0.0; self.comp_add = 0.0; self.comp_remove = 0.0; self.neg_ct = 0
+        self.same_count = 0; self.prev_value = NAN
+        self.value = NAN
+
+    def _add(self, val):
+        if val != val: return
+        self.nobs += 1
+        y = val - self.comp_add; t = self.sum_x + y
+        self.comp_add = t - self.sum_x - y; self.sum_x = t
+        if math.copysign(1.0, val) < 0: self.neg_ct += 1
+        if val == self.prev_value: self.same_count += 1
+        else: self.same_count = 1
+        self.prev_value = val
+
+    def _remove(self, val):
+        if val != val: return
+        self.nobs -= 1
+        y = -val - self.comp_remove; t = self.sum_x + y
+        self.comp_remove = t - self.sum_x - y; self.sum_x = t
+        if math.copysign(1.0, val) < 0: self.neg_ct -= 1
+
+    def update(self, val):
+        self.window.append(val)
+        if len(self.window) > self.period: self._remove(self.window.popleft())
+        self._add(val)
+        if self.nobs >= self.period and self.nobs > 0:
+            if self.same_count >= self.nobs: result = self.prev_value
+            else:
+                result = self.sum_x / self.nobs
+                if self.neg_ct == 0 and result < 0: result = 0.0
+                elif self.neg_ct == self.nobs and result > 0: result = 0.0
+        else:
+            result = NAN
+        self.value = result
+        return result
+
+
+class StreamingStd:
+    """Rolling std (ddof=1) dengan update Welford add/remove, sama seperti `rolling(n).std()`."""
+    def __init__(self, period, ddof=1):
+        self.period = period; self.ddof = ddof
+        self.window = deque()
+        self.nobs = 0; self.mean_x = 0.0; self.ssqdm_x = 0.0; self.comp_add = 0.0; self.comp_remove = 0.0
+        self.same_count = 0; self.prev_value = NAN
+        self.value = NAN
+
+    def _add(self, val):
+        if val != val: return
+        self.nobs += 1
+        if val == self.prev_value: self.same_count += 1
+        else: self.same_count = 1
+        self.prev_value = val
+        prev_mean = self.mean_x - self.comp_add
+        y = val - self.comp_add; t = y - self.mean_x
+        self.comp_add = t + self.mean_x - y
+        self.mean_x += t / self.nobs
+        self.ssqdm_x += (val - prev_mean) * (val - self.mean_x)
+
+    def _remove(self, val):
+        if val != val: return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean_x - self.comp_remove
+            y = val - self.comp_remove; t = y - self.mean_x
+            self.comp_remove = t + self.mean_x - y
+            self.mean_x -= t / self.nobs
+            self.ssqdm_x -= (val - prev_mean) * (val - self.mean_x)
+        else:
+            self.mean_x = 0.0; self.ssqdm_x = 0.0
+
+    def update(self, val):
+        self.window.append(val)
+        if len(self.window) > self.period: self._remove(self.window.popleft())
+        self._add(val)
+        if self.nobs >= self.period and self.nobs > self.ddof:
+            if self.same_count >= self.nobs or self.nobs == 1: var = 0.0
+            else: var = max(self.ssqdm_x / (self.nobs - self.ddof), 0.0)
+            result = math.sqrt(var)
+        else:
+            result = NAN
+        self.value = result
+        return result
+
+
+class _MonotonicExtreme:
+    """Rolling max/min dengan deque monoton (amortized O(1) per bar)."""
+    def __init__(self, period, is_max):
+        self.period = period; self.is_max = is_max
+        self.items = deque(); self.nan_index = deque(); self.index = -1
+        self.value = NAN
+
+    def update(self, val):
+        self.index += 1
+        items = self.items
+        while items and items[0][0] <= self.index - self.period: items.popleft()
+        while self.nan_index and self.nan_index[0] <= self.index - self.period: self.nan_index.popleft()
+        if val != val:
+            self.nan_index.append(self.index)
+        else:
+            if self.is_max:
+                while items and items[-1][1] <= val: items.pop()
+            else:
+                while items and items[-1][1] >= val: items.pop()
+            items.append((self.index, val))
+        # Seperti pandas (min_periods=period): NaN di dalam jendela -> hasil NaN
+        if self.index + 1 >= self.period and not self.nan_index:
+            self.value = items[0][1]
+        else:
+            self.value = NAN
+        return self.value
+
+
+class StreamingMax(_MonotonicExtreme):
+    def __init__(self, period): super().__init__(period, True)
+
+
+class StreamingMin(_MonotonicExtreme):
+    def __init__(self, period): super().__init__(period, False)
+
+
+# ---------------------------
+# INDIKATOR STRATEGI
+# ---------------------------
+class StreamingATR:
+    """ATR = SMA dari True Range, sama seperti `Strategy._calculate_atr`."""
+    def __init__(self, period):
+        self.sma = StreamingSMA(period); self.prev_close = NAN
+        self.value = NAN
+
+    def update(self, high, low, close):
+        tr = _fmax(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.value = self.sma.update(tr)
+        return self.value
+
+
+class StreamingRsiAverages:
+    """Rata-rata gain/loss (SMA) seperti Rsi_Oversold, plus nilai RSI."""
+    def __init__(self, period):
+        self.gain = StreamingSMA(period); self.loss = StreamingSMA(period)
+        self.prev_close = NAN
+
+    def update(self, close):
+        delta = close - self.prev_close if self.prev_close == self.prev_close else NAN
+        self.prev_close = close
+        self.gain.update(delta if delta > 0 else 0.0)
+        self.loss.update(-delta if delta < 0 else -0.0)
+        return self.gain.value, self.loss.value
+
+    @property
+    def rsi(self):
+        rs = _div(self.gain.value, self.loss.value)
+        return 100 - _div(100, 1 + rs)
+
+
+class StreamingStochastic:
+    """%K dan %D seperti Stochastic_Divergence."""
+    def __init__(self, k_period, d_period):
+        self.low_k = StreamingMin(k_period); self.high_k = StreamingMax(k_period)
+        self.d = StreamingSMA(d_period)
+        self.k = NAN
+
+    def update(self, high, low, close):
+        low_k = self.low_k.update(low); high_k = self.high_k.update(high)
+        self.k = 100 * _div(close - low_k, high_k - low_k)
+        self.d.update(self.k)
+        return self.k, self.d.value
+
+
+class StreamingBollinger:
+    """Middle/upper/lower band dan bandwidth."""
+    def __init__(self, period, std_dev):
+        self.std_dev = std_dev
+        self.sma = StreamingSMA(period); self.std = StreamingStd(period)
+        self.middle = self.upper = self.lower = self.bandwidth = NAN
+
+    def update(self, close):
+        self.middle = self.sma.update(close); std = self.std.update(close)
+        self.upper = self.middle + (std * self.std_dev)
+        self.lower = self.middle - (std * self.std_dev)
+        self.bandwidth = _div(self.upper - self.lower, self.middle)
+        return self.middle, self.upper, self.lower
+
+
+class StreamingIchimoku:
+    """Tenkan, kijun, senkou A/B (sudah digeser kijun bar) dan close kijun bar lalu untuk chikou."""
+    def __init__(self, tenkan_p, kijun_p, senkou_b_p):
+        self.kijun_p = kijun_p
+        self.tenkan_high = StreamingMax(tenkan_p); self.tenkan_low = StreamingMin(tenkan_p)
+        self.kijun_high = StreamingMax(kijun_p); self.kijun_low = StreamingMin(kijun_p)
+        self.senkou_b_high = StreamingMax(senkou_b_p); self.senkou_b_low = StreamingMin(senkou_b_p)
+        # Nilai kijun_p bar terakhir + nilai saat ini untuk pergeseran (shift)
+        self._span_a = deque(maxlen=kijun_p + 1); self._span_b = deque(maxlen=kijun_p + 1)
+        self._closes = deque(maxlen=kijun_p + 1)
+        self.tenkan = self.kijun = self.senkou_a = self.senkou_b = NAN
+
+    def update(self, high, low, close):
+        self.tenkan = (self.tenkan_high.update(high) + self.tenkan_low.update(low)) / 2
+        self.kijun = (self.kijun_high.update(high) + self.kijun_low.update(low)) / 2
+        self._span_a.append((self.tenkan + self.kijun) / 2)
+        self._span_b.append((self.senkou_b_high.update(high) + self.senkou_b_low.update(low)) / 2)
+        self._closes.append(close)
+        full = len(self._span_a) > self.kijun_p
+        self.senkou_a = self._span_a[0] if full else NAN
+        self.senkou_b = self._span_b[0] if full else NAN
+        return self.tenkan, self.kijun
+
+    @property
+    def lagged_close(self):
+        """Close kijun_p bar yang lalu (pembanding untuk chikou span)."""
+        return self._closes[0] if len(self._closes) > self.kijun_p else NAN
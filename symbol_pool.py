@@ -0,0 +1,80 @@
+"""
+Pool worker berukuran tetap untuk evaluasi simbol.
+
+Scheduler mengirim (simbol, waktu_close_bar, percobaan) ke `submit()`. Pool menjamin:
+- Satu simbol tidak pernah dievaluasi oleh dua thread sekaligus (state strategi per simbol aman).
+- Backpressure: tiap simbol paling banyak punya satu evaluasi yang menunggu. Request baru untuk
+  simbol yang masih menunggu hanya memperbarui request itu, jadi antrian tidak pernah lebih
+  panjang dari jumlah simbol walaupun pool tertinggal.
+- Fair: simbol dilayani FIFO; simbol yang diminta lagi saat sedang berjalan masuk ke belakang antrian.
+- Keterlambatan setiap evaluasi (mulai dievaluasi - waktu close bar) dicatat per simbol.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+
+class SymbolWorkerPool:
+    def __init__(self, workers, handler, clock=time.time):
+        self.workers = workers; self.handler = handler; self.clock = clock
+        self._cond = threading.Condition()
+        self._ready = deque() # simbol yang siap dievaluasi, urut FIFO
+        self._pending = {} # simbol -> (bar_close, attempt) terbaru
+        self._running = set()
+        self._lateness = {} # simbol -> [jumlah, total, maks]
+        self._threads = []
+        self.coalesced = 0
+
+    def start(self, stop_event):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"Pool-{i + 1}", args=(stop_event,), daemon=True)
+            self._threads.append(t); t.start()
+        return self._threads
+
+    def submit(self, symbol, bar_close, attempt=0):
+        with self._cond:
+            if symbol in self._pending:
+                self.coalesced += 1
+                if bar_close >= self._pending[symbol][0]: self._pending[symbol] = (bar_close, attempt)
+                return
+            self._pending[symbol] = (bar_close, attempt)
+            if symbol not in self._running:
+                self._ready.append(symbol); self._cond.notify()
+
+    def _run(self, stop_event):
+        while not stop_event.is_set():
+            with self._cond:
+                if not self._ready: self._cond.wait(timeout=1.0); continue
+                symbol = self._ready.popleft()
+                bar_close, attempt = self._pending.pop(symbol)
+                self._running.add(symbol)
+                stats = self._lateness.setdefault(symbol, [0, 0.0, 0.0])
+                late = self.clock() - bar_close
+                stats[0] += 1; stats[1] += late; stats[2] = max(stats[2], late)
+            try:
+                self.handler(symbol, bar_close, attempt)
+            except Exception as e:
+                logging.exception(f"[{symbol}] Error di worker pool: {e}")
+            finally:
+                with self._cond:
+                    self._running.discard(symbol)
+                    if symbol in self._pending: self._ready.append(symbol); self._cond.notify()
+
+    def queue_depth(self):
+        with self._cond: return len(self._ready)
+
+    def lateness(self):
+        """simbol -> (jumlah evaluasi, rata-rata, maks) keterlambatan terhadap close bar, dalam detik."""
+        with self._cond: return {symbol: (count, total / count, worst) for symbol, (count, total, worst) in self._lateness.items() if count}
+
+    def format_lateness(self, top=10):
+        lateness = self.lateness()
+        if not lateness: return "Keterlambatan Evaluasi: belum ada evaluasi."
+        report_str = "\n" + "="*58 + "\n" + " " * 10 + "KETERLAMBATAN EVALUASI (vs CLOSE BAR)" + "\n" + "="*58 + "\n"
+        report_str += f"| Worker: {self.workers} | Antrian: {self.queue_depth()} | Digabung: {self.coalesced}\n" + "-"*58 + "\n"
+        report_str += f"| {'Simbol':<12}|{'Evaluasi':>10}|{'Rata2 (ms)':>14}|{'Maks (ms)':>14}\n"
+        for symbol, (count, avg, worst) in sorted(lateness.items(), key=lambda item: item[1][2], reverse=True)[:top]:
+            report_str += f"| {symbol:<12}|{count:>10}|{avg * 1000:>14.1f}|{worst * 1000:>14.1f}\n"
+        report_str += "="*58 + "\n"
+        return report_str
@@ -0,0 +1,123 @@
+"""
+Cache spesifikasi simbol (digits, point, tick size, stops level, contract size) untuk seluruh proses.
+
+Semua instance strategi untuk satu simbol berbagi satu SymbolSpec. Nilai Decimal yang dipakai
+_get_final_sl_tp (tick size, point, jarak stop minimum) dihitung sekali saat spec dibuat, bukan
+di setiap order.
+
+Sumber data adalah sebuah *loader*: fungsi tanpa argumen yang mengembalikan dict simbol -> SymbolSpec.
+- Live: satu panggilan bulk mt.symbols_get() untuk semua simbol (lihat main.py).
+- Backtest: tabel statis (BACKTEST_SPECS), dengan fallback 'DEFAULT' untuk simbol yang tidak terdaftar.
+
+Hasil loader disimpan ke file JSON (`path`), jadi start berikutnya langsung memakai file itu selama
+umurnya belum melewati `ttl`. Setelah TTL habis, spec dimuat ulang dari loader saat diminta.
+"""
+from decimal import Decimal
+import json
+import logging
+import os
+import threading
+import time
+
+SPEC_FIELDS = ('digits', 'point', 'trade_tick_size', 'trade_stops_level', 'contract_size')
+
+
+class SymbolSpec:
+    __slots__ = SPEC_FIELDS + ('tick_size_decimal', 'point_decimal', 'min_stop_distance')
+
+    def __init__(self, digits, point, trade_tick_size, trade_stops_level, contract_size):
+        self.digits = int(digits); self.point = float(point); self.trade_tick_size = float(trade_tick_size)
+        self.trade_stops_level = int(trade_stops_level); self.contract_size = float(contract_size)
+        self.tick_size_decimal = Decimal(str(self.trade_tick_size)); self.point_decimal = Decimal(str(self.point))
+        self.min_stop_distance = Decimal(str(self.trade_stops_level)) * self.point_decimal
+
+    @classmethod
+    def from_info(cls, info):
+        """Dari SymbolInfo MT5."""
+        return cls(info.digits, info.point, info.trade_tick_size, info.trade_stops_level, info.trade_contract_size)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data[field] for field in SPEC_FIELDS))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in SPEC_FIELDS}
+
+    def __reduce__(self):
+        # Dikirim ke proses evaluator sebagai dict; nilai Decimal dihitung ulang di sana
+        return (SymbolSpec.from_dict, (self.to_dict(),))
+
+
+# Spesifikasi backtest (sebelumnya Backtester.symbol_info_db)
+BACKTEST_SPECS = {
+    'DEFAULT':  {'digits': 5, 'point': 0.00001, 'trade_tick_size': 0.00001, 'trade_stops_level': 0, 'contract_size': 100000},
+    'XAUUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 100}, # 100 troy ounces
+    'BTCUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 1},     # 1 Bitcoin
+    'ETHUSD':   {'digits': 2, 'point': 0.01,    'trade_tick_size': 0.01,    'trade_stops_level': 0, 'contract_size': 1},     # 1 Ether
+    'USDJPY':   {'digits': 3, 'point': 0.001,   'trade_tick_size': 0.001,   'trade_stops_level': 0, 'contract_size': 100000},
+    'XAUJPY':   {'digits': 3, 'point': 0.001,   'trade_tick_size': 0.001,   'trade_stops_level': 0, 'contract_size': 100},
+}
+
+def static_loader(table):
+    """Loader dari tabel dict simbol -> field (mis. BACKTEST_SPECS)."""
+    return lambda: {symbol: SymbolSpec.from_dict(data) for symbol, data in table.items()}
+
+
+class SymbolSpecCache:
+    def __init__(self, loader=None, path=None, ttl=24 * 3600, clock=time.time):
+        self._lock = threading.Lock()
+        self._specs = {}
+        self._loaded = None # Waktu (clock) data spec diambil dari loader; None = belum dimuat
+        self._missing_retry = {} # simbol tidak dikenal -> waktu terakhir loader dicoba untuknya
+        self.configure(loader, path, ttl, clock)
+
+    def configure(self, loader, path=None, ttl=24 * 3600, clock=time.time):
+        """Ganti sumber spec (live: symbols_get, backtest: tabel statis); cache lama dibuang."""
+        with self._lock:
+            self.loader = loader; self.path = path; self.ttl = ttl; self.clock = clock
+            self._specs = {}; self._loaded = None; self._missing_retry = {}
+
+    def get(self, symbol):
+        """SymbolSpec untuk simbol (atau 'DEFAULT' jika ada), None jika tidak dikenal / belum ada loader."""
+        with self._lock:
+            if self._loaded is None: self._load_file()
+            if self._loaded is None or self.clock() - self._loaded > self.ttl: self._refresh()
+            elif symbol not in self._specs and self.clock() - self._missing_retry.get(symbol, float('-inf')) > 60:
+                # Simbol baru sejak spec terakhir dimuat (dicoba ulang paling sering tiap menit)
+                self._missing_retry[symbol] = self.clock(); self._refresh()
+            return self._specs.get(symbol, self._specs.get('DEFAULT'))
+
+    def _refresh(self):
+        if self.loader is None: return
+        try: specs = self.loader()
+        except Exception as e: logging.error(f"Gagal memuat spesifikasi simbol: {e}"); specs = None
+        if not specs:
+            # Pertahankan spec lama; coba lagi setelah TTL berikutnya
+            if self._specs: self._loaded = self.clock()
+            return
+        self._specs = specs; self._loaded = self.clock()
+        logging.info(f"Spesifikasi {len(specs)} simbol dimuat.")
+        self._save_file()
+
+    def _load_file(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            with open(self.path) as f: data = json.load(f)
+            specs = {symbol: SymbolSpec.from_dict(spec) for symbol, spec in data['specs'].items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"File spesifikasi simbol {self.path} tidak valid, dimuat ulang: {e}"); return
+        self._specs = specs
+        # Umur file dihitung dari waktu simpan (epoch); clock bisa monotonic, jadi dikonversi lewat selisih
+        self._loaded = self.clock() - max(0.0, time.time() - data.get('saved', 0))
+
+    def _save_file(self):
+        if not self.path: return
+        try:
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump({'saved': time.time(), 'specs': {symbol: spec.to_dict() for symbol, spec in self._specs.items()}}, f)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e: logging.warning(f"Gagal menyimpan spesifikasi simbol ke {self.path}: {e}")
+
+
+# Cache bersama untuk proses ini; sumbernya diatur main.py (live) atau backtest.py
+SYMBOL_SPECS = SymbolSpecCache()
@@ -0,0 +1,73 @@
+"""
+Paritas engine backtest: engine "vector" (signals() + fallback per bar) harus menghasilkan trade yang
+sama persis dengan engine "bar" (check_signal per bar) pada data OHLC yang sama, dan trailing window
+(WINDOW_BARS) harus sama dengan history penuh (loop lama).
+
+    python -m pytest tests
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import Backtester, WINDOW_BARS
+from log_pipeline import suppressed
+
+COLUMNS = ['symbol', 'type', 'open_price', 'close_price', 'sl', 'tp', 'open_time', 'close_time', 'reason', 'comment']
+
+
+def generated_ohlc(bars=1500, seed=7):
+    """Random walk M1 dengan regime tren & volatilitas bergantian agar berbagai strategi terpicu."""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.00004, bars // 100 + 1), 100)[:bars]
+    volatility = np.repeat(rng.uniform(0.00005, 0.0004, bars // 150 + 1), 150)[:bars]
+    close = 1.1 + np.cumsum(drift + rng.normal(0, 1, bars) * volatility)
+    open_ = np.append(1.1, close[:-1]) + rng.normal(0, 0.2, bars) * volatility
+    high = np.maximum(open_, close) + rng.exponential(0.5, bars) * volatility
+    low = np.minimum(open_, close) - rng.exponential(0.5, bars) * volatility
+    return pd.DataFrame({'time': pd.date_range('2024-01-01', periods=bars, freq='min'), 'open': open_.round(5), 'high': high.round(5),
+                         'low': low.round(5), 'close': close.round(5), 'tick_volume': rng.integers(50, 500, bars)})
+
+
+def replay(df, engine, window=WINDOW_BARS, check_calls=None):
+    backtester = Backtester(None, None, quiet=True); backtester.show_progress = False
+    strategies, sim_info = backtester._setup_strategies('EURUSD')
+    if check_calls is not None: count_check_signal(strategies, check_calls)
+    with suppressed(): backtester._simulate('EURUSD', df, strategies, sim_info, window, engine)
+    return pd.DataFrame(backtester.trade_history, columns=COLUMNS)
+
+
+def test_vector_engine_matches_bar_engine():
+    df = generated_ohlc()
+    bar_trades = replay(df, 'bar'); vector_trades = replay(df, 'vector')
+    assert len(bar_trades) > 0 # Data uji harus benar-benar memicu trade
+    pd.testing.assert_frame_equal(vector_trades, bar_trades)
+
+
+def test_trailing_window_matches_full_history():
+    df = generated_ohlc()
+    full_trades = replay(df, 'bar', window=0)
+    assert len(full_trades) > 0
+    pd.testing.assert_frame_equal(replay(df, 'bar'), full_trades)
+    pd.testing.assert_frame_equal(replay(df, 'vector', window=0), full_trades)
+
+
+def count_check_signal(strategies, calls):
+    """Bungkus check_signal setiap strategi agar jumlah pemanggilannya tercatat di `calls`."""
+    for strategy in strategies:
+        def counted(ohlc, tick, check_signal=strategy.check_signal, name=strategy.__class__.__name__):
+            calls[name] = calls.get(name, 0) + 1; return check_signal(ohlc, tick)
+        strategy.check_signal = counted
+
+
+def test_vector_engine_skips_bars_without_signal():
+    # Semua strategi punya signals(), jadi engine vector tidak memanggil check_signal sama sekali dan
+    # hanya mengunjungi bar yang punya sinyal; harus jauh lebih cepat daripada engine per bar.
+    df = generated_ohlc(3000); calls = {}
+    replay(df, 'vector', check_calls=calls)
+    assert calls == {}
+    elapsed = {}
+    for engine in ('bar', 'vector', 'bar', 'vector'):
+        started = time.perf_counter(); replay(df, engine)
+        elapsed[engine] = min(elapsed.get(engine, float('inf')), time.perf_counter() - started)
+    assert elapsed['vector'] * 5 < elapsed['bar']
@@ -0,0 +1,64 @@
+"""
+find_exit (pencarian SL/TP per chunk NumPy) harus memberi bar, harga dan alasan penutupan yang sama
+dengan pengecekan per bar lama (_check_close_conditions sebelum find_exit).
+"""
+import numpy as np
+import pytest
+
+from backtest import find_exit
+
+BUY, SELL = 0, 1
+
+
+def baseline_exit(high, low, start, order_type, sl, tp):
+    """Loop per bar lama: SL dicek lebih dulu daripada TP di setiap bar."""
+    for i in range(start, len(high)):
+        if order_type == BUY:
+            if low[i] <= sl: return i, sl, "SL"
+            elif high[i] >= tp: return i, tp, "TP"
+        else:
+            if high[i] >= sl: return i, sl, "SL"
+            elif low[i] <= tp: return i, tp, "TP"
+    return None
+
+
+def random_walk(bars, seed):
+    rng = np.random.default_rng(seed); close = 1.1 + np.cumsum(rng.normal(0, 0.0003, bars))
+    return close + rng.random(bars) * 0.0005, close - rng.random(bars) * 0.0005
+
+
+@pytest.mark.parametrize('order_type', [BUY, SELL])
+@pytest.mark.parametrize('seed', range(10))
+def test_matches_per_bar_loop_on_random_walk(order_type, seed):
+    high, low = random_walk(5000, seed); rng = np.random.default_rng(seed + 100)
+    for _ in range(200):
+        start = int(rng.integers(0, len(high))); entry = (high[start] + low[start]) / 2
+        # Jarak SL/TP dari sangat dekat (bar yang sama) sampai sangat jauh (tidak tersentuh sampai akhir data)
+        sl_distance, tp_distance = rng.choice([0.0002, 0.002, 0.01, 0.2], 2)
+        sl, tp = (entry - sl_distance, entry + tp_distance) if order_type == BUY else (entry + sl_distance, entry - tp_distance)
+        assert find_exit(high, low, start, order_type, sl, tp) == baseline_exit(high, low, start, order_type, sl, tp)
+
+
+@pytest.mark.parametrize('order_type, sl, tp', [(BUY, 1.0990, 1.1010), (SELL, 1.1010, 1.0990)])
+def test_sl_has_priority_when_both_hit_on_same_bar(order_type, sl, tp):
+    high = np.array([1.1005, 1.1020]); low = np.array([1.0995, 1.0980])
+    assert find_exit(high, low, 0, order_type, sl, tp) == (1, sl, "SL")
+
+
+@pytest.mark.parametrize('order_type', [BUY, SELL])
+@pytest.mark.parametrize('hit_at', [255, 256, 257, 256 + 512 - 1, 256 + 512, 256 + 512 + 1])
+def test_exit_across_chunk_boundaries(order_type, hit_at):
+    # Chunk pertama 256 bar, lalu 512, 1024, ...: exit tepat sebelum, di, dan sesudah batas chunk
+    high = np.full(3000, 1.1005); low = np.full(3000, 1.0995)
+    if order_type == BUY: high[hit_at] = 1.1020; sl, tp = 1.0980, 1.1010
+    else: low[hit_at] = 1.0980; sl, tp = 1.1020, 1.0990
+    expected = (hit_at, tp, "TP")
+    assert find_exit(high, low, 0, order_type, sl, tp) == expected == baseline_exit(high, low, 0, order_type, sl, tp)
+    assert find_exit(high, low, 10, order_type, sl, tp, chunk=7) == expected
+
+
+@pytest.mark.parametrize('order_type, sl, tp', [(BUY, 1.0980, 1.1020), (SELL, 1.1020, 1.0980)])
+def test_no_exit_before_end_of_data(order_type, sl, tp):
+    high = np.full(1000, 1.1005); low = np.full(1000, 1.0995)
+    assert find_exit(high, low, 0, order_type, sl, tp) is None
+    assert find_exit(high, low, len(high), order_type, sl, tp) is None
@@ -0,0 +1,100 @@
+"""
+MT5Gateway dengan modul MT5 palsu: urutan prioritas, penggabungan request identik, Future yang
+terselesaikan, dan exception yang diteruskan ke pemanggil.
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from mt5_gateway import MT5Gateway, PRIORITY_DATA, PRIORITY_HISTORY, PRIORITY_MARKET, PRIORITY_ORDER
+
+TIMEOUT = 5
+
+
+def fake_mt5():
+    """Namespace pengganti MetaTrader5 yang mencatat urutan panggilan; busy() menahan thread gateway."""
+    calls = []; release = threading.Event(); entered = threading.Event()
+    def record(name, result=None):
+        def call(*args, **kwargs): calls.append((name,) + args); return result if result is not None else (name,) + args
+        return call
+    def busy():
+        entered.set(); release.wait(TIMEOUT); calls.append(('busy',))
+    def order_send(request):
+        calls.append(('order_send', request))
+        if request.get('volume', 0) <= 0: raise ValueError("volume tidak valid")
+        return SimpleNamespace(retcode=10009, request=request)
+    return SimpleNamespace(calls=calls, release=release, entered=entered, busy=busy, order_send=order_send,
+                           positions_get=record('positions_get', ()), symbol_info_tick=record('symbol_info_tick'),
+                           copy_rates_from_pos=record('copy_rates_from_pos'), history_deals_get=record('history_deals_get', ()))
+
+
+@pytest.fixture
+def gateway():
+    gateway = MT5Gateway(); gateway.start(); yield gateway; gateway.stop(TIMEOUT)
+
+
+def block(gateway, mt):
+    """Tahan thread gateway di panggilan busy() agar request berikutnya menumpuk di antrian."""
+    future = gateway.submit('busy', mt.busy, priority=PRIORITY_ORDER)
+    assert mt.entered.wait(TIMEOUT)
+    return future
+
+
+def test_queued_requests_run_in_priority_order(gateway):
+    mt = fake_mt5(); blocker = block(gateway, mt)
+    futures = [gateway.submit('history_deals_get', mt.history_deals_get, 1, priority=PRIORITY_HISTORY),
+               gateway.submit('copy_rates', mt.copy_rates_from_pos, 'EURUSD', 1, 0, 200, priority=PRIORITY_DATA),
+               gateway.submit('symbol_info_tick', mt.symbol_info_tick, 'EURUSD', priority=PRIORITY_MARKET),
+               gateway.submit('copy_rates', mt.copy_rates_from_pos, 'GBPUSD', 1, 0, 200, priority=PRIORITY_DATA),
+               gateway.submit('order_send', mt.order_send, {'volume': 0.01}, priority=PRIORITY_ORDER)]
+    mt.release.set(); blocker.result(TIMEOUT)
+    for future in futures: future.result(TIMEOUT)
+    # Order dulu, lalu tick, data (FIFO dalam prioritas yang sama), terakhir history
+    assert [call[:2] for call in mt.calls] == [('busy',), ('order_send', {'volume': 0.01}), ('symbol_info_tick', 'EURUSD'),
+                                               ('copy_rates_from_pos', 'EURUSD'), ('copy_rates_from_pos', 'GBPUSD'), ('history_deals_get', 1)]
+
+
+def test_identical_pending_requests_are_coalesced(gateway):
+    mt = fake_mt5(); blocker = block(gateway, mt)
+    futures = [gateway.submit('positions_get', mt.positions_get, priority=PRIORITY_MARKET, coalesce=True, group='*USD*') for _ in range(5)]
+    other = gateway.submit('positions_get', mt.positions_get, priority=PRIORITY_MARKET, coalesce=True, group='*JPY*')
+    assert all(future is futures[0] for future in futures) and other is not futures[0]
+    mt.release.set(); blocker.result(TIMEOUT)
+    assert futures[0].result(TIMEOUT) == () and other.result(TIMEOUT) == ()
+    assert mt.calls.count(('positions_get',)) == 2
+    assert gateway.metrics()['positions_get']['calls'] == 2 and gateway.metrics()['positions_get']['coalesced'] == 4
+    # Setelah dieksekusi, request yang sama adalah panggilan baru (data baru), bukan hasil lama
+    assert gateway.submit('positions_get', mt.positions_get, priority=PRIORITY_MARKET, coalesce=True, group='*USD*') is not futures[0]
+
+
+def test_futures_resolve_with_results_from_many_threads(gateway):
+    mt = fake_mt5(); results = {}
+    def worker(symbol): results[symbol] = gateway.call('symbol_info_tick', mt.symbol_info_tick, symbol, priority=PRIORITY_MARKET, coalesce=True)
+    threads = [threading.Thread(target=worker, args=(f"SYM{i}",)) for i in range(20)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join(TIMEOUT)
+    assert results == {f"SYM{i}": ('symbol_info_tick', f"SYM{i}") for i in range(20)}
+    assert gateway.metrics()['symbol_info_tick']['calls'] == 20
+
+
+def test_exceptions_propagate_and_gateway_keeps_running(gateway):
+    mt = fake_mt5()
+    with pytest.raises(ValueError, match="volume tidak valid"):
+        gateway.call('order_send', mt.order_send, {'volume': 0}, priority=PRIORITY_ORDER)
+    assert gateway.running
+    assert gateway.call('order_send', mt.order_send, {'volume': 0.01}, priority=PRIORITY_ORDER).retcode == 10009
+    assert gateway.metrics()['order_send']['calls'] == 2
+
+
+def test_inline_before_start_and_queued_requests_finish_on_stop():
+    mt = fake_mt5(); gateway = MT5Gateway()
+    # Belum start (backtest): dieksekusi langsung di thread pemanggil
+    assert gateway.call('symbol_info_tick', mt.symbol_info_tick, 'EURUSD') == ('symbol_info_tick', 'EURUSD')
+    gateway.start(); blocker = block(gateway, mt)
+    queued = gateway.submit('copy_rates', mt.copy_rates_from_pos, 'EURUSD', 1, 0, 10)
+    stopper = threading.Thread(target=gateway.stop, args=(TIMEOUT,)); stopper.start()
+    mt.release.set(); stopper.join(TIMEOUT); blocker.result(TIMEOUT)
+    assert queued.result(TIMEOUT) == ('copy_rates_from_pos', 'EURUSD', 1, 0, 10)
+    assert not gateway.running
+    assert gateway.call('symbol_info_tick', mt.symbol_info_tick, 'GBPUSD') == ('symbol_info_tick', 'GBPUSD')
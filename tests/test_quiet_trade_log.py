@@ -0,0 +1,37 @@
+"""
+Mode senyap backtest: log per trade tidak diformat selama simulasi; TradeLog (dari trade_history)
+menghasilkan baris yang sama persis dengan log per trade mode biasa, dan hanya saat level DEBUG.
+"""
+import logging
+
+from backtest import Backtester, TradeLog
+from test_engine_parity import generated_ohlc
+
+
+def run_symbol(df, quiet):
+    backtester = Backtester(None, None, quiet=quiet); backtester.show_progress = False
+    backtester._load_data = lambda csv_file: df
+    backtester.run_symbol('EURUSD_M1.csv', engine='vector')
+    return backtester
+
+
+def trade_lines(records):
+    return [record.getMessage() for record in records if record.getMessage().startswith('Posisi ')]
+
+
+def test_quiet_trade_log_matches_eager_log(caplog):
+    df = generated_ohlc()
+    with caplog.at_level(logging.DEBUG):
+        run_symbol(df, quiet=False); eager = trade_lines(caplog.records); caplog.clear()
+        run_symbol(df, quiet=True)
+    assert eager and trade_lines(caplog.records) == [] # Tidak ada log per trade selama simulasi senyap
+    deferred = [record for record in caplog.records if record.levelno == logging.DEBUG and isinstance(record.args[-1], TradeLog)]
+    assert len(deferred) == 1 and str(deferred[0].args[-1]).split('\n') == eager
+
+
+def test_quiet_trade_log_is_not_formatted_at_info_level(caplog, monkeypatch):
+    formatted = []
+    monkeypatch.setattr(TradeLog, 'lines', lambda self: formatted.append(self) or iter(()))
+    with caplog.at_level(logging.INFO):
+        backtester = run_symbol(generated_ohlc(), quiet=True)
+    assert backtester.trade_history and formatted == []
@@ -0,0 +1,57 @@
+"""
+SparseTable dan MonotonicWindow harus sama persis dengan rolling max/min pandas, termasuk window
+sepanjang 1 dan sepanjang seluruh data, serta nilai kembar (ties).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from range_index import MonotonicWindow, SparseTable
+
+BARS = 600
+
+
+def random_values(seed, ties):
+    rng = np.random.default_rng(seed); values = 1.1 + np.cumsum(rng.normal(0, 0.0003, BARS))
+    # Dibulatkan kasar agar banyak nilai kembar di dalam satu window
+    return values.round(3) if ties else values
+
+
+def rolling(values, op, length):
+    window = pd.Series(values).rolling(length)
+    return (window.max() if op == 'max' else window.min()).to_numpy()
+
+
+@pytest.mark.parametrize('ties', [False, True])
+@pytest.mark.parametrize('op', ['max', 'min'])
+@pytest.mark.parametrize('length', [1, 2, 3, 7, 64, 100, BARS - 1, BARS])
+def test_sparse_table_matches_pandas_rolling(length, op, ties):
+    values = random_values(length, ties); table = SparseTable(values, op)
+    expected = rolling(values, op, length)[length - 1:]
+    np.testing.assert_array_equal(table.query_window(length, np.arange(BARS - length + 1)), expected)
+    np.testing.assert_array_equal([table.query(start, start + length) for start in range(BARS - length + 1)], expected)
+
+
+@pytest.mark.parametrize('ties', [False, True])
+@pytest.mark.parametrize('op', ['max', 'min'])
+@pytest.mark.parametrize('length', [1, 2, 7, 64, BARS])
+def test_monotonic_window_matches_pandas_rolling(length, op, ties):
+    values = random_values(length + 1, ties); times = np.arange(BARS, dtype=np.int64) * 60
+    expected = rolling(values, op, length); window = MonotonicWindow(length, op)
+    rng = np.random.default_rng(length); stop = length
+    while stop <= BARS:
+        assert window.advance(times, values, stop) == expected[stop - 1]
+        # Maju satu bar (stream normal) atau melompat (celah, window diisi ulang)
+        stop += int(rng.choice([1, 1, 1, 2, length + 5]))
+
+
+@pytest.mark.parametrize('op', ['max', 'min'])
+@pytest.mark.parametrize('length, offset', [(1, 1), (20, 1), (20, 5), (199, 1)])
+def test_monotonic_window_on_sliding_live_buffer(length, offset, op):
+    # Seperti StreamExtremes: buffer 200 bar terakhir bergeser, window berakhir `offset` bar sebelum ujung buffer
+    values = random_values(3, ties=True); times = np.arange(BARS, dtype=np.int64) * 60
+    expected = rolling(values, op, length); window = MonotonicWindow(length, op)
+    for end in range(200, BARS + 1):
+        buffer_times, buffer_values = times[end - 200:end], values[end - 200:end]
+        stop = len(buffer_times) - offset
+        assert window.advance(buffer_times, buffer_values, stop) == expected[end - 200 + stop - 1]
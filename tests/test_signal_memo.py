@@ -0,0 +1,55 @@
+"""
+SignalMemo: strategi hanya dievaluasi ulang saat bar tertutup berganti atau spread pindah bucket.
+"""
+from types import SimpleNamespace
+
+from signal_memo import SignalMemo
+
+POINT = 0.00001
+
+
+def tick(spread_points):
+    return SimpleNamespace(ask=1.1 + spread_points * POINT, bid=1.1)
+
+
+def test_same_bar_and_bucket_is_a_memo_hit():
+    memo = SignalMemo(5); key = memo.key(1000, tick(2), POINT)
+    assert memo.pending('EURUSD', [0, 1, 2], key) == [0, 1, 2]
+    assert memo.pending('EURUSD', [0, 1, 2], memo.key(1000, tick(4), POINT)) == [] # Bucket sama (0-4 point)
+    assert (memo.evaluated, memo.strategy_hits, memo.bar_dedupe) == (3, 3, 1)
+
+
+def test_new_closed_bar_invalidates():
+    memo = SignalMemo(5)
+    memo.pending('EURUSD', [0, 1], memo.key(1000, tick(2), POINT))
+    assert memo.pending('EURUSD', [0, 1], memo.key(1060, tick(2), POINT)) == [0, 1]
+    assert memo.bar_dedupe == 0
+
+
+def test_spread_bucket_change_invalidates():
+    memo = SignalMemo(5)
+    memo.pending('EURUSD', [0, 1], memo.key(1000, tick(4), POINT))
+    assert memo.pending('EURUSD', [0, 1], memo.key(1000, tick(6), POINT)) == [0, 1]
+    # Kembali ke bucket lama juga dievaluasi ulang: hanya key terakhir yang diingat
+    assert memo.pending('EURUSD', [0, 1], memo.key(1000, tick(3), POINT)) == [0, 1]
+
+
+def test_memo_is_per_symbol_and_strategy():
+    memo = SignalMemo(5); key = memo.key(1000, tick(2), POINT)
+    memo.pending('EURUSD', [0], key)
+    assert memo.pending('EURUSD', [0, 1], key) == [1] # Strategi 1 belum pernah dievaluasi untuk key ini
+    assert memo.pending('GBPUSD', [0, 1], key) == [0, 1]
+    assert memo.pending('EURUSD', [], key) == [] and memo.bar_dedupe == 0 # Tanpa strategi terpilih bukan dedupe
+
+
+def test_spread_buckets_disabled_or_unknown_point():
+    memo = SignalMemo(0)
+    assert memo.key(1000, tick(2), POINT) == memo.key(1000, tick(200), POINT) == (1000, 0)
+    assert SignalMemo(5).key(1000, tick(200), None) == (1000, 0)
+    assert SignalMemo(5).key(1000, tick(12), POINT) == (1000, 2)
+
+
+def test_format_stats():
+    memo = SignalMemo(5); key = memo.key(1000, tick(2), POINT)
+    memo.pending('EURUSD', [0, 1], key); memo.pending('EURUSD', [0, 1], key)
+    assert memo.format_stats() == "Memo Sinyal: 2 evaluasi strategi dijalankan, 2 dilewati memo (50.0%), 1 evaluasi simbol tanpa bar tertutup baru."
@@ -0,0 +1,67 @@
+"""
+Magic number strategi (crc32 nama strategi) harus unik, bentrokan harus ditolak saat impor, dan
+posisi/deal lama tanpa magic (magic 0, komentar "BotV...") tetap dihitung sebagai milik bot.
+"""
+from types import SimpleNamespace
+import zlib
+
+import pytest
+
+import main
+from mt5_gateway import MT5Gateway
+from strategies import MAGIC_BASE, MAGIC_STRATEGY, STRATEGY_MAGIC, STRATEGY_MANIFEST, build_magic_tables, is_bot_position
+
+
+def position(magic, comment, symbol='EURUSD'):
+    return SimpleNamespace(magic=magic, comment=comment, symbol=symbol)
+
+
+def test_magic_numbers_are_unique_and_stable():
+    assert set(STRATEGY_MAGIC) == set(STRATEGY_MANIFEST)
+    assert len(set(STRATEGY_MAGIC.values())) == len(STRATEGY_MANIFEST)
+    for key, magic in STRATEGY_MAGIC.items():
+        assert magic == MAGIC_BASE + zlib.crc32(key.encode()) % 10000
+        assert MAGIC_STRATEGY[magic] == STRATEGY_MANIFEST[key][1]
+    # Urutan manifest tidak mempengaruhi magic
+    reversed_manifest = dict(reversed(list(STRATEGY_MANIFEST.items())))
+    assert build_magic_tables(reversed_manifest, MAGIC_BASE)[1] == STRATEGY_MAGIC
+
+
+def test_crc32_collision_is_rejected():
+    # crc32('strategy_60') % 10000 == crc32('strategy_95') % 10000
+    manifest = {'strategy_60': ('a', 'StrategyA'), 'strategy_95': ('b', 'StrategyB')}
+    with pytest.raises(RuntimeError, match="bentrok: StrategyA dan StrategyB"):
+        build_magic_tables(manifest, MAGIC_BASE)
+
+
+def test_bot_positions_include_legacy_magic_zero():
+    magic = STRATEGY_MAGIC['breakout']
+    assert is_bot_position(position(magic, "BotV2.7 Breakout"))
+    assert is_bot_position(position(magic, "")) # Komentar bisa dipotong/diubah broker
+    assert is_bot_position(position(0, "BotV2.6 Fakeout")) # Dibuka sebelum magic dipakai
+    assert not is_bot_position(position(0, "manual"))
+    assert not is_bot_position(position(123456, "BotV2.7 Breakout")) # EA lain dengan magic sendiri
+
+
+def test_positions_get_bot_counts_legacy_positions(monkeypatch):
+    positions = (position(STRATEGY_MAGIC['fakeout'], "BotV2.7 Fakeout"), position(0, "BotV2.5 Rsi_Oversold", 'GBPUSD'),
+                 position(0, "", 'USDJPY'), position(999, "grid EA"))
+    monkeypatch.setattr(main, 'mt', SimpleNamespace(positions_get=lambda **kwargs: positions))
+    monkeypatch.setattr(main, 'GATEWAY', MT5Gateway()) # Belum start: dieksekusi langsung
+    assert main.positions_get_bot() == list(positions[:2])
+
+
+def test_reporter_counts_magic_and_legacy_deals(monkeypatch):
+    out = 1
+    deals = (SimpleNamespace(ticket=1, time=100, symbol='EURUSD', entry=out, magic=STRATEGY_MAGIC['breakout'], comment="", profit=5.0),
+             SimpleNamespace(ticket=2, time=110, symbol='EURUSD', entry=out, magic=0, comment="BotV2.5 Fakeout", profit=-2.0),
+             SimpleNamespace(ticket=3, time=120, symbol='EURUSD', entry=out, magic=0, comment="BotV2.5", profit=1.0),
+             SimpleNamespace(ticket=4, time=130, symbol='EURUSD', entry=out, magic=0, comment="manual", profit=50.0),
+             SimpleNamespace(ticket=5, time=140, symbol='EURUSD', entry=0, magic=STRATEGY_MAGIC['breakout'], comment="", profit=0.0))
+    monkeypatch.setattr(main, 'mt', SimpleNamespace(DEAL_ENTRY_OUT=out, history_deals_get=lambda *args, **kwargs: deals))
+    monkeypatch.setattr(main, 'GATEWAY', MT5Gateway())
+    reporter = main.TradeReporter(':memory:'); reporter.update_history()
+    by_strategy = reporter.store.totals('strategy')
+    assert {name: (aggregate.count, aggregate.pnl) for name, aggregate in by_strategy.items()} == \
+        {'Breakout': (1, 5.0), 'Fakeout': (1, -2.0), 'Unknown': (1, 1.0)}
+    assert reporter.store.last_deal_time == 140
@@ -0,0 +1,91 @@
+"""
+Indikator streaming harus sama persis (bit demi bit, termasuk NaN) dengan FrameIndicators (pandas),
+juga selama warm-up, pada harga datar (pembagian 0/0) dan saat data berisi NaN.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import FrameIndicators
+from streaming_indicators import (StreamingATR, StreamingBollinger, StreamingIchimoku, StreamingMax, StreamingMin,
+                                  StreamingRsiAverages, StreamingSMA, StreamingStd, StreamingStochastic)
+
+PERIOD, ATR_PERIOD, STD_DEV, RSI_PERIOD, K_PERIOD, D_PERIOD = 20, 14, 2.0, 14, 14, 3
+TENKAN_P, KIJUN_P, SENKOU_B_P = 9, 26, 52
+
+
+def random_frame(bars, seed=0):
+    rng = np.random.default_rng(seed); close = 1.1 + np.cumsum(rng.normal(0, 0.0003, bars))
+    return pd.DataFrame({'close': close, 'high': close + rng.random(bars) * 0.0004, 'low': close - rng.random(bars) * 0.0004})
+
+
+def flat_frame(bars=300):
+    """Harga datar di beberapa segmen: range/loss/std 0 sehingga ada pembagian 0/0 dan x/0."""
+    frame = random_frame(bars, seed=1)
+    for start in (40, 150): frame.iloc[start:start + 60] = frame.iloc[start].to_numpy()
+    return frame
+
+
+def nan_frame(bars=400):
+    """NaN tersebar dan satu blok NaN lebih panjang dari semua periode (warm-up ulang)."""
+    frame = random_frame(bars, seed=2); rng = np.random.default_rng(3)
+    frame = frame.mask(rng.random(frame.shape) < 0.03)
+    frame.iloc[200:270] = np.nan
+    return frame
+
+
+FRAMES = {'acak': random_frame(3000), 'pendek': random_frame(10), 'datar': flat_frame(), 'nan': nan_frame()}
+
+
+def expected_values(frame):
+    ind = FrameIndicators(frame, None)
+    tenkan = (ind.rolling_max('high', TENKAN_P) + ind.rolling_min('low', TENKAN_P)) / 2
+    kijun = (ind.rolling_max('high', KIJUN_P) + ind.rolling_min('low', KIJUN_P)) / 2
+    gain, loss = ind.rsi_averages(RSI_PERIOD); percent_k, percent_d = ind.stochastic(K_PERIOD, D_PERIOD)
+    middle, upper, lower = ind.bollinger(PERIOD, STD_DEV)
+    return {
+        'sma': ind.sma('close', PERIOD), 'std': ind.rolling_std('close', PERIOD),
+        'max': ind.rolling_max('high', PERIOD), 'min': ind.rolling_min('low', PERIOD), 'atr': ind.atr(ATR_PERIOD),
+        'rsi_gain': gain, 'rsi_loss': loss, 'rsi': 100 - (100 / (1 + gain / loss)),
+        'stoch_k': percent_k, 'stoch_d': percent_d,
+        'bb_middle': middle, 'bb_upper': upper, 'bb_lower': lower, 'bandwidth': ind.bollinger_bandwidth(PERIOD, STD_DEV),
+        'tenkan': tenkan, 'kijun': kijun, 'senkou_a': ((tenkan + kijun) / 2).shift(KIJUN_P),
+        'senkou_b': ((ind.rolling_max('high', SENKOU_B_P) + ind.rolling_min('low', SENKOU_B_P)) / 2).shift(KIJUN_P),
+        'lagged_close': frame['close'].shift(KIJUN_P),
+    }
+
+
+def streamed_values(frame):
+    sma, std, rolling_max, rolling_min = StreamingSMA(PERIOD), StreamingStd(PERIOD), StreamingMax(PERIOD), StreamingMin(PERIOD)
+    atr, rsi, stoch = StreamingATR(ATR_PERIOD), StreamingRsiAverages(RSI_PERIOD), StreamingStochastic(K_PERIOD, D_PERIOD)
+    bb, ichi = StreamingBollinger(PERIOD, STD_DEV), StreamingIchimoku(TENKAN_P, KIJUN_P, SENKOU_B_P)
+    values = {name: [] for name in expected_values(frame.iloc[:0])}
+    for high, low, close in zip(frame['high'].to_numpy(float), frame['low'].to_numpy(float), frame['close'].to_numpy(float)):
+        values['sma'].append(sma.update(close)); values['std'].append(std.update(close))
+        values['max'].append(rolling_max.update(high)); values['min'].append(rolling_min.update(low))
+        values['atr'].append(atr.update(high, low, close))
+        gain, loss = rsi.update(close); values['rsi_gain'].append(gain); values['rsi_loss'].append(loss); values['rsi'].append(rsi.rsi)
+        k, d = stoch.update(high, low, close); values['stoch_k'].append(k); values['stoch_d'].append(d)
+        bb.update(close)
+        for name in ('middle', 'upper', 'lower'): values[f'bb_{name}'].append(getattr(bb, name))
+        values['bandwidth'].append(bb.bandwidth)
+        ichi.update(high, low, close)
+        for name in ('tenkan', 'kijun', 'senkou_a', 'senkou_b', 'lagged_close'): values[name].append(getattr(ichi, name))
+    return values
+
+
+@pytest.mark.parametrize('frame_name', FRAMES)
+def test_streaming_matches_pandas(frame_name):
+    frame = FRAMES[frame_name]
+    expected = expected_values(frame); actual = streamed_values(frame)
+    for name, series in expected.items():
+        np.testing.assert_array_equal(np.asarray(actual[name], dtype=float), series.to_numpy(float), err_msg=name)
+
+
+def test_warm_up_is_nan_until_window_is_full():
+    frame = FRAMES['acak']; actual = streamed_values(frame)
+    warm_up = {'sma': PERIOD, 'std': PERIOD, 'atr': ATR_PERIOD, 'rsi_gain': RSI_PERIOD, 'stoch_k': K_PERIOD,
+               'stoch_d': K_PERIOD + D_PERIOD - 1, 'kijun': KIJUN_P, 'senkou_b': SENKOU_B_P + KIJUN_P}
+    for name, bars in warm_up.items():
+        values = np.asarray(actual[name], dtype=float)
+        assert np.isnan(values[:bars - 1]).all() and not np.isnan(values[bars - 1:]).any(), name
@@ -0,0 +1,79 @@
+"""
+SymbolSpecCache: TTL memuat ulang dari loader, simbol tidak dikenal dicoba ulang paling sering
+sekali per 60 detik, dan evaluate_symbol (main.py) tidak berjalan tanpa spec.
+"""
+from types import SimpleNamespace
+
+import main
+from symbol_specs import BACKTEST_SPECS, SymbolSpec, SymbolSpecCache
+
+
+class FakeClock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+
+def counting_loader(table):
+    """Loader yang menghitung pemanggilan; `table` boleh diubah di antara pemanggilan (simbol baru)."""
+    def loader():
+        loader.calls += 1
+        return {symbol: SymbolSpec.from_dict(data) for symbol, data in table.items()}
+    loader.calls = 0
+    return loader
+
+
+def test_specs_reload_only_after_ttl():
+    clock = FakeClock(); table = {'EURUSD': dict(BACKTEST_SPECS['DEFAULT'])}; loader = counting_loader(table)
+    cache = SymbolSpecCache(loader, ttl=3600, clock=clock)
+    assert cache.get('EURUSD').digits == 5 and loader.calls == 1
+    clock.now += 3600; cache.get('EURUSD')
+    assert loader.calls == 1
+    table['EURUSD'] = dict(table['EURUSD'], digits=4); clock.now += 1
+    assert cache.get('EURUSD').digits == 4 and loader.calls == 2
+
+
+def test_failed_reload_keeps_old_specs_until_next_ttl():
+    clock = FakeClock(); table = {'EURUSD': BACKTEST_SPECS['DEFAULT']}; loader = counting_loader(table)
+    cache = SymbolSpecCache(loader, ttl=3600, clock=clock); cache.get('EURUSD')
+    table.clear(); clock.now += 3601
+    assert cache.get('EURUSD') is not None and loader.calls == 2
+    clock.now += 3599; cache.get('EURUSD')
+    assert loader.calls == 2
+
+
+def test_unknown_symbol_is_retried_at_most_once_per_minute():
+    clock = FakeClock(); table = {'EURUSD': BACKTEST_SPECS['DEFAULT']}; loader = counting_loader(table)
+    cache = SymbolSpecCache(loader, ttl=24 * 3600, clock=clock)
+    assert cache.get('EURUSD') is not None and loader.calls == 1
+    assert cache.get('NEWSYM') is None and loader.calls == 2
+    for _ in range(10): clock.now += 5; assert cache.get('NEWSYM') is None
+    assert loader.calls == 2 # 50 detik: belum dicoba lagi
+    assert cache.get('OTHERSYM') is None and loader.calls == 3 # Batas per simbol
+    table['NEWSYM'] = BACKTEST_SPECS['XAUUSD']; clock.now += 11
+    assert cache.get('NEWSYM').digits == 2 and loader.calls == 4
+    assert cache.get('NEWSYM').digits == 2 and loader.calls == 4
+
+
+def test_default_spec_is_used_for_unknown_symbols():
+    cache = SymbolSpecCache(counting_loader(BACKTEST_SPECS))
+    assert cache.get('EURUSD').to_dict() == SymbolSpec.from_dict(BACKTEST_SPECS['DEFAULT']).to_dict()
+    assert SymbolSpecCache().get('EURUSD') is None # Belum ada loader
+
+
+def test_specs_are_persisted_to_file(tmp_path):
+    path = str(tmp_path / 'specs.json'); loader = counting_loader(BACKTEST_SPECS)
+    SymbolSpecCache(loader, path).get('XAUUSD')
+    cache = SymbolSpecCache(counting_loader({}), path)
+    assert cache.get('XAUUSD').digits == 2 and loader.calls == 1
+
+
+def test_evaluate_symbol_skips_symbol_without_spec(monkeypatch):
+    clock = FakeClock(); table = {}
+    monkeypatch.setattr(main, 'SYMBOL_SPECS', SymbolSpecCache(counting_loader(table), clock=clock))
+    monkeypatch.setattr(main, 'SNAPSHOT', SimpleNamespace(positions=lambda symbol: (), tick=lambda symbol: None))
+    strategies = [SimpleNamespace(info=None, digits=5, point=0.00001) for _ in range(2)]
+    assert main.evaluate_symbol('XAUUSD', strategies, {}) is False
+    # Spec muncul kemudian: diambil ulang dan dibagikan ke semua strategi simbol itu
+    table['XAUUSD'] = BACKTEST_SPECS['XAUUSD']; clock.now += 61
+    assert main.evaluate_symbol('XAUUSD', strategies, {}) is True # Tick belum ada -> coba lagi
+    assert all(s.info is strategies[0].info and s.digits == 2 and s.point == 0.01 for s in strategies)
@@ -0,0 +1,68 @@
+"""
+TradeStore: ticket disimpan sekali (ingest ulang overlap tidak menggandakan agregat), high-water mark
+hanya maju, dan agregat berjalan sama dengan menghitung ulang dari seluruh trade.
+"""
+import pytest
+
+from trade_store import TradeStore
+
+TRADES = [ # (ticket, waktu, simbol, strategi, profit)
+    (1, 100, 'EURUSD', 'Breakout', 12.5),
+    (2, 100, 'EURUSD', 'Fakeout', -4.0),
+    (3, 160, 'GBPUSD', 'Breakout', 0.0), # profit 0 dihitung kalah
+    (4, 220, 'EURUSD', 'Breakout', -7.5),
+    (5, 220, 'GBPUSD', 'Fakeout', 3.25),
+]
+
+
+def summary(aggregate):
+    return aggregate.count, aggregate.wins, aggregate.losses, aggregate.gross_profit, aggregate.gross_loss, aggregate.pnl
+
+
+def recomputed(trades, key=None):
+    groups = {}
+    for _, _, symbol, strategy, profit in trades:
+        group = groups.setdefault({None: None, 'symbol': symbol, 'strategy': strategy}[key], [])
+        group.append(profit)
+    return {name: (len(p), sum(x > 0 for x in p), sum(x <= 0 for x in p), sum(x for x in p if x > 0), sum(x for x in p if x <= 0), sum(p))
+            for name, p in groups.items()}
+
+
+@pytest.fixture
+def store():
+    store = TradeStore(':memory:'); yield store; store.close()
+
+
+def test_empty_store(store):
+    assert store.last_deal_time is None
+    assert summary(store.totals()) == (0, 0, 0, 0.0, 0.0, 0.0) and store.totals().mean == 0.0
+    assert store.totals('symbol') == {}
+
+
+def test_reingest_past_high_water_mark_is_idempotent(store):
+    assert store.add(TRADES[:3], 160) == 3 and store.last_deal_time == 160
+    # Update berikutnya meminta deal sejak high-water mark: deal di detik 160 datang lagi
+    assert store.add(TRADES[2:], 220) == 2 and store.last_deal_time == 220
+    assert store.add(TRADES, 220) == 0
+    # High-water mark tidak mundur walau batch lama diproses ulang
+    assert store.add(TRADES[:1], 100) == 0 and store.last_deal_time == 220
+    assert store.add([], None) == 0 and store.last_deal_time == 220
+    assert summary(store.totals()) == recomputed(TRADES)[None]
+
+
+def test_aggregates_by_symbol_and_strategy(store):
+    store.add(TRADES, 220)
+    for key in ('symbol', 'strategy'):
+        assert {name: summary(aggregate) for name, aggregate in store.totals(key).items()} == recomputed(TRADES, key)
+    total = store.totals()
+    assert total.mean == pytest.approx(sum(t[4] for t in TRADES) / len(TRADES))
+
+
+def test_reload_from_disk_restores_aggregates_and_high_water_mark(tmp_path):
+    path = str(tmp_path / 'trades.db')
+    store = TradeStore(path); store.add(TRADES[:4], 220); store.close()
+    store = TradeStore(path)
+    assert store.last_deal_time == 220
+    assert store.add(TRADES, 220) == 1 # Hanya ticket 5 yang baru
+    assert {name: summary(aggregate) for name, aggregate in store.totals('strategy').items()} == recomputed(TRADES, 'strategy')
+    store.close()
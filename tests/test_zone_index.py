@@ -0,0 +1,63 @@
+"""
+ZoneIndex (Supply_Demand) harus memilih zona yang sama persis dengan loop per candle lama, untuk
+window yang bergeser per bar, melompat (celah), maupun history penuh.
+"""
+import numpy as np
+import pytest
+
+from bars import Bars, COLUMNS
+from strategies.supply_demand import ZoneIndex
+
+EXPLOSIVE_MULT = 2.0
+
+
+def random_ohlc(bars, rng):
+    """OHLC acak dengan gap antar candle dan campuran badan kecil/besar (banyak kandidat zona)."""
+    close = 100 + np.cumsum(rng.normal(0, 1, bars))
+    open_ = close + rng.normal(0, 1, bars) * rng.choice([0.1, 3.0], bars)
+    high = np.maximum(open_, close) + rng.random(bars); low = np.minimum(open_, close) - rng.random(bars)
+    return {'time': np.arange(bars, dtype=np.int64) * 60, 'open': open_, 'high': high, 'low': low, 'close': close, 'tick_volume': np.ones(bars)}
+
+
+def baseline_candidates(window):
+    """Kandidat zona (waktu base, supply, high, low) seperti loop lama: base candle bar 1 .. bar tertutup terakhir."""
+    opens, closes, highs, lows, times = window['open'], window['close'], window['high'], window['low'], window['time']
+    zones = []
+    for k in range(1, len(opens) - 1):
+        base_range = abs(closes[k] - opens[k]); explosive_range = abs(closes[k - 1] - opens[k - 1])
+        if base_range > 0 and explosive_range > base_range * EXPLOSIVE_MULT:
+            zones.append((times[k], closes[k - 1] < opens[k - 1], highs[k], lows[k]))
+    return zones
+
+
+def baseline_latest_untested(window, tested_zones):
+    """Loop lama check_signal: dari candle terbaru ke belakang, zona diuji oleh candle sejak base candle (iloc[-i:])."""
+    opens, closes, highs, lows = window['open'], window['close'], window['high'], window['low']
+    n = len(opens); last_supply = last_demand = None
+    for i in range(2, n - 1):
+        base = n - i; explosive = base - 1
+        base_range = abs(closes[base] - opens[base]); explosive_range = abs(closes[explosive] - opens[explosive])
+        if base_range > 0 and explosive_range > base_range * EXPLOSIVE_MULT:
+            zone_high, zone_low = highs[base], lows[base]
+            tested = (zone_high, zone_low) in tested_zones or any(lows[j] <= zone_high and highs[j] >= zone_low for j in range(base, n))
+            if closes[explosive] < opens[explosive] and last_supply is None and not tested: last_supply = {'high': zone_high, 'low': zone_low}
+            if closes[explosive] > opens[explosive] and last_demand is None and not tested: last_demand = {'high': zone_high, 'low': zone_low}
+        if last_supply and last_demand: break
+    return last_supply, last_demand
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_zone_index_matches_baseline_loop(seed):
+    rng = np.random.default_rng(seed); data = random_ohlc(800, rng)
+    index = ZoneIndex(EXPLOSIVE_MULT); end = 200
+    while end < len(data['time']):
+        # Window trailing 200 bar atau history penuh; maju 1 bar, beberapa bar, atau melompat (celah)
+        start = 0 if rng.random() < 0.3 else end - 200
+        window = {column: values[start:end] for column, values in data.items()}
+        bars = Bars(*(window[column] for column in COLUMNS))
+        index.update(bars)
+        expected = baseline_candidates(window)
+        assert list(zip(index.time, index.supply, index.high, index.low)) == expected
+        tested_zones = {(high, low) for _, _, high, low in expected if rng.random() < 0.2}
+        assert index.latest_untested(bars, tested_zones) == baseline_latest_untested(window, tested_zones)
+        end += int(rng.choice([1, 1, 1, 3, 50]))
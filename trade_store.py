@@ -0,0 +1,89 @@
+"""
+Penyimpanan history trade tertutup untuk TradeReporter (SQLite, append-only).
+
+- Setiap deal penutup (DEAL_ENTRY_OUT) disimpan sekali per ticket di tabel `trades`.
+- High-water mark (waktu deal terbaru yang sudah diproses) disimpan di tabel `meta`, jadi setiap
+  update hanya meminta deal yang lebih baru ke MT5, dan restart tidak memindai ulang history.
+- Agregat berjalan per (simbol, strategi) (jumlah, win, gross profit/loss) disimpan di memori;
+  dimuat sekali dengan GROUP BY saat start lalu ditambah per trade baru, jadi laporan O(1)
+  terhadap lamanya bot berjalan.
+"""
+import sqlite3
+import threading
+
+
+class TradeAggregate:
+    """Agregat trade satu kelompok; kalah = profit <= 0 (sama seperti laporan lama)."""
+    __slots__ = ('count', 'wins', 'gross_profit', 'gross_loss')
+
+    def __init__(self, count=0, wins=0, gross_profit=0.0, gross_loss=0.0):
+        self.count = count; self.wins = wins; self.gross_profit = gross_profit; self.gross_loss = gross_loss
+
+    def add(self, profit):
+        self.count += 1
+        if profit > 0: self.wins += 1; self.gross_profit += profit
+        else: self.gross_loss += profit
+
+    def merge(self, other):
+        self.count += other.count; self.wins += other.wins
+        self.gross_profit += other.gross_profit; self.gross_loss += other.gross_loss
+
+    @property
+    def losses(self):
+        return self.count - self.wins
+
+    @property
+    def pnl(self):
+        return self.gross_profit + self.gross_loss
+
+    @property
+    def mean(self):
+        return self.pnl / self.count if self.count else 0.0
+
+
+class TradeStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        # Dipakai dari thread reporter dan thread utama (laporan final), dijaga oleh _lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS trades (ticket INTEGER PRIMARY KEY, time INTEGER, symbol TEXT, strategy TEXT, profit REAL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._db.commit()
+        self.aggregates = {} # (simbol, strategi) -> TradeAggregate
+        query = ("SELECT symbol, strategy, COUNT(*), SUM(profit > 0), "
+                 "COALESCE(SUM(CASE WHEN profit > 0 THEN profit END), 0), COALESCE(SUM(CASE WHEN profit <= 0 THEN profit END), 0) "
+                 "FROM trades GROUP BY symbol, strategy")
+        for symbol, strategy, count, wins, gross_profit, gross_loss in self._db.execute(query):
+            self.aggregates[(symbol, strategy)] = TradeAggregate(count, wins, gross_profit, gross_loss)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'last_deal_time'").fetchone()
+        self.last_deal_time = row[0] if row else None
+
+    def add(self, trades, last_deal_time):
+        """
+        Simpan trade baru [(ticket, waktu, simbol, strategi, profit)] dan majukan high-water mark.
+        Ticket yang sudah tersimpan (overlap di detik high-water mark) diabaikan.
+        """
+        with self._lock:
+            added = 0
+            for ticket, time, symbol, strategy, profit in trades:
+                if self._db.execute("INSERT OR IGNORE INTO trades VALUES (?, ?, ?, ?, ?)", (ticket, time, symbol, strategy, profit)).rowcount:
+                    self.aggregates.setdefault((symbol, strategy), TradeAggregate()).add(profit); added += 1
+            if last_deal_time is not None and (self.last_deal_time is None or last_deal_time > self.last_deal_time):
+                self.last_deal_time = last_deal_time
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('last_deal_time', ?)", (last_deal_time,))
+            self._db.commit()
+            return added
+
+    def totals(self, by=None):
+        """Agregat total, atau dict per 'symbol' / 'strategy' jika `by` diisi."""
+        with self._lock:
+            if by is None:
+                total = TradeAggregate()
+                for aggregate in self.aggregates.values(): total.merge(aggregate)
+                return total
+            position = 0 if by == 'symbol' else 1; groups = {}
+            for key, aggregate in self.aggregates.items(): groups.setdefault(key[position], TradeAggregate()).merge(aggregate)
+            return groups
+
+    def close(self):
+        with self._lock: self._db.close()